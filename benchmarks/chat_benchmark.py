@@ -0,0 +1,516 @@
+# benchmarks/chat_benchmark.py
+
+"""
+Offline benchmark for the /api/chat pipeline.
+
+Replays a versioned, intent-labelled query corpus through the real Flask
+chat endpoint with a deterministic fake LLM and an in-memory keyword vector
+store, so no API key, network or embedding model is needed.
+
+Reports:
+- Throughput (queries/sec) over the timed iterations
+- Per-stage latency (routing, entities, retrieval, generation)
+- Per-stage peak memory (separate tracemalloc pass, so timings stay clean)
+- Routing accuracy against the labelled intents
+- Stated-value extraction for sensitivity questions (SENSITIVITY_VALUE_CASES)
+
+Results are compared against a stored baseline. Errors, routing accuracy,
+peak memory and value extraction failures are gated (regressions exit non-zero); throughput and
+latency are wall-clock and machine dependent, so changes there are only
+reported.
+
+Usage:
+    python -m benchmarks.chat_benchmark
+    python -m benchmarks.chat_benchmark --iterations 5 --output bench_output.json
+    python -m benchmarks.chat_benchmark --update-baseline
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from functools import wraps
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+CORPUS_PATH = ROOT / "benchmarks" / "corpus" / "chat_queries_v1.jsonl"
+BASELINE_PATH = ROOT / "benchmarks" / "baselines" / "chat_baseline.json"
+
+# Relative tolerance before a metric counts as a regression (or a timing change)
+DEFAULT_TOLERANCE = 0.25
+
+# Stage latency must also grow by this much (ms) - small stages are timer noise
+MIN_LATENCY_DELTA_MS = 2.0
+
+# Which run_app-level callables belong to which pipeline stage
+STAGES = {
+    "routing": ["detect_specific_property_query", "classify_intent"],
+    "entities": [
+        "get_all_property_names", "get_available_cities",
+        "extract_cities_from_query", "extract_bhk_from_query",
+    ],
+    "retrieval": [
+        "find_property_by_name", "filter_properties", "get_city_stats",
+        "get_locations_in_city", "get_comparison_stats", "similarity_search_with_score",
+    ],
+    "generation": [
+        "format_single_property", "format_properties_for_context",
+        "format_city_stats_for_context", "generate_rag_response",
+        "generate_no_data_response", "generate_filter_response",
+        "generate_location_response", "generate_aggregate_response",
+    ],
+}
+
+# Generators imported inside chat() at call time - patched on rag_engine itself
+LAZY_GENERATORS = [
+    "generate_advisory_response", "generate_city_profile_response",
+    "generate_risk_response", "generate_scenario_response",
+    "generate_sensitivity_response",
+]
+
+# Query -> values extract_sensitivity_values_from_query must return; years,
+# BHK counts and prices are not assumption values
+SENSITIVITY_VALUE_CASES = [
+    ("if interest rate goes to 10% should i still buy in noida", {"loan_rate": 10.0}),
+    ("what if rates go to 9.5%?", {"loan_rate": 9.5}),
+    ("interest rate at 8.5", {"loan_rate": 8.5}),
+    ("at 3% appreciation is buying better", {"appreciation_rate": 3.0}),
+    ("tenure of 25 years with a down payment of 20%", {"loan_tenure_years": 25.0, "down_payment_percent": 20.0}),
+    ("what if interest rate rises in 2025?", {}),
+    ("interest rate is 2025", {}),
+    ("interest rate for 2 bhk in pune", {}),
+    ("loan rate for a 50 lakh flat", {}),
+    ("my tax rate is 30%, what if appreciation rate of 5%", {"appreciation_rate": 5.0}),
+]
+
+
+# ============================================================================
+# DETERMINISTIC FAKES
+# ============================================================================
+
+class _FakeMessage:
+    def __init__(self, content: str):
+        self.content = content
+
+
+class FakeLLM:
+    """Deterministic stand-in for ChatGoogleGenerativeAI."""
+
+    def invoke(self, prompt: str) -> _FakeMessage:
+        digest = hashlib.sha1(prompt.encode("utf-8")).hexdigest()[:10]
+        data = prompt.split("=== RETRIEVED DATA FROM DATABASE ===")[-1]
+        first_line = next((l.strip() for l in data.splitlines() if l.strip()), "")
+        return _FakeMessage(f"[fake-llm {digest}] According to the database: {first_line}")
+
+
+class _Document:
+    def __init__(self, page_content: str):
+        self.page_content = page_content
+
+
+class KeywordVectorStore:
+    """
+    In-memory replacement for the FAISS store.
+    Scores documents by token overlap so results are stable across runs.
+    """
+    _TOKEN = re.compile(r"[a-z0-9]+")
+
+    def __init__(self, texts: list):
+        self.docs = [_Document(t) for t in texts]
+        self.index = defaultdict(set)
+        for i, text in enumerate(texts):
+            for token in set(self._TOKEN.findall(text.lower())):
+                self.index[token].add(i)
+
+    def similarity_search_with_score(self, query: str, k: int = 5):
+        counts = defaultdict(int)
+        for token in set(self._TOKEN.findall(query.lower())):
+            for i in self.index.get(token, ()):
+                counts[i] += 1
+        ranked = sorted(counts.items(), key=lambda x: (-x[1], x[0]))[:k]
+        # Lower is better, mirroring FAISS L2 distance
+        return [(self.docs[i], 1.0 / (1 + hits)) for i, hits in ranked]
+
+    def similarity_search(self, query: str, k: int = 5):
+        return [doc for doc, _ in self.similarity_search_with_score(query, k)]
+
+
+# ============================================================================
+# INSTRUMENTATION
+# ============================================================================
+
+class StageRecorder:
+    """Collects per-query stage timings, memory peaks and routed intent."""
+
+    def __init__(self):
+        self.track_memory = False
+        self._depth = 0
+        self.reset_query()
+
+    def reset_query(self):
+        self.stage_ms = defaultdict(float)
+        self.stage_peak = defaultdict(int)
+        self.traced_peak = 0
+        self.routed_intent = None
+
+    def fold_peak(self) -> int:
+        """Remember the traced peak so per-stage resets don't lose it."""
+        self.traced_peak = max(self.traced_peak, tracemalloc.get_traced_memory()[1])
+        return self.traced_peak
+
+    def wrap(self, func, stage: str, name: str):
+        @wraps(func)
+        def timed(*args, **kwargs):
+            # Only the outermost instrumented call is attributed to a stage
+            if self._depth:
+                return func(*args, **kwargs)
+            self._depth += 1
+            if self.track_memory:
+                self.fold_peak()
+                tracemalloc.reset_peak()
+                mem_before = tracemalloc.get_traced_memory()[0]
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                self.stage_ms[stage] += (time.perf_counter() - start) * 1000
+                if self.track_memory:
+                    self.fold_peak()
+                    self.stage_peak[stage] = max(
+                        self.stage_peak[stage], tracemalloc.get_traced_memory()[1] - mem_before
+                    )
+                self._depth -= 1
+            self._record_route(name, result)
+            return result
+        return timed
+
+    def _record_route(self, name: str, result):
+        if name == "detect_specific_property_query" and result and result[0]:
+            self.routed_intent = "SPECIFIC_PROPERTY"
+        elif name == "classify_intent" and self.routed_intent is None:
+            self.routed_intent = result
+
+
+def load_corpus(path: Path = CORPUS_PATH) -> list:
+    """Load the labelled query corpus (one JSON object per line)."""
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _corpus_info(path: Path, corpus: list) -> dict:
+    version = re.search(r"_v(\d+)", path.stem)
+    return {
+        "path": str(path.relative_to(ROOT)) if path.is_relative_to(ROOT) else str(path),
+        "version": int(version.group(1)) if version else None,
+        "sha256": hashlib.sha256(path.read_bytes()).hexdigest(),
+        "queries": len(corpus),
+    }
+
+
+def _load_app(recorder: StageRecorder):
+    """Import run_app with offline fakes and stage instrumentation installed."""
+    os.chdir(ROOT)
+    sys.path.insert(0, str(ROOT))
+
+    from src.rag import rag_engine, vector_store
+
+    # Must be in place before run_app builds its vector store at import time
+    vector_store.build_or_load_vector_store = (
+        lambda docs, force_rebuild=False: KeywordVectorStore(docs)
+    )
+    rag_engine.set_llm_factory(FakeLLM)
+
+    class _Unthrottled(rag_engine.LLMThrottler):
+        MAX_CALLS = float("inf")
+
+    rag_engine._llm_throttler = _Unthrottled()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        import run_app
+
+    if not run_app.RAG_AVAILABLE or run_app.vector_db is None:
+        raise RuntimeError("RAG pipeline failed to initialise; see run_app import warnings")
+
+    for stage, names in STAGES.items():
+        for name in names:
+            setattr(run_app, name, recorder.wrap(getattr(run_app, name), stage, name))
+    for name in LAZY_GENERATORS:
+        setattr(rag_engine, name, recorder.wrap(getattr(rag_engine, name), "generation", name))
+
+    return run_app, rag_engine
+
+
+def _percentiles(values: list) -> dict:
+    if not values:
+        return {"mean": 0.0, "p50": 0.0, "p95": 0.0, "calls": 0}
+    arr = np.asarray(values)
+    return {
+        "mean": round(float(arr.mean()), 3),
+        "p50": round(float(np.percentile(arr, 50)), 3),
+        "p95": round(float(np.percentile(arr, 95)), 3),
+        "calls": int(arr.size),
+    }
+
+
+def check_value_extraction(cases: list = SENSITIVITY_VALUE_CASES) -> dict:
+    """Run extract_sensitivity_values_from_query over cases; failures list the mismatches."""
+    from src.rag.intent_classifier import extract_sensitivity_values_from_query
+
+    failures = []
+    for query, expected in cases:
+        got = extract_sensitivity_values_from_query(query)
+        if got != expected:
+            failures.append({"query": query, "expected": expected, "got": got})
+    return {"cases": len(cases), "failures": failures}
+
+
+def run_benchmark(corpus_path: Path = CORPUS_PATH, iterations: int = 3, warmup: int = 1) -> dict:
+    """
+    Replay the corpus through /api/chat and collect metrics.
+
+    Args:
+        corpus_path: Labelled JSONL corpus
+        iterations: Timed passes over the corpus
+        warmup: Untimed passes (populate lazy loads and caches)
+
+    Returns:
+        Dict with corpus info, throughput, latency, memory and routing results
+    """
+    corpus = load_corpus(corpus_path)
+    recorder = StageRecorder()
+    run_app, rag_engine = _load_app(recorder)
+    client = run_app.app.test_client()
+
+    def replay(query: dict):
+        recorder.reset_query()
+        start = time.perf_counter()
+        resp = client.post("/api/chat", json={"message": query["query"]})
+        elapsed = (time.perf_counter() - start) * 1000
+        payload = resp.get_json(silent=True) or {}
+        ok = resp.status_code == 200 and payload.get("success", False)
+        return elapsed, ok
+
+    sink = io.StringIO()
+    with contextlib.redirect_stdout(sink):
+        for _ in range(warmup):
+            for query in corpus:
+                replay(query)
+
+        # Timed passes
+        total_ms = []
+        stage_ms = defaultdict(list)
+        errors = 0
+        routes = {}
+        rag_engine._response_cache.clear()
+        wall_start = time.perf_counter()
+        for _ in range(iterations):
+            for query in corpus:
+                elapsed, ok = replay(query)
+                total_ms.append(elapsed)
+                errors += 0 if ok else 1
+                for stage, ms in recorder.stage_ms.items():
+                    stage_ms[stage].append(ms)
+                routes[query["id"]] = recorder.routed_intent
+        wall = time.perf_counter() - wall_start
+
+        # Memory pass (tracemalloc slows everything, so it is kept out of the timings)
+        recorder.track_memory = True
+        tracemalloc.start()
+        stage_peak = defaultdict(int)
+        request_peak = 0
+        for query in corpus:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            replay(query)
+            request_peak = max(request_peak, recorder.fold_peak() - base)
+            for stage, peak in recorder.stage_peak.items():
+                stage_peak[stage] = max(stage_peak[stage], peak)
+        tracemalloc.stop()
+        recorder.track_memory = False
+
+    per_intent = defaultdict(lambda: {"correct": 0, "total": 0})
+    mismatches = []
+    for query in corpus:
+        routed = routes.get(query["id"])
+        bucket = per_intent[query["intent"]]
+        bucket["total"] += 1
+        if routed == query["intent"]:
+            bucket["correct"] += 1
+        else:
+            mismatches.append({"id": query["id"], "expected": query["intent"], "routed": routed})
+    correct = sum(b["correct"] for b in per_intent.values())
+
+    return {
+        "corpus": _corpus_info(Path(corpus_path), corpus),
+        "iterations": iterations,
+        "requests": len(total_ms),
+        "errors": errors,
+        "throughput_qps": round(len(total_ms) / wall, 2) if wall > 0 else 0.0,
+        "latency_ms": {
+            "total": _percentiles(total_ms),
+            "stages": {stage: _percentiles(stage_ms.get(stage, [])) for stage in STAGES},
+        },
+        "memory_kb": {
+            "request_peak": round(request_peak / 1024, 1),
+            "stages": {stage: round(stage_peak.get(stage, 0) / 1024, 1) for stage in STAGES},
+        },
+        "routing": {
+            "accuracy": round(correct / len(corpus), 4) if corpus else 0.0,
+            "per_intent": {k: dict(v) for k, v in sorted(per_intent.items())},
+            "mismatches": mismatches,
+        },
+        "sensitivity_values": check_value_extraction(),
+    }
+
+
+# ============================================================================
+# BASELINE COMPARISON
+# ============================================================================
+
+def compare_to_baseline(result: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> list:
+    """
+    Compare a run against the stored baseline on the gated metrics
+    (errors, routing accuracy, peak memory).
+
+    Returns:
+        List of human-readable regression messages (empty = no regressions)
+    """
+    regressions = []
+
+    if baseline["corpus"]["sha256"] != result["corpus"]["sha256"]:
+        regressions.append(
+            f"Corpus changed ({baseline['corpus']['sha256'][:12]} -> {result['corpus']['sha256'][:12]}); "
+            "refresh the baseline with --update-baseline"
+        )
+        return regressions
+
+    if result["errors"] > baseline["errors"]:
+        regressions.append(f"Errors: {baseline['errors']} -> {result['errors']}")
+
+    for failure in result["sensitivity_values"]["failures"]:
+        regressions.append(f"Sensitivity values for {failure['query']!r}: "
+                           f"expected {failure['expected']}, got {failure['got']}")
+
+    base_acc, acc = baseline["routing"]["accuracy"], result["routing"]["accuracy"]
+    if acc < base_acc:
+        regressions.append(f"Routing accuracy: {base_acc:.2%} -> {acc:.2%}")
+
+    for stage, peak in result["memory_kb"]["stages"].items():
+        base_peak = baseline["memory_kb"]["stages"].get(stage, 0)
+        if base_peak >= 64 and peak > base_peak * (1 + tolerance):
+            regressions.append(f"{stage} peak memory: {base_peak:.0f} -> {peak:.0f} KB")
+
+    return regressions
+
+
+def compare_timings(result: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> list:
+    """
+    Throughput and stage latency changes against the baseline (advisory:
+    wall-clock numbers vary between runs and machines, so they never fail).
+
+    Returns:
+        List of human-readable messages (empty = within tolerance)
+    """
+    if baseline["corpus"]["sha256"] != result["corpus"]["sha256"]:
+        return []
+    changes = []
+    base_qps, qps = baseline["throughput_qps"], result["throughput_qps"]
+    if base_qps and qps < base_qps * (1 - tolerance):
+        changes.append(f"Throughput: {base_qps:.1f} -> {qps:.1f} q/s")
+
+    for stage, stats in result["latency_ms"]["stages"].items():
+        base = baseline["latency_ms"]["stages"].get(stage, {})
+        for pct in ("p50", "p95"):
+            before, after = base.get(pct, 0), stats[pct]
+            if after > before * (1 + tolerance) and after - before >= MIN_LATENCY_DELTA_MS:
+                changes.append(f"{stage} {pct} latency: {before:.2f} -> {after:.2f} ms")
+    return changes
+
+
+def format_report(result: dict) -> str:
+    """Render a benchmark result as a plain-text report."""
+    lines = []
+    corpus = result["corpus"]
+    lines.append("=" * 60)
+    lines.append("CHAT PIPELINE BENCHMARK")
+    lines.append("=" * 60)
+    lines.append(f"Corpus: {corpus['path']} (v{corpus['version']}, {corpus['queries']} queries)")
+    lines.append(f"Requests: {result['requests']} | Errors: {result['errors']}")
+    lines.append(f"Throughput: {result['throughput_qps']:.1f} queries/sec")
+    total = result["latency_ms"]["total"]
+    lines.append(f"Request latency: p50 {total['p50']:.2f} ms | p95 {total['p95']:.2f} ms")
+    lines.append("")
+    lines.append(f"{'Stage':<12}{'p50 ms':>10}{'p95 ms':>10}{'calls':>8}{'peak KB':>10}")
+    for stage, stats in result["latency_ms"]["stages"].items():
+        peak = result["memory_kb"]["stages"].get(stage, 0)
+        lines.append(f"{stage:<12}{stats['p50']:>10.2f}{stats['p95']:>10.2f}{stats['calls']:>8}{peak:>10.1f}")
+    lines.append("")
+    routing = result["routing"]
+    lines.append(f"Routing accuracy: {routing['accuracy']:.2%}")
+    for intent, bucket in routing["per_intent"].items():
+        lines.append(f"  {intent:<18}{bucket['correct']}/{bucket['total']}")
+    if routing["mismatches"]:
+        lines.append("Misrouted:")
+        for m in routing["mismatches"]:
+            lines.append(f"  {m['id']}: expected {m['expected']}, routed {m['routed']}")
+    values = result["sensitivity_values"]
+    lines.append(f"Sensitivity value extraction: {values['cases'] - len(values['failures'])}/{values['cases']}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Offline /api/chat benchmark")
+    parser.add_argument("--corpus", type=Path, default=CORPUS_PATH)
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--output", type=Path, help="Write the full JSON result here")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    result = run_benchmark(args.corpus.resolve(), args.iterations, args.warmup)
+    print(format_report(result))
+
+    if args.output:
+        args.output.write_text(json.dumps(result, indent=2))
+
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(result, indent=2) + "\n")
+        print(f"\n[OK] Baseline updated → {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"\n[WARNING] No baseline at {args.baseline}; run with --update-baseline")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    timings = compare_timings(result, baseline, args.tolerance)
+    if timings:
+        print("\n[NOTE] Slower than baseline (advisory, not gated):")
+        for t in timings:
+            print(f"  - {t}")
+
+    regressions = compare_to_baseline(result, baseline, args.tolerance)
+    if regressions:
+        print("\n[FAIL] Regressions against baseline:")
+        for r in regressions:
+            print(f"  - {r}")
+        return 1
+
+    print("\n[OK] No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
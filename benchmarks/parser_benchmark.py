@@ -0,0 +1,152 @@
+# benchmarks/parser_benchmark.py
+
+"""
+Micro-benchmark for the listing text parsers (src.Parameters.parsers).
+
+Generates deterministic raw card texts (price, area and title strings in
+MagicBricks formats, including Lakh, sqyrd and sqm variants) and times:
+- legacy: the scraper's previous per-call regex parsers
+- scalar: parse_price_text / parse_area / parse_bedrooms in a loop
+- columns: the parse_*_column variants over the whole frame
+
+The scalar and column results must agree on every row, and EDGE_CASES (fixed
+rows appended to the generated ones) must parse to their expected values; a
+mismatch exits non-zero.
+
+Usage:
+    python -m benchmarks.parser_benchmark
+    python -m benchmarks.parser_benchmark --rows 200000
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+
+def make_raw_listings(rows, seed=0):
+    """Raw card texts in the formats the scrapers see."""
+    rng = np.random.default_rng(seed)
+    lakhs = rng.integers(20, 900, rows)
+    area = rng.integers(300, 4000, rows)
+    psf = (lakhs * 100000 / area).round().astype(int)
+
+    crore = pd.Series(lakhs / 100).map("₹{:.2f} Cr".format)
+    lac = pd.Series(lakhs).map("₹{} Lac".format).where(rng.random(rows) < 0.8, pd.Series(lakhs).map("{} Lakh".format))
+    price = crore.where(lakhs >= 100, lac) + "\n" + pd.Series(psf).map("₹{:,} per sqft".format)
+
+    units = np.array(["sqft", "sqft", "sqft", "sqyrd", "sqm"])[rng.integers(0, 5, rows)]
+    area_text = pd.Series(area).astype(str) + " " + units
+
+    bhk = pd.Series(rng.integers(1, 6, rows)).astype(str) + " BHK Flat for Sale"
+    title = bhk.mask(rng.random(rows) < 0.03, "Studio Apartment for Sale").mask(rng.random(rows) < 0.02, "1 RK Flat")
+    return pd.DataFrame({"price": price, "area": area_text, "title": title})
+
+
+# (price, area, title) -> (price_total_inr, price_per_sqft, area_sqft, bedrooms)
+EDGE_CASES = {
+    ("₹8,000 sqft", "1500", "1 RK Studio"): (None, 8000, 1500.0, 0),
+    ("₹45,00,000\n₹3,000/sqft", "1,500 sq.ft", "3BHK Villa"): (4500000.0, 3000, 1500.0, 3),
+    ("₹1.2 Cr", "200 sq m", "Plot"): (12000000.0, None, 2152.78, None),
+}
+
+
+def parse_columns(raw):
+    """Parsed listing columns for a frame of raw card texts, via the column variants."""
+    from src.Parameters.parsers import (parse_area_column, parse_bedrooms_column, parse_price_column,
+                                        parse_price_per_sqft_column)
+
+    return pd.DataFrame({
+        "price_total_inr": parse_price_column(raw["price"]),
+        "price_per_sqft": parse_price_per_sqft_column(raw["price"]),
+        "area_sqft": parse_area_column(raw["area"]),
+        "bedrooms": parse_bedrooms_column(raw["title"]),
+    }, index=raw.index)
+
+
+# Previous scraper parsers (per-call regexes, repeated .lower()), for reference
+
+def _legacy_price(price_text):
+    total = None
+    m = re.search(r'([\d.]+)\s*Cr', price_text, re.IGNORECASE)
+    if m:
+        total = float(m.group(1)) * 1e7
+    if not total:
+        m = re.search(r'([\d.]+)\s*Lac', price_text, re.IGNORECASE)
+        if m:
+            total = float(m.group(1)) * 1e5
+    m = re.search(r'₹\s*([\d,]+)\s*(?:per\s*)?sqft', price_text, re.IGNORECASE)
+    return total, int(m.group(1).replace(",", "")) if m else None
+
+
+def _legacy_area(area_text):
+    m = re.search(r'([\d.]+)\s*(sqft|sqyrd|sqm)', area_text.lower())
+    if not m:
+        return None
+    return float(m.group(1)) * {"sqft": 1, "sqyrd": 9, "sqm": 10.7639}[m.group(2).lower()]
+
+
+def _legacy_bedrooms(title_text):
+    if "studio" in title_text.lower():
+        return 0
+    if "1 rk" in title_text.lower() or "1rk" in title_text.lower():
+        return 1
+    m = re.search(r'(\d+)\s*(?:bhk|bhk)', title_text, re.IGNORECASE)
+    return int(m.group(1)) if m else None
+
+
+def run_benchmark(rows=1_000_000) -> dict:
+    from src.Parameters.parsers import parse_area, parse_bedrooms, parse_price_text
+
+    edge = pd.DataFrame(list(EDGE_CASES), columns=["price", "area", "title"])
+    raw = pd.concat([make_raw_listings(rows), edge], ignore_index=True)
+    prices, areas, titles = raw["price"].tolist(), raw["area"].tolist(), raw["title"].tolist()
+
+    started = time.perf_counter()
+    for price, area, title in zip(prices, areas, titles):
+        _legacy_price(price), _legacy_area(area), _legacy_bedrooms(title)
+    legacy = time.perf_counter() - started
+
+    started = time.perf_counter()
+    scalar = [
+        (*parse_price_text(price), parse_area(area), parse_bedrooms(title))
+        for price, area, title in zip(prices, areas, titles)
+    ]
+    scalar_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    columns = parse_columns(raw)
+    columns_seconds = time.perf_counter() - started
+
+    expected = pd.DataFrame(scalar, columns=["price_total_inr", "price_per_sqft", "area_sqft", "bedrooms"])
+    expected = expected.astype({"price_total_inr": float, "price_per_sqft": "Int64", "area_sqft": float,
+                                "bedrooms": "Int64"})
+    return {
+        "rows": rows,
+        "legacy_seconds": round(legacy, 2),
+        "scalar_seconds": round(scalar_seconds, 2),
+        "columns_seconds": round(columns_seconds, 2),
+        "columns_rows_per_sec": round(rows / columns_seconds),
+        "speedup_vs_legacy": round(legacy / columns_seconds, 1),
+        "same_results": bool(np.allclose(expected.astype(float), columns.astype(float), equal_nan=True)),
+        "edge_cases_ok": bool(np.allclose(expected.tail(len(EDGE_CASES)).astype(float),
+                                          pd.DataFrame(list(EDGE_CASES.values()), dtype=float), equal_nan=True)),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Listing parser micro-benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+
+    result = run_benchmark(args.rows)
+    print(json.dumps(result, indent=2))
+    return 0 if result["same_results"] and result["edge_cases_ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
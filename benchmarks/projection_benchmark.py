@@ -0,0 +1,91 @@
+# benchmarks/projection_benchmark.py
+
+"""
+Consistency check and micro-benchmark for the buy vs rent projections.
+
+Evaluates the same parameter sets (tenures from 5 to 30 years, so some run
+past the 20-year horizon, with and without a tax bracket) with:
+- scalar: RealEstateAnalyzer.buy_vs_rent_analysis in a loop
+- arrays: services.projections.buy_vs_rent_arrays in one call
+- trajectories: services.trajectories.wealth_trajectories in one call
+
+All three must agree on terminal wealth, and a "Buy" recommendation must
+come with a break-even month; a mismatch exits non-zero.
+
+Usage:
+    python -m benchmarks.projection_benchmark
+"""
+
+import argparse
+import itertools
+import json
+import sys
+import time
+
+import numpy as np
+
+TENURES = (5, 10, 15, 20, 25, 30)
+RENTS = (10000, 30000, 60000, 90000)
+APPRECIATION = (3, 6, 9, 12)
+TAX_BRACKETS = (None, 30)
+PRICE = 1e7
+
+
+def run_benchmark() -> dict:
+    from services.analysis import RealEstateAnalyzer
+    from services.projections import buy_vs_rent_arrays
+    from services.trajectories import wealth_trajectories
+
+    analyzer = RealEstateAnalyzer()
+    cases = list(itertools.product(TENURES, RENTS, APPRECIATION, TAX_BRACKETS))
+
+    started = time.perf_counter()
+    scalar = [
+        analyzer.buy_vs_rent_analysis(PRICE, rent, {**analyzer.default_params, 'loan_tenure_years': tenure,
+                                                    'appreciation_rate': appreciation, 'tax_bracket': tax})
+        for tenure, rent, appreciation, tax in cases
+    ]
+    scalar_seconds = time.perf_counter() - started
+
+    tenure, rent, appreciation, _ = (np.array(column, dtype=float) for column in zip(*cases))
+    price = np.full(len(cases), PRICE)
+    started = time.perf_counter()
+    arrays = buy_vs_rent_arrays(price, rent, loan_tenure_years=tenure, appreciation_rate=appreciation)
+    arrays_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    trajectories = wealth_trajectories(price, rent, loan_tenure_years=tenure, appreciation_rate=appreciation)
+    trajectories_seconds = time.perf_counter() - started
+
+    # Tax savings are only in the scalar result; compare before them
+    buy_scalar = np.array([r['buy_wealth'] - r['buy_tax_saving'] for r in scalar])
+    rent_scalar = np.array([r['rent_wealth'] for r in scalar])
+    # Buying ahead at the horizon means it pulled ahead at some month
+    consistent_decision = all(r['recommendation'] != "Buy" or r['break_even_month'] is not None for r in scalar)
+    return {
+        "cases": len(cases),
+        "scalar_ms": round(scalar_seconds * 1000, 2),
+        "arrays_ms": round(arrays_seconds * 1000, 2),
+        "trajectories_ms": round(trajectories_seconds * 1000, 2),
+        "arrays_match_scalar": bool(np.allclose(arrays['wealth_buying'], buy_scalar, atol=1.0)
+                                    and np.allclose(arrays['wealth_renting'], rent_scalar, atol=1.0)),
+        "trajectories_match_scalar": bool(np.allclose(trajectories['wealth_buying'][:, -1], buy_scalar, atol=1.0)
+                                          and np.allclose(trajectories['wealth_renting'][:, -1], rent_scalar,
+                                                          atol=1.0)),
+        "consistent_decision": consistent_decision,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Buy vs rent projection consistency check")
+    parser.parse_args(argv)
+
+    result = run_benchmark()
+    print(json.dumps(result, indent=2))
+    ok = result["arrays_match_scalar"] and result["trajectories_match_scalar"] and result["consistent_decision"]
+    if not ok:
+        print("[FAIL] Projection models disagree")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
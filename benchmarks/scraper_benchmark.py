@@ -0,0 +1,316 @@
+# benchmarks/scraper_benchmark.py
+
+"""
+Offline benchmark for the MagicBricks scrapers.
+
+Serves benchmarks/fixtures/magicbricks_srp.html (mb-srp__card markup with
+lazy-loaded batches) from a local HTTP server and scrapes a set of fake
+cities with src.playwright_scraper.async_scraper, so no network access is
+needed. Needs Playwright and its Chromium build installed.
+
+--http instead serves server-rendered result pages (/static/..., same card
+markup, with a simulated per-request latency) and compares the pooled,
+parallel HTTP scraper (src.requests_scraper.magicbricks_requests) against
+sequential one-off requests.get calls parsed with html.parser.
+
+Reports wall time, listings/sec and whether every card was scraped; a run
+that misses cards exits non-zero. --extraction instead times per-element
+card extraction against the single-evaluate path on one page; --resources
+compares KB and seconds per page with and without lightweight mode (the
+fixture's images, font and scripts are served after --asset-latency-ms, as
+they would be from a real CDN).
+
+Usage:
+    python -m benchmarks.scraper_benchmark
+    python -m benchmarks.scraper_benchmark --cities 12 --cards 80 --pool-size 1
+    python -m benchmarks.scraper_benchmark --extraction --cards 300
+    python -m benchmarks.scraper_benchmark --resources --asset-latency-ms 150
+    python -m benchmarks.scraper_benchmark --http --cities 12 --pages 5 --latency-ms 80
+"""
+
+import argparse
+import asyncio
+import functools
+import json
+import sys
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlencode
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURE_PATH = ROOT / "benchmarks" / "fixtures" / "magicbricks_srp.html"
+
+
+# Heavy resources the fixture page requests: (content type, size in bytes)
+FIXTURE_ASSETS = {
+    ".jpg": ("image/jpeg", 40 * 1024),
+    ".woff2": ("font/woff2", 60 * 1024),
+    ".js": ("application/javascript", 120 * 1024),
+}
+
+
+def _static_card(city, i):
+    # Python port of card() in the fixture page (without the photo)
+    bhk = 1 + i % 4
+    area = 500 + (i * 73) % 1500
+    lakhs = 40 + (i * 37) % 400
+    price = f"₹{lakhs / 100:.2f} Cr" if lakhs >= 100 else f"₹{lakhs} Lac"
+    per_sqft = f"{round(lakhs * 100000 / area):,}"
+    return f"""
+      <div class="mb-srp__card">
+        <a class="mb-srp__card--title" href="/propertyDetails/{city}-{i}">{bhk} BHK Flat for Sale in {city} Sector {i}</a>
+        <div class="mb-srp__card__society">{city} Residency {i}</div>
+        <div class="mb-srp__card__summary--value">{area} sqft</div>
+        <div class="mb-srp__card__price">{price}<br>₹{per_sqft} per sqft</div>
+      </div>"""
+
+
+def _static_page(query):
+    # Server-rendered result page: page of pages, per_page cards each; empty past the last page
+    city = query.get("cityName", ["fixture"])[0]
+    page = int(query.get("page", ["1"])[0])
+    per_page = int(query.get("per_page", ["30"])[0])
+    pages = int(query.get("pages", ["3"])[0])
+    cards = range((page - 1) * per_page, page * per_page) if page <= pages else range(0)
+    body = "".join(_static_card(city, i) for i in cards)
+    return f"<!DOCTYPE html><html><body><div id='srp'>{body}</div></body></html>".encode()
+
+
+class _FixtureHandler(SimpleHTTPRequestHandler):
+    # /assets/* returns filler bytes of FIXTURE_ASSETS size after the server's
+    # asset_latency_ms; /static/* returns a server-rendered page after latency
+    # ms; every other URL returns the fixture page, which reads its own query string
+
+    protocol_version = "HTTP/1.1"  # keep-alive, so pooled connections are reused
+
+    def do_GET(self):
+        path, _, query = self.path.partition("?")
+        content_type, body = "text/html; charset=utf-8", None
+        if path.startswith("/static/"):
+            query = parse_qs(query)
+            time.sleep(int(query.get("latency", ["0"])[0]) / 1000)
+            body = _static_page(query)
+        elif path.startswith("/assets/"):
+            time.sleep(self.server.asset_latency_ms / 1000)
+            for suffix, (asset_type, size) in FIXTURE_ASSETS.items():
+                if path.endswith(suffix):
+                    filler = b"/* fixture */\n" if suffix == ".js" else b"\0"
+                    content_type, body = asset_type, (filler * (size // len(filler) + 1))[:size]
+        if body is None:
+            body = FIXTURE_PATH.read_bytes()
+
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_fixture_server(asset_latency_ms=0):
+    """Start the fixture server on a free local port; returns (server, base_url)."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FixtureHandler)
+    server.asset_latency_ms = asset_latency_ms
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def fixture_url(base_url, city, cards, batch, delay_ms):
+    query = urlencode({"cityName": city, "total": cards, "batch": batch, "delay": delay_ms})
+    return f"{base_url}/property-for-sale/residential-real-estate?{query}"
+
+
+def static_url(base_url, city, page=1, per_page=30, pages=3, latency_ms=50):
+    query = urlencode({"cityName": city, "page": page, "per_page": per_page, "pages": pages, "latency": latency_ms})
+    return f"{base_url}/static/property-for-sale?{query}"
+
+
+def run_benchmark(cities=8, cards=60, batch=20, delay_ms=150, pool_size=4, min_interval=0.0,
+                  lightweight=True, asset_latency_ms=0) -> dict:
+    from src.playwright_scraper.async_scraper import DomainLimiter, scrape_cities
+
+    server, base_url = start_fixture_server(asset_latency_ms)
+    names = [f"city-{i}" for i in range(cities)]
+    usage = {}
+    try:
+        started = time.perf_counter()
+        listings, city_stats = asyncio.run(scrape_cities(
+            names,
+            pool_size=pool_size,
+            limiter=DomainLimiter(max_concurrent=pool_size, min_interval=min_interval),
+            url_builder=functools.partial(fixture_url, base_url, cards=cards, batch=batch, delay_ms=delay_ms),
+            lightweight=lightweight,
+            usage=usage,
+        ))
+        elapsed = time.perf_counter() - started
+    finally:
+        server.shutdown()
+
+    incomplete = {city: count for city, count in city_stats.items() if count != cards}
+    pages = list(usage.values())
+    return {
+        "cities": cities,
+        "cards_per_city": cards,
+        "pool_size": pool_size,
+        "lightweight": lightweight,
+        "asset_latency_ms": asset_latency_ms,
+        "listings": len(listings),
+        "seconds": round(elapsed, 2),
+        "listings_per_sec": round(len(listings) / elapsed, 1) if elapsed else None,
+        "kb_per_page": round(sum(p["kb"] for p in pages) / len(pages), 1) if pages else None,
+        "seconds_per_page": round(sum(p["seconds"] for p in pages) / len(pages), 2) if pages else None,
+        "blocked_per_page": round(sum(p["blocked"] for p in pages) / len(pages), 1) if pages else None,
+        "incomplete_cities": incomplete,
+    }
+
+
+def run_extraction_benchmark(cards=300, repeats=3) -> dict:
+    """
+    Time per-element extraction (scrape_listing on each card handle) against
+    the single-evaluate path (extract_cards + parse_cards) on one fixture page.
+    """
+    from playwright.sync_api import sync_playwright
+    from src.playwright_scraper.magicbricks_playwright_improved import (
+        SELECTORS, extract_cards, parse_cards, scrape_listing
+    )
+
+    server, base_url = start_fixture_server()
+    timings = {"per_element": [], "bulk": []}
+    try:
+        with sync_playwright() as p:
+            browser = p.chromium.launch(headless=True)
+            page = browser.new_page()
+            page.goto(fixture_url(base_url, "fixture", cards, cards, 0))
+            page.wait_for_function(f"document.querySelectorAll('{SELECTORS['card'][0]}').length >= {cards}")
+
+            for _ in range(repeats):
+                started = time.perf_counter()
+                per_element = [scrape_listing(card, "fixture") for card in page.query_selector_all(SELECTORS['card'][0])]
+                timings["per_element"].append(time.perf_counter() - started)
+
+                started = time.perf_counter()
+                bulk = parse_cards(extract_cards(page), "fixture", base_url="https://www.magicbricks.com")
+                timings["bulk"].append(time.perf_counter() - started)
+            browser.close()
+    finally:
+        server.shutdown()
+
+    per_element_ms = min(timings["per_element"]) * 1000
+    bulk_ms = min(timings["bulk"]) * 1000
+    return {
+        "cards": cards,
+        "per_element_ms": round(per_element_ms, 1),
+        "bulk_ms": round(bulk_ms, 1),
+        "speedup": round(per_element_ms / bulk_ms, 1) if bulk_ms else None,
+        "same_listings": per_element == bulk,
+    }
+
+
+def run_http_benchmark(cities=8, pages=3, per_page=30, latency_ms=50, workers=8) -> dict:
+    """
+    Pooled parallel HTTP scraping (Scraper.scrape_cities) against the old
+    path: sequential requests.get without a session, parsed with html.parser.
+    """
+    import requests
+    from bs4 import BeautifulSoup
+    from src.playwright_scraper.scraper_common import SELECTORS
+    from src.requests_scraper.magicbricks_requests import Scraper
+
+    server, base_url = start_fixture_server()
+    names = [f"city-{i}" for i in range(cities)]
+    build = functools.partial(static_url, base_url, per_page=per_page, pages=pages, latency_ms=latency_ms)
+    try:
+        started = time.perf_counter()
+        sequential = 0
+        for city in names:
+            for page in range(1, pages + 1):
+                res = requests.get(build(city, page), headers={"User-Agent": "Mozilla/5.0"})
+                sequential += len(BeautifulSoup(res.text, "html.parser").select(SELECTORS["card"][0]))
+        sequential_seconds = time.perf_counter() - started
+
+        scraper = Scraper(workers=workers, url_builder=build)
+        started = time.perf_counter()
+        results, needs_js = scraper.scrape_cities(names)
+        pooled_seconds = time.perf_counter() - started
+        scraper.session.close()
+
+        # Parse cost alone, on one page
+        html = requests.get(build(names[0], 1)).text
+        started = time.perf_counter()
+        BeautifulSoup(html, "html.parser").select(SELECTORS["card"][0])
+        bs4_ms = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        scraper.parse(html, names[0], base_url)
+        lxml_ms = (time.perf_counter() - started) * 1000
+    finally:
+        server.shutdown()
+
+    pooled = sum(len(listings) for listings in results.values())
+    return {
+        "cities": cities,
+        "pages_per_city": pages,
+        "cards_per_page": per_page,
+        "latency_ms": latency_ms,
+        "workers": workers,
+        "sequential_seconds": round(sequential_seconds, 2),
+        "pooled_seconds": round(pooled_seconds, 2),
+        "speedup": round(sequential_seconds / pooled_seconds, 1) if pooled_seconds else None,
+        "pooled_listings_per_sec": round(pooled / pooled_seconds, 1) if pooled_seconds else None,
+        "parse_ms_html_parser": round(bs4_ms, 2),
+        "parse_ms_lxml": round(lxml_ms, 2),
+        "listings": pooled,
+        "complete": pooled == sequential == cities * pages * per_page and not needs_js,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Offline async scraper benchmark")
+    parser.add_argument("--cities", type=int, default=8)
+    parser.add_argument("--cards", type=int, default=60, help="Cards per city")
+    parser.add_argument("--batch", type=int, default=20, help="Cards rendered per lazy load")
+    parser.add_argument("--delay-ms", type=int, default=150, help="Fixture lazy-load delay")
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--min-interval", type=float, default=0.0, help="Politeness gap between requests")
+    parser.add_argument("--resources", action="store_true",
+                        help="Run with and without lightweight mode and compare bytes and time per page")
+    parser.add_argument("--asset-latency-ms", type=int, default=0,
+                        help="Simulated latency per image, font and script request (--resources)")
+    parser.add_argument("--http", action="store_true",
+                        help="Compare pooled parallel HTTP scraping with sequential requests on server-rendered pages")
+    parser.add_argument("--pages", type=int, default=3, help="Result pages per city (--http)")
+    parser.add_argument("--latency-ms", type=int, default=50, help="Simulated server latency per page (--http)")
+    parser.add_argument("--workers", type=int, default=8, help="Parallel HTTP fetches (--http)")
+    parser.add_argument("--extraction", action="store_true",
+                        help="Compare per-element and bulk card extraction on one page of --cards cards")
+    args = parser.parse_args(argv)
+
+    if args.http:
+        result = run_http_benchmark(args.cities, args.pages, args.cards, args.latency_ms, args.workers)
+        print(json.dumps(result, indent=2))
+        return 0 if result["complete"] else 1
+
+    if args.extraction:
+        result = run_extraction_benchmark(args.cards)
+        print(json.dumps(result, indent=2))
+        return 0 if result["same_listings"] else 1
+
+    if args.resources:
+        results = [
+            run_benchmark(args.cities, args.cards, args.batch, args.delay_ms, args.pool_size, args.min_interval,
+                          lightweight=lightweight, asset_latency_ms=args.asset_latency_ms)
+            for lightweight in (False, True)
+        ]
+        print(json.dumps({"full": results[0], "lightweight": results[1]}, indent=2))
+        return 1 if any(result["incomplete_cities"] for result in results) else 0
+
+    result = run_benchmark(args.cities, args.cards, args.batch, args.delay_ms, args.pool_size, args.min_interval)
+    print(json.dumps(result, indent=2))
+    return 1 if result["incomplete_cities"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
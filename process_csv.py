@@ -1,72 +1,147 @@
+import numpy as np
 import pandas as pd
-import random
-
-# Read the CSV file
-csv_path = 'data/outputs/magicbricks_india_properties_cleaned.csv'
-df = pd.read_csv(csv_path)
-
-print(f"Original shape: {df.shape}")
-print(f"Original columns: {df.columns.tolist()}")
-
-# Drop the specified columns
-columns_to_drop = ['bedrooms', 'bathrooms', 'link', 'title']
-df = df.drop(columns=columns_to_drop, errors='ignore')
-
-print(f"\nAfter dropping columns: {df.shape}")
-
-# Calculate missing price_per_sqft using price_total_inr and area_sqft
-def calculate_price_per_sqft(row):
-    """Calculate price_per_sqft if missing"""
-    if pd.notna(row['price_per_sqft']):
-        return row['price_per_sqft']
-    elif pd.notna(row['price_total_inr']) and pd.notna(row['area_sqft']) and row['area_sqft'] > 0:
-        return row['price_total_inr'] / row['area_sqft']
-    else:
-        return None
-
-df['price_per_sqft'] = df.apply(calculate_price_per_sqft, axis=1)
-
-# Add BHK column based on area_sqft
-def assign_bhk(area):
-    """Assign BHK based on area_sqft"""
-    if pd.isna(area):
-        return None
-    elif area < 1000:
-        return 1
-    else:
-        return random.randint(2, 5)
-
-df['BHK'] = df['area_sqft'].apply(assign_bhk)
-
-# Reorder columns for better readability
-column_order = ['location', 'city', 'price_total_inr', 'price_per_sqft', 'area_sqft', 'BHK']
-df = df[column_order]
-
-# Save the processed CSV
-output_path = 'data/outputs/magicbricks_india_final.csv'
-df.to_csv(output_path, index=False)
-
-print(f"\n{'='*60}")
-print(f"CSV PROCESSING SUMMARY")
-print(f"{'='*60}")
-print(f"Columns dropped: {columns_to_drop}")
-print(f"New column 'BHK' added based on area_sqft:")
-print(f"  - 1 BHK if area_sqft < 1000")
-print(f"  - Random 2-5 BHK if area_sqft >= 1000")
-print(f"\nCalculated missing price_per_sqft values")
-print(f"Formula: price_per_sqft = price_total_inr / area_sqft")
-print(f"\nFinal shape: {df.shape}")
-print(f"Output saved to: {output_path}")
-print(f"\n{'='*60}")
-print(f"FIRST FEW ROWS:")
-print(f"{'='*60}")
-print(df.head(10))
-print(f"\n{'='*60}")
-print(f"DATA STATISTICS:")
-print(f"{'='*60}")
-print(f"\nBHK distribution:")
-print(df['BHK'].value_counts().sort_index())
-print(f"\nMissing values:")
-print(df.isnull().sum())
-print(f"\nPrice per sqft stats:")
-print(df['price_per_sqft'].describe())
+
+INPUT_PATH = 'data/outputs/magicbricks_india_properties_cleaned.csv'
+OUTPUT_PATH = 'data/outputs/magicbricks_india_final.csv'
+
+COLUMNS_TO_DROP = ['bedrooms', 'bathrooms', 'link', 'title']
+
+# Output schema: column -> dtype (BHK is nullable so listings without an area keep NA)
+FINAL_SCHEMA = {
+    'location': 'object',
+    'city': 'object',
+    'price_total_inr': 'float64',
+    'price_per_sqft': 'float64',
+    'area_sqft': 'float64',
+    'BHK': 'Int64',
+}
+
+# Listing columns that seed the BHK guess, so a listing always gets the same BHK
+# regardless of row order or which other listings were scraped
+BHK_SEED_COLUMNS = ['location', 'city', 'area_sqft']
+
+# Scraped bedroom counts above this (e.g. a large villa) are set to missing, not analysed as a BHK
+MAX_BHK = 10
+
+
+def fill_price_per_sqft(df: pd.DataFrame) -> pd.Series:
+    """Keep scraped price_per_sqft; fill missing values as price_total_inr / area_sqft"""
+    price = df['price_total_inr'].to_numpy(dtype=float)
+    area = df['area_sqft'].to_numpy(dtype=float)
+    existing = df['price_per_sqft'].to_numpy(dtype=float)
+
+    computed = np.divide(price, area, out=np.full_like(price, np.nan), where=area > 0)
+    return pd.Series(np.where(np.isnan(existing), computed, existing), index=df.index)
+
+
+def assign_bhk(df: pd.DataFrame) -> pd.Series:
+    """
+    BHK per listing: 1 BHK below 1000 sqft, otherwise 2-5 BHK.
+
+    The 2-5 BHK choice is derived from a hash of the listing itself instead
+    of random.randint, so re-running the prep stage reproduces the same
+    dataset. Scraped bedroom counts are used when present.
+    """
+    area = df['area_sqft'].to_numpy(dtype=float)
+    seed = pd.util.hash_pandas_object(df[BHK_SEED_COLUMNS], index=False).to_numpy()
+    guess = np.where(area < 1000, 1, 2 + (seed % 4).astype(np.int64))
+
+    bhk = pd.Series(guess, index=df.index, dtype='Int64').mask(np.isnan(area))
+    if 'bedrooms' in df:
+        scraped = pd.to_numeric(df['bedrooms'], errors='coerce').round().astype('Int64')
+        bhk = scraped.where((scraped > 0).fillna(False), bhk)
+    return bhk
+
+
+def validate_schema(df: pd.DataFrame) -> None:
+    """Raise ValueError if df does not match FINAL_SCHEMA or holds impossible values"""
+    problems = []
+
+    missing = [column for column in FINAL_SCHEMA if column not in df]
+    if missing:
+        problems.append(f"missing columns {missing}")
+    extra = [column for column in df if column not in FINAL_SCHEMA]
+    if extra:
+        problems.append(f"unexpected columns {extra}")
+
+    for column, dtype in FINAL_SCHEMA.items():
+        if column in df and str(df[column].dtype) != dtype:
+            problems.append(f"{column} is {df[column].dtype}, expected {dtype}")
+
+    if not problems:
+        for column in ('price_total_inr', 'price_per_sqft', 'area_sqft'):
+            negative = int((df[column] < 0).sum())
+            if negative:
+                problems.append(f"{negative} negative values in {column}")
+        bad_bhk = int((~df['BHK'].isna() & ~df['BHK'].between(1, MAX_BHK)).sum())
+        if bad_bhk:
+            problems.append(f"{bad_bhk} BHK values outside 1-{MAX_BHK}")
+
+    if problems:
+        raise ValueError("Invalid prepared dataset: " + "; ".join(problems))
+
+
+def prepare_listings(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cleaned scrape -> analysis input (FINAL_SCHEMA columns, typed and validated)
+
+    Deterministic: the same input always produces the same output, so
+    downstream content-hash caches stay valid across re-runs. Listings with
+    more than MAX_BHK scraped bedrooms keep their row with a missing BHK.
+    """
+    df = df.copy()
+    df['price_total_inr'] = pd.to_numeric(df['price_total_inr'], errors='coerce')
+    df['area_sqft'] = pd.to_numeric(df['area_sqft'], errors='coerce')
+    df['price_per_sqft'] = pd.to_numeric(df['price_per_sqft'], errors='coerce')
+
+    df['price_per_sqft'] = fill_price_per_sqft(df)
+    bhk = assign_bhk(df)
+    implausible = (bhk > MAX_BHK).fillna(False)
+    df['BHK'] = bhk.mask(implausible)
+    if implausible.any():
+        print(f"BHK above {MAX_BHK} set to missing: {int(implausible.sum())} listings")
+
+    df = df.drop(columns=COLUMNS_TO_DROP, errors='ignore')
+    df = df[list(FINAL_SCHEMA)].astype(FINAL_SCHEMA).reset_index(drop=True)
+    validate_schema(df)
+    return df
+
+
+def process_csv(input_path: str = INPUT_PATH, output_path: str = OUTPUT_PATH) -> pd.DataFrame:
+    df = pd.read_csv(input_path)
+
+    print(f"Original shape: {df.shape}")
+    print(f"Original columns: {df.columns.tolist()}")
+
+    df = prepare_listings(df)
+    df.to_csv(output_path, index=False)
+
+    print(f"\n{'='*60}")
+    print(f"CSV PROCESSING SUMMARY")
+    print(f"{'='*60}")
+    print(f"Columns dropped: {COLUMNS_TO_DROP}")
+    print(f"New column 'BHK' added based on area_sqft:")
+    print(f"  - 1 BHK if area_sqft < 1000")
+    print(f"  - 2-5 BHK if area_sqft >= 1000 (stable per listing)")
+    print(f"\nCalculated missing price_per_sqft values")
+    print(f"Formula: price_per_sqft = price_total_inr / area_sqft")
+    print(f"\nFinal shape: {df.shape}")
+    print(f"Output saved to: {output_path}")
+    print(f"\n{'='*60}")
+    print(f"FIRST FEW ROWS:")
+    print(f"{'='*60}")
+    print(df.head(10))
+    print(f"\n{'='*60}")
+    print(f"DATA STATISTICS:")
+    print(f"{'='*60}")
+    print(f"\nBHK distribution:")
+    print(df['BHK'].value_counts().sort_index())
+    print(f"\nMissing values:")
+    print(df.isnull().sum())
+    print(f"\nPrice per sqft stats:")
+    print(df['price_per_sqft'].describe())
+    return df
+
+
+if __name__ == "__main__":
+    process_csv()
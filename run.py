@@ -1,6 +1,6 @@
-from src.Parameters.analyzer import run_analysis
+from src.Parameters.analyzer import run_incremental_analysis
 
 if __name__ == "__main__":
-    run_analysis()
+    run_incremental_analysis(workers=0)
     
 
@@ -70,6 +70,13 @@ app.config['SECRET_KEY'] = 'your-secret-key-here'  # Change in production
 # Initialize analyzer service
 analyzer = RealEstateAnalyzer()
 
+# Load the bank rate table at startup so requests reuse it
+try:
+    from src.Parameters.bank_comparison import get_bank_rates
+    print(f"[OK] Loaded {len(get_bank_rates())} bank rates")
+except Exception as e:
+    print(f"[WARNING] Bank rates not available: {e}")
+
 # Initialize RAG vector database
 vector_db = None
 if RAG_AVAILABLE:
@@ -206,7 +213,8 @@ def calculate_analysis():
             'appreciation_rate': float(data.get('appreciation_rate', 5)),
             'rent_escalation': float(data.get('rent_escalation', 5)),
             'investment_return_rate': float(data.get('investment_return_rate', 10)),
-            'monthly_savings': float(data.get('monthly_savings', 15000))
+            'monthly_savings': float(data.get('monthly_savings', 15000)),
+            'tax_bracket': float(data.get('tax_bracket', 0))
         }
         
         # Perform analysis
@@ -223,10 +231,205 @@ def calculate_analysis():
             appreciation_rate=custom_params['appreciation_rate']
         )
         
-        return jsonify({
+        response = {
             'success': True,
             'analysis': result,
             'roi': roi_data
+        }
+        
+        # Optional Monte Carlo simulation centred on the submitted assumptions
+        if data.get('monte_carlo'):
+            from services.monte_carlo import (
+                run_monte_carlo, distributions_around, DEFAULT_SIMULATIONS, MAX_SIMULATIONS
+            )
+            simulations = min(int(data.get('simulations', DEFAULT_SIMULATIONS)), MAX_SIMULATIONS)
+            response['monte_carlo'] = run_monte_carlo(
+                property_price,
+                monthly_rent,
+                n_simulations=simulations,
+                distributions=distributions_around(custom_params),
+                params=custom_params,
+                seed=data.get('seed')
+            )
+        
+        return jsonify(response)
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+
+@app.route('/api/sensitivity', methods=['POST'])
+def sensitivity_analysis():
+    """
+    API endpoint for sensitivity analysis
+    Sweeps one or two assumptions over a grid and returns wealth matrices,
+    break-even values and tornado-chart ranges
+    """
+    try:
+        from services.sensitivity import sensitivity_grid, tornado_analysis, DEFAULT_STEPS
+        data = request.json or {}
+        
+        property_price = float(data.get('property_price', 0))
+        monthly_rent = float(data.get('monthly_rent', 0))
+        base_params = {
+            key: float(data[key]) for key in (
+                'down_payment_percent', 'loan_rate', 'loan_tenure_years',
+                'appreciation_rate', 'rent_escalation', 'investment_return_rate'
+            ) if key in data
+        }
+        
+        grid = sensitivity_grid(
+            property_price,
+            monthly_rent,
+            x_param=data.get('x_param', 'loan_rate'),
+            y_param=data.get('y_param'),
+            x_values=data.get('x_values'),
+            y_values=data.get('y_values'),
+            steps=int(data.get('steps', DEFAULT_STEPS)),
+            base_params=base_params
+        )
+        tornado = tornado_analysis(property_price, monthly_rent, base_params=base_params)
+        
+        return jsonify({
+            'success': True,
+            'grid': grid,
+            'tornado': tornado
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+
+@app.route('/api/trajectories', methods=['POST'])
+def wealth_trajectories_api():
+    """
+    API endpoint for month-by-month buy vs rent wealth curves
+    Accepts a single property (property_price, monthly_rent) or a city,
+    and returns curves plus the month buying overtakes renting
+    """
+    try:
+        import numpy as np
+        from services.analysis import estimate_rents
+        from services.trajectories import get_trajectories
+        data = request.json or {}
+        
+        params = {
+            key: float(data[key]) for key in (
+                'down_payment_percent', 'loan_rate', 'loan_tenure_years',
+                'appreciation_rate', 'investment_return_rate'
+            ) if key in data
+        }
+        
+        if data.get('city'):
+            df = load_properties_data()
+            df = df[df['city'].str.lower() == str(data['city']).lower()]
+            if df.empty:
+                return jsonify({'success': False, 'error': f"No properties found for {data['city']}"}), 404
+            labels = df['location'].tolist()
+            prices = df['price'].to_numpy(dtype=float)
+            rents = (df['estimated_rent'].to_numpy(dtype=float) if 'estimated_rent' in df.columns
+                     else estimate_rents(prices, df['area_sqft']))
+        else:
+            labels = [data.get('label', 'Property')]
+            prices = np.array([float(data.get('property_price', 0))])
+            rents = np.array([float(data.get('monthly_rent', 0))])
+        
+        trajectories = get_trajectories(prices, rents, params)
+        
+        # Yearly points keep payloads small; pass resolution=month for every month
+        step = 1 if data.get('resolution') == 'month' else 12
+        months = trajectories['months'][::step]
+        
+        properties = []
+        for i, label in enumerate(labels):
+            crossover = trajectories['crossover_month'][i]
+            properties.append({
+                'label': label,
+                'price': float(prices[i]),
+                'monthly_rent': float(rents[i]),
+                'emi': float(trajectories['emi'][i]),
+                'break_even_month': None if np.isnan(crossover) else int(crossover),
+                'wealth_buying': np.round(trajectories['wealth_buying'][i, ::step], 2).tolist(),
+                'wealth_renting': np.round(trajectories['wealth_renting'][i, ::step], 2).tolist(),
+            })
+        
+        return jsonify({
+            'success': True,
+            'months': months.tolist(),
+            'params': trajectories['params'],
+            'properties': properties
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+
+
+@app.route('/api/bank-offers', methods=['POST'])
+def bank_offers():
+    """
+    API endpoint for home loan offers across banks
+    With property_price: every bank's EMI/interest/cost for that property.
+    Otherwise: the lowest-cost bank for each listing (optionally per city).
+    """
+    try:
+        from src.Parameters.bank_comparison import bank_offer_matrix, best_bank_offers
+        data = request.json or {}
+        
+        down_payment_percent = float(data.get('down_payment_percent', 20))
+        tenure_years = int(data.get('loan_tenure_years', 20))
+        appreciation_rate = float(data.get('appreciation_rate', 5))
+        
+        if data.get('property_price'):
+            matrix = bank_offer_matrix(
+                [float(data['property_price'])], down_payment_percent, tenure_years, appreciation_rate
+            )
+            offers = sorted(
+                (
+                    {
+                        'bank': bank,
+                        'interest_rate': float(matrix['rates'][i]),
+                        'monthly_emi': round(float(matrix['emi'][0, i]), 2),
+                        'total_interest': round(float(matrix['total_interest'][0, i]), 2),
+                        'total_payment': round(float(matrix['total_payment'][0, i]), 2),
+                        'wealth_buying': round(float(matrix['wealth_buying'][0, i]), 2),
+                    }
+                    for i, bank in enumerate(matrix['banks'])
+                ),
+                key=lambda offer: offer['total_payment']
+            )
+            return jsonify({
+                'success': True,
+                'loan_amount': round(float(matrix['loan_amount'][0]), 2),
+                'offers': offers,
+                'best_bank': offers[0]['bank'] if offers else None
+            })
+        
+        df = load_properties_data()
+        if data.get('city') and data['city'] != 'all':
+            df = df[df['city'].str.lower() == str(data['city']).lower()]
+        
+        best = best_bank_offers(df['price'], down_payment_percent, tenure_years, appreciation_rate)
+        if best.empty:
+            return jsonify({'success': True, 'properties': [], 'total': len(df)})
+        best.index = df.index
+        listings = df[['location', 'city', 'price', 'bhk']].join(best)
+        
+        limit = int(data.get('limit', 100))
+        listings = listings.sort_values('savings_vs_costliest', ascending=False).head(limit)
+        
+        return jsonify({
+            'success': True,
+            'properties': listings.to_dict('records'),
+            'total': len(df)
         })
         
     except Exception as e:
@@ -342,6 +545,22 @@ def properties_browse():
         )
 
 
+def apply_tax_bracket(df, tax_bracket):
+    """
+    Listings with loan tax columns for the buyer's bracket, and buy_advantage
+    and decision recomputed from the tax-adjusted buying wealth.
+
+    The analyzed dataset already has monthly_emi / total_interest / tax_saving
+    (at the default bracket); they are replaced, not duplicated.
+    """
+    from services.tax_adjusted import tax_adjusted_columns
+    tax_columns = tax_adjusted_columns(df, tax_bracket)
+    df = df.drop(columns=tax_columns.columns, errors='ignore').join(tax_columns)
+    df['buy_advantage'] = tax_columns['buy_advantage_after_tax']
+    df['decision'] = tax_columns['decision_after_tax']
+    return df
+
+
 @app.route('/api/properties/browse', methods=['GET'])
 def api_properties_browse():
     """
@@ -360,12 +579,14 @@ def api_properties_browse():
         
         # Calculate buy_advantage for each property
         # buy_advantage = (wealth_buying - wealth_renting) / wealth_renting * 100
+        from src.rag.investment_intelligence import compute_buy_advantage
         df_copy = df.copy()
-        df_copy['buy_advantage'] = df_copy.apply(
-            lambda row: ((row['wealth_buying'] - row['wealth_renting']) / row['wealth_renting'] * 100)
-            if row['wealth_renting'] > 0 else 0,
-            axis=1
-        )
+        df_copy['buy_advantage'] = compute_buy_advantage(df_copy)
+        
+        # Optional income tax bracket: rank on tax-adjusted buying wealth
+        tax_bracket = request.args.get('tax_bracket', default=0, type=float)
+        if tax_bracket:
+            df_copy = apply_tax_bracket(df_copy, tax_bracket)
         
         # Convert to list of dicts
         properties = df_copy.to_dict('records')
@@ -373,7 +594,8 @@ def api_properties_browse():
         return jsonify({
             'success': True,
             'properties': properties,
-            'total': len(properties)
+            'total': len(properties),
+            'tax_bracket': tax_bracket
         })
         
     except Exception as e:
@@ -403,11 +625,12 @@ def api_properties_filter():
         data = request.json or {}
         
         # Calculate buy_advantage
-        df['buy_advantage'] = df.apply(
-            lambda row: ((row['wealth_buying'] - row['wealth_renting']) / row['wealth_renting'] * 100)
-            if row['wealth_renting'] > 0 else 0,
-            axis=1
-        )
+        from src.rag.investment_intelligence import compute_buy_advantage
+        df['buy_advantage'] = compute_buy_advantage(df)
+        
+        # Optional income tax bracket: rank on tax-adjusted buying wealth
+        if data.get('taxBracket'):
+            df = apply_tax_bracket(df, float(data['taxBracket']))
         
         # Apply filters
         filtered_df = df.copy()
@@ -708,8 +931,28 @@ def chat():
             
             # 3h. For SCENARIO queries, return scenario analysis
             elif intent == "SCENARIO":
-                from src.rag.rag_engine import generate_scenario_response
-                from src.rag.intent_classifier import extract_scenario_from_query
+                from src.rag.rag_engine import generate_scenario_response, generate_sensitivity_response
+                from src.rag.intent_classifier import (
+                    extract_scenario_from_query, extract_sensitivity_params_from_query,
+                    extract_sensitivity_values_from_query
+                )
+                
+                # Sensitivity questions ("if interest rate...", "sensitivity") get parameter sweeps
+                sensitivity_params = extract_sensitivity_params_from_query(user_query)
+                if sensitivity_params or 'sensitivity' in user_query.lower():
+                    city = detected_cities[0] if detected_cities else None
+                    properties = filter_properties(city=city, bhk=detected_bhk, limit=1)
+                    prop = properties[0] if properties else {}
+                    price = prop.get('price', 10000000)
+                    rent = prop.get('estimated_rent', price * 0.003)
+                    response = generate_sensitivity_response(
+                        price, rent, sensitivity_params, extract_sensitivity_values_from_query(user_query)
+                    )
+                    return jsonify({
+                        'success': True,
+                        'response': response,
+                        'source': 'Sensitivity Analysis' if properties else 'Sensitivity Analysis (default values)'
+                    })
                 
                 # Try to find property price/rent from query context
                 city = detected_cities[0] if detected_cities else None
@@ -735,11 +978,14 @@ def chat():
                         'source': 'Scenario Analysis (default values)'
                     })
             
-            # 3i. For RECOMMEND queries, get filtered properties for LLM analysis
+            # 3i. For RECOMMEND queries, get the best-scoring properties for LLM analysis
             # NOTE: RECOMMEND still uses LLM for buy/rent advice
             elif intent == "RECOMMEND":
+                from src.rag.investment_intelligence import rank_investment_opportunities
                 city = detected_cities[0] if detected_cities else None
-                properties = filter_properties(city=city, bhk=detected_bhk, limit=8)
+                properties = rank_investment_opportunities(city=city, bhk=detected_bhk, limit=8)
+                if not properties:
+                    properties = filter_properties(city=city, bhk=detected_bhk, limit=8)
                 if properties:
                     context_parts.append(format_properties_for_context(properties))
                     retrieval_source.append(f"Properties ({len(properties)} results)")
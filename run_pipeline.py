@@ -0,0 +1,28 @@
+import argparse
+import sys
+
+from src.pipeline.stages import build_pipeline
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the data pipeline, skipping up-to-date stages")
+    parser.add_argument("targets", nargs="*", help="Stages to bring up to date (default: all)")
+    parser.add_argument("--force", nargs="+", default=[], metavar="STAGE",
+                        help="Rerun these stages even if up to date ('all' for every stage)")
+    parser.add_argument("--workers", type=int, default=None, help="Max stages running at once")
+    parser.add_argument("--dry-run", action="store_true", help="Only show what would run")
+    args = parser.parse_args()
+
+    report = build_pipeline().run(args.targets or None, force=args.force, workers=args.workers,
+                                  dry_run=args.dry_run)
+
+    print("\nStage            Status      Seconds  Reason")
+    for name, result in report.items():
+        print(f"{name:<16} {result['status']:<11} {result['seconds']:>7.2f}  {result['reason']}")
+
+    if any(result["status"] in ("failed", "blocked") for result in report.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,15 @@ Real Estate Investment Analysis Service
 Handles all financial calculations, ROI analysis, and buy vs rent comparisons
 """
 
+import numpy as np
 import pandas as pd
 from typing import Dict, List, Any, Optional
 
+from services.projections import loan_balance_array, HORIZON_YEARS
+from services.trajectories import get_trajectories
+from src.Parameters.kernels import annuity_factor, sip_factor, growth_factor, escalating_sum_factor
+from src.Parameters.tax import loan_tax_savings_by_year
+
 
 class RealEstateAnalyzer:
     """
@@ -42,14 +48,8 @@ class RealEstateAnalyzer:
         if principal <= 0 or rate_percent <= 0 or tenure_years <= 0:
             return 0
         
-        monthly_rate = rate_percent / (12 * 100)
-        num_months = tenure_years * 12
-        
-        if monthly_rate == 0:
-            return principal / num_months
-        
-        emi = principal * monthly_rate * (1 + monthly_rate) ** num_months / \
-              ((1 + monthly_rate) ** num_months - 1)
+        # EMI = P * r(1+r)^n / ((1+r)^n - 1), factor shared via the kernel cache
+        emi = principal * annuity_factor(rate_percent, tenure_years * 12)
         
         return round(emi, 2)
     
@@ -68,14 +68,10 @@ class RealEstateAnalyzer:
             Dictionary with ROI metrics
         """
         # Calculate future property value
-        future_value = property_price * (1 + appreciation_rate / 100) ** years
+        future_value = property_price * growth_factor(appreciation_rate, years)
         
-        # Calculate total rental income (with 5% escalation)
-        total_rent = 0
-        current_rent = rent
-        for year in range(years):
-            total_rent += current_rent * 12
-            current_rent *= (1 + 0.05)  # 5% annual escalation
+        # Calculate total rental income (with 5% annual escalation)
+        total_rent = rent * 12 * escalating_sum_factor(5, years)
         
         # Calculate total returns
         total_return = (future_value - property_price) + total_rent
@@ -97,14 +93,18 @@ class RealEstateAnalyzer:
         
         METHODOLOGY:
         -----------
-        - BUYING: Calculate total cost (down payment + EMIs), then project property value
-          with appreciation. Wealth = Future Value - Total Cost Paid.
+        - BUYING: Calculate total cost (down payment + EMIs paid in the 20 years + loan
+          still outstanding after them), then project property value with appreciation.
+          Wealth = Future Value - Total Cost (+ loan tax savings with a tax bracket).
         
         - RENTING: Invest the down payment + monthly savings (EMI - Rent) in equity.
           Wealth = Investment Corpus after 20 years.
         
         - DECISION: If Wealth(Buying) > Wealth(Renting), recommend BUY.
         
+        - BREAK-EVEN: First month in which buying wealth (value - loan balance -
+          cash paid) exceeds renting wealth, from month-by-month trajectories.
+        
         ASSUMPTIONS (see INVESTMENT_METRICS.md for details):
         - Down payment: 20% of property price
         - Loan rate: 8.5% p.a. (average home loan rate in India)
@@ -134,32 +134,41 @@ class RealEstateAnalyzer:
         # Step 2: Calculate EMI using standard formula
         monthly_emi = self.calculate_emi(loan_amount, p['loan_rate'], p['loan_tenure_years'])
         
-        # Step 3: Total cost = Down payment + All EMI payments over tenure
-        total_emi_paid = monthly_emi * p['loan_tenure_years'] * 12
-        total_buying_cost = down_payment + total_emi_paid
+        # Step 3: Total cost = Down payment + EMIs paid within the horizon
+        # + loan still outstanding at its end (tenure longer than the horizon)
+        years = HORIZON_YEARS
+        paid_months = min(p['loan_tenure_years'], years) * 12
+        outstanding_loan = float(loan_balance_array(
+            loan_amount, p['loan_rate'], monthly_emi, paid_months, p['loan_tenure_years']
+        ))
+        total_buying_cost = down_payment + monthly_emi * paid_months + outstanding_loan
         
         # Step 4: Project property value with compound appreciation
-        years = 20
-        future_property_value = property_price * (1 + p['appreciation_rate'] / 100) ** years
+        future_property_value = property_price * growth_factor(p['appreciation_rate'], years)
         
-        # Step 5: Net wealth from buying = Asset value - Cost paid
+        # Step 5: Net wealth from buying = Asset value - Cost paid (+ loan tax savings)
         # NOTE: Does not include property taxes, maintenance, or stamp duty (simplified model)
-        wealth_buying = future_property_value - total_buying_cost
+        # Section 24 / 80C savings apply only when a tax bracket is given
+        yearly_tax_saving = np.zeros(years)
+        if p.get('tax_bracket'):
+            saved = loan_tax_savings_by_year(
+                [property_price], p['down_payment_percent'], p['loan_rate'],
+                p['loan_tenure_years'], p['tax_bracket'], horizon_years=years
+            )[0]
+            yearly_tax_saving[:len(saved)] = saved
+        tax_saving = round(float(yearly_tax_saving.sum()), 2)
+        wealth_buying = future_property_value - total_buying_cost + tax_saving
         
         # ============================
         # RENTING SCENARIO CALCULATIONS
         # ============================
         
         # Step 1: Calculate total rent over 20 years (with annual escalation)
-        total_rent_paid = 0
-        current_rent = monthly_rent
-        for year in range(years):
-            total_rent_paid += current_rent * 12
-            current_rent *= (1 + p['rent_escalation'] / 100)
+        total_rent_paid = monthly_rent * 12 * escalating_sum_factor(p['rent_escalation'], years)
         
         # Step 2: Invest down payment in equity/mutual funds
         # Future Value = Principal * (1 + rate)^years
-        investment_corpus = down_payment * (1 + p['investment_return_rate'] / 100) ** years
+        investment_corpus = down_payment * growth_factor(p['investment_return_rate'], years)
         
         # Step 3: Monthly savings = (EMI - Rent) invested as SIP
         # If renting is cheaper, the savings are invested monthly
@@ -171,8 +180,7 @@ class RealEstateAnalyzer:
             months = years * 12
             if monthly_return_rate > 0:
                 monthly_savings_investment = savings_per_month * \
-                    (((1 + monthly_return_rate) ** months - 1) / monthly_return_rate) * \
-                    (1 + monthly_return_rate)
+                    sip_factor(p['investment_return_rate'], months)
         
         # Step 4: Total wealth from renting = Investment corpus + SIP corpus
         wealth_renting = investment_corpus + monthly_savings_investment
@@ -185,10 +193,16 @@ class RealEstateAnalyzer:
         # Decision logic: Higher final wealth wins
         recommendation = "Buy" if wealth_buying > wealth_renting else "Rent"
         
-        # Calculate break-even point (simplified)
-        break_even_years = 0
-        if wealth_difference != 0:
-            break_even_years = min(years, max(5, int(abs(wealth_difference) / (property_price * 0.05))))
+        # Break-even: first month buying wealth overtakes renting wealth
+        # (month-by-month trajectories; None if buying never pulls ahead).
+        # Tax saved in each loan year counts from that year's end, so the
+        # last month matches wealth_difference above.
+        trajectory = get_trajectories(property_price, monthly_rent, p, years)
+        months = trajectory['months']
+        tax_to_date = np.concatenate([[0.0], np.cumsum(yearly_tax_saving)])[months // 12]
+        ahead = np.flatnonzero(trajectory['wealth_difference'][0] + tax_to_date > 0)
+        break_even_month = int(ahead[0]) if ahead.size else None
+        break_even_years = None if break_even_month is None else round(break_even_month / 12, 1)
         
         return {
             # Buying metrics
@@ -196,7 +210,9 @@ class RealEstateAnalyzer:
             'buy_loan_amount': round(loan_amount, 2),
             'buy_monthly_emi': round(monthly_emi, 2),
             'buy_total_cost': round(total_buying_cost, 2),
+            'buy_outstanding_loan': round(outstanding_loan, 2),
             'buy_future_value': round(future_property_value, 2),
+            'buy_tax_saving': round(tax_saving, 2),
             'buy_wealth': round(wealth_buying, 2),
             
             # Renting metrics
@@ -210,6 +226,7 @@ class RealEstateAnalyzer:
             'wealth_difference': round(wealth_difference, 2),
             'recommendation': recommendation,
             'break_even_years': break_even_years,
+            'break_even_month': break_even_month,
             'monthly_cash_flow_buy': round(-monthly_emi, 2),
             'monthly_cash_flow_rent': round(-monthly_rent, 2)
         }
@@ -452,3 +469,13 @@ def estimate_rent(price: float, area_sqft: float) -> float:
     max_rent = price * 0.004
     
     return round(max(min_rent, min(estimated_rent, max_rent)), 2)
+
+
+def estimate_rents(prices, areas_sqft) -> np.ndarray:
+    """
+    Vectorized estimate_rent for arrays of properties
+    """
+    prices = np.asarray(prices, dtype=float)
+    areas_sqft = np.asarray(areas_sqft, dtype=float)
+    estimated = np.where(areas_sqft > 0, areas_sqft * 20, 0.0)
+    return np.round(np.clip(estimated, prices * 0.002, prices * 0.004), 2)
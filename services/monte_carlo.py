@@ -0,0 +1,208 @@
+"""
+Monte Carlo Buy vs Rent Engine
+Samples market assumptions from configurable distributions and evaluates
+every path in one vectorized projection, instead of three fixed scenarios
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+from services.projections import buy_vs_rent_arrays
+
+DEFAULT_SIMULATIONS = 20000
+MAX_SIMULATIONS = 200000  # Per-request cap for the web API
+PERCENTILES = [5, 25, 50, 75, 95]
+
+# Sampled assumptions (annual %), centred on RealEstateAnalyzer.default_params.
+# Supported distributions: normal (mean, std), uniform (low, high),
+# triangular (low, mode, high) and fixed (value); min/max clip the samples.
+DEFAULT_DISTRIBUTIONS = {
+    'appreciation_rate': {'dist': 'normal', 'mean': 5.0, 'std': 2.0, 'min': -2.0, 'max': 15.0},
+    'rent_escalation': {'dist': 'normal', 'mean': 5.0, 'std': 1.5, 'min': 0.0, 'max': 12.0},
+    'investment_return_rate': {'dist': 'normal', 'mean': 10.0, 'std': 2.5, 'min': 2.0, 'max': 18.0},
+    'loan_rate': {'dist': 'triangular', 'low': 7.0, 'mode': 8.5, 'high': 11.0},
+}
+
+# Non-sampled inputs, same defaults as RealEstateAnalyzer
+FIXED_PARAMS = {
+    'down_payment_percent': 20,
+    'loan_tenure_years': 20,
+}
+
+
+def _sample(rng: np.random.Generator, spec: Dict[str, Any], size: int) -> np.ndarray:
+    """Draw samples for one assumption from its distribution spec"""
+    dist = spec.get('dist', 'normal')
+    if dist == 'normal':
+        values = rng.normal(spec['mean'], spec['std'], size)
+    elif dist == 'uniform':
+        values = rng.uniform(spec['low'], spec['high'], size)
+    elif dist == 'triangular':
+        values = rng.triangular(spec['low'], spec['mode'], spec['high'], size)
+    elif dist == 'fixed':
+        values = np.full(size, float(spec['value']))
+    else:
+        raise ValueError(f"Unknown distribution: {dist}")
+    return np.clip(values, spec.get('min', -np.inf), spec.get('max', np.inf))
+
+
+def resolve_distributions(overrides: Optional[Dict[str, Dict]] = None) -> Dict[str, Dict]:
+    """Merge per-assumption overrides into the default distributions"""
+    distributions = {name: dict(spec) for name, spec in DEFAULT_DISTRIBUTIONS.items()}
+    for name, spec in (overrides or {}).items():
+        if name not in distributions:
+            raise ValueError(f"Unknown assumption: {name}")
+        distributions[name] = dict(spec)
+    return distributions
+
+
+def distributions_around(params: Dict[str, float],
+                         distributions: Optional[Dict[str, Dict]] = None) -> Dict[str, Dict]:
+    """
+    Re-centre distributions on point estimates (e.g. user inputs to /api/calculate)
+
+    Normal means, triangular modes and fixed values move to the given value;
+    uniform ranges and clip bounds shift by the same amount.
+    """
+    distributions = resolve_distributions(distributions)
+    for name, value in params.items():
+        if name not in distributions or value is None:
+            continue
+        spec = distributions[name]
+        value = float(value)
+        dist = spec.get('dist', 'normal')
+        if dist == 'normal':
+            shift = value - spec['mean']
+            spec['mean'] = value
+        elif dist == 'triangular':
+            shift = value - spec['mode']
+            spec.update(low=spec['low'] + shift, mode=value, high=spec['high'] + shift)
+        elif dist == 'uniform':
+            shift = value - (spec['low'] + spec['high']) / 2
+            spec.update(low=spec['low'] + shift, high=spec['high'] + shift)
+        else:
+            shift = value - spec.get('value', value)
+            spec['value'] = value
+        for bound in ('min', 'max'):
+            if bound in spec:
+                spec[bound] += shift
+    return distributions
+
+
+def sample_assumptions(n_simulations: int, distributions: Optional[Dict[str, Dict]] = None,
+                       seed=None) -> Dict[str, np.ndarray]:
+    """Sample every assumption for n_simulations paths"""
+    rng = np.random.default_rng(seed)
+    distributions = resolve_distributions(distributions)
+    return {name: _sample(rng, spec, n_simulations) for name, spec in distributions.items()}
+
+
+def _summarize(values: np.ndarray) -> Dict[str, float]:
+    percentiles = np.percentile(values, PERCENTILES)
+    summary = {f"p{p}": round(float(v), 2) for p, v in zip(PERCENTILES, percentiles)}
+    summary['mean'] = round(float(values.mean()), 2)
+    return summary
+
+
+def run_monte_carlo(property_price: float, monthly_rent: float, n_simulations: int = DEFAULT_SIMULATIONS,
+                    distributions: Optional[Dict[str, Dict]] = None, params: Optional[Dict] = None,
+                    seed=None) -> Dict[str, Any]:
+    """
+    Simulate buy vs rent outcomes for one property
+
+    Args:
+        property_price: Property purchase price
+        monthly_rent: Monthly rent amount
+        n_simulations: Number of sampled paths
+        distributions: Optional per-assumption distribution overrides
+        params: Optional fixed inputs (down_payment_percent, loan_tenure_years)
+        seed: Seed (int or numpy SeedSequence) for reproducible results
+
+    Returns:
+        Dictionary with buy win probability, wealth percentiles and recommendation
+    """
+    if n_simulations <= 0:
+        raise ValueError("n_simulations must be positive")
+
+    fixed = {**FIXED_PARAMS, **{k: v for k, v in (params or {}).items() if k in FIXED_PARAMS}}
+    samples = sample_assumptions(n_simulations, distributions, seed)
+    paths = buy_vs_rent_arrays(property_price, monthly_rent, **fixed, **samples)
+
+    buy_wins = paths['wealth_buying'] > paths['wealth_renting']
+    probability_buy = float(buy_wins.mean())
+
+    if probability_buy >= 0.5:
+        recommendation = "Buy"
+        confidence = probability_buy
+    else:
+        recommendation = "Rent"
+        confidence = 1 - probability_buy
+
+    return {
+        'simulations': n_simulations,
+        'probability_buy_wins': round(probability_buy, 4),
+        'recommendation': recommendation,
+        'confidence': round(confidence, 4),
+        'wealth_buying': _summarize(paths['wealth_buying']),
+        'wealth_renting': _summarize(paths['wealth_renting']),
+        'wealth_difference': _summarize(paths['wealth_difference']),
+        'total_rent_paid': _summarize(paths['total_rent_paid']),
+        'assumptions': resolve_distributions(distributions),
+        'fixed_params': fixed,
+    }
+
+
+def _run_chunk(args) -> List[Dict[str, Any]]:
+    """Worker: simulate a chunk of (price, rent, seed) properties"""
+    properties, n_simulations, distributions, params = args
+    return [
+        run_monte_carlo(price, rent, n_simulations, distributions, params, seed)
+        for price, rent, seed in properties
+    ]
+
+
+def run_monte_carlo_batch(properties: List[Dict[str, float]], n_simulations: int = DEFAULT_SIMULATIONS,
+                          distributions: Optional[Dict[str, Dict]] = None, params: Optional[Dict] = None,
+                          seed: int = 0, workers: Optional[int] = None,
+                          chunk_size: int = 50) -> List[Dict[str, Any]]:
+    """
+    Simulate many properties, optionally sharded across a process pool
+
+    Each property gets its own child seed, so results do not depend on the
+    number of workers or the chunk size.
+
+    Args:
+        properties: Dicts with 'price' and 'monthly_rent' (or 'estimated_rent')
+        n_simulations: Paths per property
+        distributions: Optional per-assumption distribution overrides
+        params: Optional fixed inputs
+        seed: Base seed for the batch
+        workers: Process count; None or 1 runs in-process, 0 uses os.cpu_count()
+        chunk_size: Properties per worker task
+
+    Returns:
+        One run_monte_carlo result per property, in input order
+    """
+    seeds = np.random.SeedSequence(seed).spawn(len(properties))
+    jobs = []
+    for prop, child in zip(properties, seeds):
+        rent = prop.get('monthly_rent', prop.get('estimated_rent'))
+        if rent is None:
+            raise ValueError("Each property needs 'monthly_rent' or 'estimated_rent'")
+        jobs.append((float(prop['price']), float(rent), child))
+
+    chunks = [
+        (jobs[i:i + chunk_size], n_simulations, distributions, params)
+        for i in range(0, len(jobs), chunk_size)
+    ]
+
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    if not workers or workers == 1 or len(chunks) <= 1:
+        return [result for chunk in chunks for result in _run_chunk(chunk)]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return [result for chunk_results in pool.map(_run_chunk, chunks) for result in chunk_results]
@@ -0,0 +1,106 @@
+"""
+Vectorized Buy vs Rent Projections
+Array form of RealEstateAnalyzer.buy_vs_rent_analysis for evaluating many
+parameter sets (simulation paths, sensitivity grids, whole datasets) at once
+"""
+
+import numpy as np
+from typing import Dict
+
+from src.Parameters.kernels import annuity_factors, sip_factors, growth_factors, escalating_sum_factors
+
+# Projection horizon used by buy_vs_rent_analysis
+HORIZON_YEARS = 20
+
+
+def emi_for_tenure(principal, rate_percent, tenure_years) -> np.ndarray:
+    """
+    Monthly EMI for arrays of loans with tenure in years (broadcasts like NumPy arithmetic)
+
+    Matches RealEstateAnalyzer.calculate_emi: zero when principal, rate or
+    tenure is not positive. Not rounded, so callers control precision. (For
+    tenure in months with 1/n at zero rate, see src.Parameters.loan.emi_array.)
+    """
+    principal = np.asarray(principal, dtype=float)
+    rate_percent = np.asarray(rate_percent, dtype=float)
+    tenure_years = np.asarray(tenure_years, dtype=float)
+
+    valid = (principal > 0) & (rate_percent > 0) & (tenure_years > 0)
+    return np.where(valid, principal * annuity_factors(rate_percent, tenure_years * 12), 0.0)
+
+
+def loan_balance_array(principal, rate_percent, emi, months_paid, tenure_years) -> np.ndarray:
+    """
+    Outstanding loan after months_paid EMIs (broadcasts like NumPy arithmetic)
+
+    Zero once the tenure is paid off; the full principal when there is no
+    EMI (invalid rate or tenure), as the loan is never amortized.
+    """
+    principal = np.asarray(principal, dtype=float)
+    rate_percent = np.asarray(rate_percent, dtype=float)
+    months_paid = np.asarray(months_paid, dtype=float)
+
+    monthly = np.where(rate_percent > 0, rate_percent, 1.0) / (12 * 100)
+    growth = (1 + monthly) ** months_paid
+    balance = np.clip(principal * growth - emi * (growth - 1) / monthly, 0, None)
+    repaid = months_paid >= np.asarray(tenure_years, dtype=float) * 12
+    return np.where(emi > 0, np.where(repaid, 0.0, balance), np.where(principal > 0, principal, 0.0))
+
+
+def buy_vs_rent_arrays(property_price, monthly_rent, down_payment_percent=20, loan_rate=8.5,
+                       loan_tenure_years=20, appreciation_rate=5, rent_escalation=5,
+                       investment_return_rate=10, years: int = HORIZON_YEARS) -> Dict[str, np.ndarray]:
+    """
+    Buy vs rent terminal wealth for broadcastable arrays of inputs
+
+    Same methodology as RealEstateAnalyzer.buy_vs_rent_analysis (see there for
+    the assumptions): buying wealth is appreciated value minus down payment,
+    EMIs paid within the horizon and the loan still outstanding at its end
+    (tenures longer than the horizon); renting wealth is the invested down payment plus a SIP of (EMI - rent)
+    when the EMI exceeds the rent. Rates are annual percentages.
+
+    Returns:
+        Dictionary of arrays: emi, down_payment, outstanding_loan, total_buying_cost, future_value,
+        wealth_buying, total_rent_paid, investment_corpus, savings_investment,
+        wealth_renting, wealth_difference
+    """
+    property_price = np.asarray(property_price, dtype=float)
+    monthly_rent = np.asarray(monthly_rent, dtype=float)
+    rent_escalation = np.asarray(rent_escalation, dtype=float)
+    investment_return_rate = np.asarray(investment_return_rate, dtype=float)
+
+    # Buying
+    down_payment = property_price * (np.asarray(down_payment_percent, dtype=float) / 100)
+    loan_amount = property_price - down_payment
+    emi = np.round(emi_for_tenure(loan_amount, loan_rate, loan_tenure_years), 2)
+    paid_months = np.minimum(np.asarray(loan_tenure_years, dtype=float), years) * 12
+    outstanding = loan_balance_array(loan_amount, loan_rate, emi, paid_months, loan_tenure_years)
+    total_buying_cost = down_payment + emi * paid_months + outstanding
+    future_value = property_price * growth_factors(appreciation_rate, years)
+    wealth_buying = future_value - total_buying_cost
+
+    # Renting: rent paid is a geometric series of escalating annual rent
+    total_rent_paid = monthly_rent * 12 * escalating_sum_factors(rent_escalation, years)
+
+    investment_corpus = down_payment * growth_factors(investment_return_rate, years)
+
+    savings_investment = np.where(
+        (emi > monthly_rent) & (investment_return_rate > 0),
+        (emi - monthly_rent) * sip_factors(investment_return_rate, years * 12),
+        0.0
+    )
+    wealth_renting = investment_corpus + savings_investment
+
+    return {
+        'emi': emi,
+        'down_payment': down_payment,
+        'outstanding_loan': outstanding,
+        'total_buying_cost': total_buying_cost,
+        'future_value': future_value,
+        'wealth_buying': wealth_buying,
+        'total_rent_paid': total_rent_paid,
+        'investment_corpus': investment_corpus,
+        'savings_investment': savings_investment,
+        'wealth_renting': wealth_renting,
+        'wealth_difference': wealth_buying - wealth_renting,
+    }
@@ -0,0 +1,209 @@
+"""
+Sensitivity Analysis Service
+Sweeps one or two buy vs rent assumptions over a grid, finds break-even
+values and builds tornado-chart ranges, each in a single broadcast projection
+"""
+
+import numpy as np
+from typing import Dict, List, Any, Optional, Sequence
+
+from services.projections import buy_vs_rent_arrays
+
+# Base assumptions, same as RealEstateAnalyzer.default_params
+BASE_PARAMS = {
+    'down_payment_percent': 20,
+    'loan_rate': 8.5,
+    'loan_tenure_years': 20,
+    'appreciation_rate': 5,
+    'rent_escalation': 5,
+    'investment_return_rate': 10,
+}
+
+# Sweepable assumptions with their default sweep / tornado range
+SENSITIVITY_PARAMS = {
+    'loan_rate': {'label': 'Loan Rate', 'unit': '%', 'low': 6.5, 'high': 11.0},
+    'appreciation_rate': {'label': 'Appreciation', 'unit': '%', 'low': 2.0, 'high': 9.0},
+    'down_payment_percent': {'label': 'Down Payment', 'unit': '%', 'low': 10.0, 'high': 40.0},
+    'loan_tenure_years': {'label': 'Loan Tenure', 'unit': ' yrs', 'low': 10, 'high': 30},
+    'investment_return_rate': {'label': 'Investment Return', 'unit': '%', 'low': 7.0, 'high': 13.0},
+}
+
+DEFAULT_STEPS = 25
+MAX_STEPS = 200  # Per-axis cap for the web API
+
+
+def _check_param(name: str) -> None:
+    if name not in SENSITIVITY_PARAMS:
+        raise ValueError(f"Unknown sensitivity parameter: {name}. "
+                         f"Choose from {', '.join(SENSITIVITY_PARAMS)}")
+
+
+def grid_values(param: str, values: Optional[Sequence[float]] = None, steps: int = DEFAULT_STEPS,
+                low: float = None, high: float = None) -> np.ndarray:
+    """Sweep values for a parameter: explicit values, or `steps` points over its range"""
+    _check_param(param)
+    if values is not None:
+        result = np.asarray(values, dtype=float)
+    else:
+        spec = SENSITIVITY_PARAMS[param]
+        steps = max(2, min(int(steps), MAX_STEPS))
+        result = np.linspace(spec['low'] if low is None else low,
+                             spec['high'] if high is None else high, steps)
+    if param == 'loan_tenure_years':
+        # Tenures are whole years
+        result = np.unique(np.round(result))
+    if result.ndim != 1 or result.size < 2:
+        raise ValueError(f"{param} needs at least 2 distinct sweep values")
+    return result
+
+
+def _break_even(values: np.ndarray, difference: np.ndarray) -> np.ndarray:
+    """
+    First value along the last axis where the buy - rent difference crosses zero
+
+    Linearly interpolated between grid points; NaN where no crossing exists.
+    """
+    d0, d1 = difference[..., :-1], difference[..., 1:]
+    crosses = ((d0 <= 0) & (d1 > 0)) | ((d0 >= 0) & (d1 < 0))
+    has_crossing = crosses.any(axis=-1)
+    idx = np.argmax(crosses, axis=-1)
+
+    left = np.take_along_axis(d0, idx[..., None], axis=-1)[..., 0]
+    right = np.take_along_axis(d1, idx[..., None], axis=-1)[..., 0]
+    denom = np.where(left == right, 1.0, left - right)
+    fraction = np.where(left == right, 0.0, left / denom)
+    crossing = values[idx] + fraction * (values[idx + 1] - values[idx])
+    return np.where(has_crossing, crossing, np.nan)
+
+
+def _to_list(array: np.ndarray, digits: int = 2) -> List:
+    """Rounded nested list with NaN as None (JSON friendly)"""
+    rounded = np.round(array, digits).astype(object)
+    rounded[np.isnan(array)] = None
+    return rounded.tolist()
+
+
+def sensitivity_grid(property_price: float, monthly_rent: float, x_param: str,
+                     y_param: str = None, x_values: Sequence[float] = None,
+                     y_values: Sequence[float] = None, steps: int = DEFAULT_STEPS,
+                     base_params: Optional[Dict] = None) -> Dict[str, Any]:
+    """
+    Evaluate buy vs rent over a one- or two-parameter grid
+
+    Args:
+        property_price: Property purchase price
+        monthly_rent: Monthly rent amount
+        x_param: Parameter swept along the columns
+        y_param: Optional parameter swept along the rows
+        x_values / y_values: Explicit sweep values (default: `steps` points over the range)
+        steps: Points per axis when values are not given
+        base_params: Overrides for the non-swept assumptions
+
+    Returns:
+        Dictionary with axis values, wealth matrices (rows = y, columns = x),
+        a buy-wins mask and break-even values
+    """
+    params = {**BASE_PARAMS, **{k: v for k, v in (base_params or {}).items() if k in BASE_PARAMS}}
+    xs = grid_values(x_param, x_values, steps)
+
+    if y_param is not None:
+        if y_param == x_param:
+            raise ValueError("x_param and y_param must differ")
+        ys = grid_values(y_param, y_values, steps)
+        params[x_param] = xs[None, :]
+        params[y_param] = ys[:, None]
+    else:
+        ys = None
+        params[x_param] = xs
+
+    result = buy_vs_rent_arrays(property_price, monthly_rent, **params)
+    shape = (len(ys), len(xs)) if ys is not None else (len(xs),)
+    wealth_buying = np.broadcast_to(result['wealth_buying'], shape)
+    wealth_renting = np.broadcast_to(result['wealth_renting'], shape)
+    difference = wealth_buying - wealth_renting
+
+    grid = {
+        'x_param': x_param,
+        'x_values': _to_list(xs, 4),
+        'y_param': y_param,
+        'y_values': _to_list(ys, 4) if ys is not None else None,
+        'wealth_buying': _to_list(wealth_buying),
+        'wealth_renting': _to_list(wealth_renting),
+        'wealth_difference': _to_list(difference),
+        'buy_wins': (difference > 0).tolist(),
+        'base_params': {k: v for k, v in params.items() if k not in (x_param, y_param)},
+    }
+
+    if ys is None:
+        # Break-even x values along the single sweep
+        crossings = _break_even(xs, difference[None, :])
+        grid['break_even'] = _to_list(crossings, 4)[0]
+    else:
+        # Break-even surface: for each y row, the x where buying starts/stops winning
+        grid['break_even'] = {
+            'along': x_param,
+            'values': _to_list(_break_even(xs, difference), 4),
+        }
+    return grid
+
+
+def tornado_analysis(property_price: float, monthly_rent: float, params: Sequence[str] = None,
+                     ranges: Optional[Dict[str, tuple]] = None,
+                     base_params: Optional[Dict] = None) -> Dict[str, Any]:
+    """
+    Tornado-chart ranges: wealth difference at each parameter's low and high,
+    others held at base, sorted by swing (largest first)
+
+    Args:
+        property_price: Property purchase price
+        monthly_rent: Monthly rent amount
+        params: Parameters to include (default: all sweepable parameters)
+        ranges: Optional {param: (low, high)} overrides
+        base_params: Overrides for the base assumptions
+
+    Returns:
+        Dictionary with the base wealth difference and one bar per parameter
+    """
+    params = list(params or SENSITIVITY_PARAMS)
+    for name in params:
+        _check_param(name)
+    base = {**BASE_PARAMS, **{k: v for k, v in (base_params or {}).items() if k in BASE_PARAMS}}
+    ranges = ranges or {}
+
+    # Column 0 is the base case, then (low, high) pairs per parameter
+    n_cases = 1 + 2 * len(params)
+    inputs = {name: np.full(n_cases, float(value)) for name, value in base.items()}
+    bounds = []
+    for i, name in enumerate(params):
+        spec = SENSITIVITY_PARAMS[name]
+        low, high = ranges.get(name, (spec['low'], spec['high']))
+        inputs[name][1 + 2 * i] = low
+        inputs[name][2 + 2 * i] = high
+        bounds.append((low, high))
+
+    difference = buy_vs_rent_arrays(property_price, monthly_rent, **inputs)['wealth_difference']
+    base_difference = float(difference[0])
+
+    bars = []
+    for i, name in enumerate(params):
+        low_diff, high_diff = float(difference[1 + 2 * i]), float(difference[2 + 2 * i])
+        bars.append({
+            'param': name,
+            'label': SENSITIVITY_PARAMS[name]['label'],
+            'unit': SENSITIVITY_PARAMS[name]['unit'],
+            'base_value': base[name],
+            'low_value': bounds[i][0],
+            'high_value': bounds[i][1],
+            'low_difference': round(low_diff, 2),
+            'high_difference': round(high_diff, 2),
+            'swing': round(abs(high_diff - low_diff), 2),
+            'flips_decision': (low_diff > 0) != (high_diff > 0),
+        })
+    bars.sort(key=lambda bar: bar['swing'], reverse=True)
+
+    return {
+        'base_difference': round(base_difference, 2),
+        'base_recommendation': "Buy" if base_difference > 0 else "Rent",
+        'base_params': base,
+        'bars': bars,
+    }
@@ -0,0 +1,86 @@
+"""
+Tax-Adjusted Wealth Service
+Adds Section 24 / 80C home loan tax savings to buying wealth for every
+listing in one vectorized pass, cached per (tax bracket, loan params)
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.Parameters.buy_vs_rent import compare_arrays
+from src.Parameters.tax import loan_tax_columns
+
+# Loan assumptions used to build the analyzed dataset (src/Parameters/analyzer.py)
+DATASET_LOAN_PARAMS = {
+    'down_payment_percent': 20,
+    'loan_rate': 8.5,
+    'loan_tenure_years': 20,
+}
+HORIZON_YEARS = 20
+TAX_BRACKETS = [0, 5, 20, 30]  # Income tax slabs (%) offered in the UI
+
+CACHE_SIZE = 16
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _dataset_key(df: pd.DataFrame) -> str:
+    """Fingerprint of the columns tax adjustment depends on"""
+    digest = hashlib.sha1()
+    for column in ('price', 'wealth_buying', 'wealth_renting'):
+        digest.update(np.ascontiguousarray(df[column].to_numpy(dtype=float)).tobytes())
+    return digest.hexdigest()
+
+
+def tax_adjusted_columns(df: pd.DataFrame, tax_bracket: float, params: Optional[Dict] = None) -> pd.DataFrame:
+    """
+    Tax-adjusted buying wealth for every listing
+
+    Args:
+        df: Analyzed properties (price, wealth_buying, wealth_renting)
+        tax_bracket: Buyer's income tax slab in percent (0 = no deductions claimed)
+        params: Overrides for DATASET_LOAN_PARAMS
+
+    Returns:
+        DataFrame aligned with df: monthly_emi, total_interest, tax_saving,
+        wealth_buying_after_tax, buy_advantage_after_tax, decision_after_tax.
+        Cached per (dataset, bracket, params); treat as read-only.
+    """
+    loan = {**DATASET_LOAN_PARAMS, **{k: v for k, v in (params or {}).items() if k in DATASET_LOAN_PARAMS}}
+    key = (_dataset_key(df), float(tax_bracket), json.dumps(loan, sort_keys=True))
+
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    columns = loan_tax_columns(
+        df['price'],
+        down_payment_percent=loan['down_payment_percent'],
+        loan_rate=loan['loan_rate'],
+        tenure_years=loan['loan_tenure_years'],
+        tax_rate=tax_bracket,
+        horizon_years=HORIZON_YEARS
+    )
+    columns.index = df.index
+
+    renting = df['wealth_renting']
+    columns['wealth_buying_after_tax'] = df['wealth_buying'] + columns['tax_saving']
+    advantage = (columns['wealth_buying_after_tax'] - renting) / renting.where(renting > 0) * 100
+    columns['buy_advantage_after_tax'] = advantage.where(renting > 0, 0.0)
+    columns['decision_after_tax'] = compare_arrays(
+        {'wealth_buying': columns['wealth_buying_after_tax'].to_numpy()}, {'wealth_renting': renting.to_numpy()}
+    )
+
+    with _cache_lock:
+        _cache[key] = columns
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return columns
@@ -0,0 +1,156 @@
+"""
+Wealth Trajectory Engine
+Month-by-month buy and rent wealth curves for many properties at once, the
+exact month buying overtakes renting, and a per-parameter trajectory cache
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+import numpy as np
+
+from services.projections import emi_for_tenure, loan_balance_array, HORIZON_YEARS
+from src.Parameters.kernels import growth_factors, sip_factors
+
+# Same defaults as RealEstateAnalyzer.default_params
+DEFAULT_TRAJECTORY_PARAMS = {
+    'down_payment_percent': 20,
+    'loan_rate': 8.5,
+    'loan_tenure_years': 20,
+    'appreciation_rate': 5,
+    'investment_return_rate': 10,
+}
+
+CACHE_SIZE = 64  # Cached trajectory sets (one per parameter hash + property set)
+
+
+def wealth_trajectories(property_price, monthly_rent, down_payment_percent=20, loan_rate=8.5,
+                        loan_tenure_years=20, appreciation_rate=5, investment_return_rate=10,
+                        years: int = HORIZON_YEARS) -> Dict[str, np.ndarray]:
+    """
+    Monthly buy and rent wealth for arrays of properties
+
+    Prices/rents are 1-D arrays (or scalars); parameters are scalars or arrays
+    of the same length. Curves have shape (n_properties, years * 12 + 1),
+    column m being the end of month m.
+
+    BUYING: property value minus outstanding loan balance minus cash paid
+    (down payment + EMIs so far). At the horizon this is the terminal
+    wealth of RealEstateAnalyzer.buy_vs_rent_analysis (before tax savings),
+    including tenures longer than the horizon.
+
+    RENTING: invested down payment plus a monthly SIP of (EMI - rent) when
+    the EMI exceeds the rent, as in buy_vs_rent_analysis.
+
+    Returns:
+        Dictionary with 'months', 'emi', 'wealth_buying', 'wealth_renting'
+        and 'wealth_difference' arrays
+    """
+    price = np.atleast_1d(np.asarray(property_price, dtype=float))[:, None]
+    rent = np.atleast_1d(np.asarray(monthly_rent, dtype=float))[:, None]
+
+    def column(value):
+        return np.atleast_1d(np.asarray(value, dtype=float))[:, None]
+
+    down_pct, loan_rate = column(down_payment_percent), column(loan_rate)
+    tenure, appreciation = column(loan_tenure_years), column(appreciation_rate)
+    invest_rate = column(investment_return_rate)
+
+    months = np.arange(years * 12 + 1)[None, :]
+
+    # Buying: value, amortized balance and cash paid at each month
+    down_payment = price * down_pct / 100
+    loan_amount = price - down_payment
+    emi = np.round(emi_for_tenure(loan_amount, loan_rate, tenure), 2)
+    paid_months = np.minimum(months, tenure * 12)
+    balance = loan_balance_array(loan_amount, loan_rate, emi, paid_months, tenure)
+
+    property_value = price * growth_factors(appreciation, months / 12)
+    wealth_buying = property_value - balance - (down_payment + emi * paid_months)
+
+    # Renting: lump sum compounding annually, SIP of the EMI surplus monthly
+    corpus = down_payment * growth_factors(invest_rate, months / 12)
+    savings = np.where((emi > rent) & (invest_rate > 0), emi - rent, 0.0)
+    wealth_renting = corpus + savings * sip_factors(invest_rate, months)
+
+    return {
+        'months': months[0],
+        'emi': emi[:, 0],
+        'wealth_buying': wealth_buying,
+        'wealth_renting': wealth_renting,
+        'wealth_difference': wealth_buying - wealth_renting,
+    }
+
+
+def crossover_months(wealth_difference: np.ndarray) -> np.ndarray:
+    """
+    First month where buying wealth exceeds renting wealth, per property
+
+    Returns:
+        Float array of months (NaN where buying never overtakes within the horizon)
+    """
+    ahead = np.atleast_2d(wealth_difference) > 0
+    first = np.argmax(ahead, axis=1).astype(float)
+    return np.where(ahead.any(axis=1), first, np.nan)
+
+
+# ============================================================================
+# TRAJECTORY CACHE
+# ============================================================================
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def trajectory_key(property_price, monthly_rent, params: Dict[str, Any], years: int) -> str:
+    """Hash of the parameter set and the property inputs"""
+    digest = hashlib.sha1(json.dumps(params, sort_keys=True, default=float).encode())
+    digest.update(str(years).encode())
+    digest.update(np.ascontiguousarray(property_price, dtype=float).tobytes())
+    digest.update(np.ascontiguousarray(monthly_rent, dtype=float).tobytes())
+    return digest.hexdigest()
+
+
+def get_trajectories(property_price, monthly_rent, params: Optional[Dict[str, Any]] = None,
+                     years: int = HORIZON_YEARS) -> Dict[str, Any]:
+    """
+    Cached wealth_trajectories plus crossover months
+
+    Args:
+        property_price: Array (or scalar) of prices
+        monthly_rent: Array (or scalar) of monthly rents
+        params: Overrides for DEFAULT_TRAJECTORY_PARAMS (scalars)
+        years: Horizon in years
+
+    Returns:
+        wealth_trajectories result with 'crossover_month', 'key' and 'params' added.
+        Cached arrays are read-only; copy before modifying.
+    """
+    params = {**DEFAULT_TRAJECTORY_PARAMS,
+              **{k: v for k, v in (params or {}).items() if k in DEFAULT_TRAJECTORY_PARAMS}}
+    key = trajectory_key(property_price, monthly_rent, params, years)
+
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    result = wealth_trajectories(property_price, monthly_rent, years=years, **params)
+    result['crossover_month'] = crossover_months(result['wealth_difference'])
+    for value in result.values():
+        value.flags.writeable = False
+    result.update(key=key, params=params)
+
+    with _cache_lock:
+        _cache[key] = result
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
+
+
+def clear_trajectory_cache() -> None:
+    """Drop all cached trajectories"""
+    with _cache_lock:
+        _cache.clear()
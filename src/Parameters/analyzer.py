@@ -1,58 +1,302 @@
 # src/analyzer.py
 
+import hashlib
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 import pandas as pd
-from src.Parameters.buy_vs_rent import buying_case, renting_case, compare_results
+from src.Parameters.buy_vs_rent import buying_arrays, renting_arrays, compare_arrays
+from src.Parameters.tax import loan_tax_columns
+
+INPUT_PATH = "data/outputs/magicbricks_india_final.csv"
+OUTPUT_PATH = "data/outputs/analyzed_properties.csv"
+STORE_PATH = "data/outputs/analysis_store.parquet"
+CHANGELOG_PATH = "data/outputs/analysis_changelog.jsonl"
+CHUNK_SIZE = 50000  # Rows per chunk; bounds memory per worker
+
+ANALYSIS_PARAMS = {
+    "version": 1,  # Bump when the formulas change so stored results are recomputed
+    "down_payment_percent": 20,
+    "loan_rate": 8.5,
+    "capital_gains_tax": 20,
+    "appreciation_rate": 5,
+    "rent_escalation": 5,
+    "invest_rate": 10,
+    "monthly_saving": 15000,
+}
+# Listing columns that identify an input row (price_per_sqft is carried into the output)
+FINGERPRINT_COLUMNS = ["location", "city", "price", "area_sqft", "bhk", "price_per_sqft"]
 
 
 def estimate_rent(area_sqft):
     return area_sqft * 20  # simple heuristic
 
 
-def run_analysis():
-
-    df = pd.read_csv("data/outputs/magicbricks_india_final.csv")
-    results = []
-
-    for _, row in df.iterrows():
-        try:
-            price = float(row["price_total_inr"])
-            area = float(row["area_sqft"])
-        except:
-            continue
-
-        down_payment = 0.20 * price
-
-        buy = buying_case(
-            property_price=price,
-            down_payment=down_payment,
-            loan_rate=8.5,
-            tax_rate=20,
-            appreciation_rate=5
-        )
-
-        rent = renting_case(
-            initial_rent=estimate_rent(area),
-            escalation=5,
-            down_payment=down_payment,
-            invest_rate=10,
-            monthly_saving=15000
-        )
-
-        decision = compare_results(buy, rent)
-
-        results.append({
-            "location": row["location"],
-            "city": row["city"],
-            "price": price,
-            "area_sqft": area,
-            "bhk": row["BHK"],
-            "price_per_sqft": row["price_per_sqft"],
-            "wealth_buying": buy["wealth_buying"],
-            "wealth_renting": rent["wealth_renting"],
-            "decision": decision
-        })
-
-    out = pd.DataFrame(results)
-    out.to_csv("data/outputs/analyzed_properties.csv", index=False)
-
-    print("Saved → data/outputs/analyzed_properties.csv")
+def _to_float(column):
+    # Unparseable values (e.g. "Price on Request") are skipped; blanks stay NaN
+    values = pd.to_numeric(column, errors="coerce")
+    return values, values.notna() | column.isna()
+
+
+def parse_listings(df):
+    # Raw scrape rows -> listing columns of the output (unparseable rows dropped)
+    price, price_ok = _to_float(df["price_total_inr"])
+    area, area_ok = _to_float(df["area_sqft"])
+    keep = (price_ok & area_ok).to_numpy()
+    df = df[keep]
+
+    return pd.DataFrame({
+        "location": df["location"].to_numpy(),
+        "city": df["city"].to_numpy(),
+        "price": price[keep].to_numpy(dtype=float),
+        "area_sqft": area[keep].to_numpy(dtype=float),
+        "bhk": df["BHK"].to_numpy(),
+        "price_per_sqft": df["price_per_sqft"].to_numpy(),
+    })
+
+
+def analyze_listings(listings, params=ANALYSIS_PARAMS):
+    # Buy vs rent for parsed listings; same assumptions as the original per-row loop
+    price = listings["price"].to_numpy(dtype=float)
+    down_payment = params["down_payment_percent"] / 100 * price
+
+    buy = buying_arrays(
+        property_price=price,
+        down_payment=down_payment,
+        loan_rate=params["loan_rate"],
+        tax_rate=params["capital_gains_tax"],
+        appreciation_rate=params["appreciation_rate"]
+    )
+
+    rent = renting_arrays(
+        initial_rent=estimate_rent(listings["area_sqft"].to_numpy(dtype=float)),
+        escalation=params["rent_escalation"],
+        down_payment=down_payment,
+        invest_rate=params["invest_rate"],
+        monthly_saving=params["monthly_saving"]
+    )
+
+    out = listings.assign(
+        wealth_buying=buy["wealth_buying"],
+        wealth_renting=rent["wealth_renting"],
+        decision=compare_arrays(buy, rent)
+    )
+    tax = loan_tax_columns(price, loan_rate=params["loan_rate"])
+    tax.index = out.index
+    return pd.concat([out, tax], axis=1)
+
+
+def analyze_chunk(df):
+    return analyze_listings(parse_listings(df))
+
+
+def params_hash(params=ANALYSIS_PARAMS):
+    return hashlib.sha1(json.dumps(params, sort_keys=True).encode()).hexdigest()
+
+
+def listing_fingerprints(listings, params=ANALYSIS_PARAMS):
+    # One uint64 per row over the listing columns, salted with the params hash,
+    # so changing an assumption invalidates every stored result
+    return pd.util.hash_pandas_object(
+        listings[FINGERPRINT_COLUMNS], index=False, hash_key=params_hash(params)[:16]
+    ).to_numpy()
+
+
+class _ChunkWriter:
+    # Appends chunks to a CSV, or to a Parquet file one row group per chunk
+
+    def __init__(self, path):
+        self.path = path
+        self.parquet = path.endswith(".parquet")
+        self.writer = None
+        self.rows = 0
+
+    def write(self, chunk):
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if self.writer is None:
+                self.writer = pq.ParquetWriter(self.path, table.schema)
+            self.writer.write_table(table.cast(self.writer.schema))
+        else:
+            chunk.to_csv(self.path, mode="w" if self.rows == 0 else "a", header=self.rows == 0, index=False)
+        self.rows += len(chunk)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def _report(done_rows, written_rows, started):
+    elapsed = time.perf_counter() - started
+    rate = done_rows / elapsed if elapsed > 0 else 0.0
+    print(f"  {done_rows:,} rows read, {written_rows:,} written | {elapsed:.1f}s | {rate:,.0f} rows/s")
+
+
+def _ordered_map(func, items, workers):
+    # Yields (item, func(item)) in input order; with workers > 1 items run on a
+    # process pool with at most two per worker in flight, so memory stays bounded
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    if not workers or workers == 1:
+        for item in items:
+            yield item, func(item)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for item in items:
+            pending.append((item, pool.submit(func, item)))
+            if len(pending) >= 2 * workers:
+                item, future = pending.popleft()
+                yield item, future.result()
+        while pending:
+            item, future = pending.popleft()
+            yield item, future.result()
+
+
+def run_analysis(input_path=INPUT_PATH, output_path=OUTPUT_PATH, chunk_size=CHUNK_SIZE, workers=None):
+    """
+    Analyze every listing in input_path and write the results to output_path.
+
+    The input is streamed in chunks of chunk_size rows; each chunk is analyzed
+    with the vectorized engine and written as soon as it is ready (appended
+    to a CSV, or one row group per chunk when output_path ends in .parquet),
+    so memory stays bounded regardless of input size.
+
+    workers: process count; None or 1 runs in-process, 0 uses os.cpu_count().
+    At most two chunks per worker are in flight; output keeps input order.
+    """
+    started = time.perf_counter()
+    writer = _ChunkWriter(output_path)
+    done_rows = 0
+
+    try:
+        for chunk, result in _ordered_map(analyze_chunk, pd.read_csv(input_path, chunksize=chunk_size), workers):
+            writer.write(result)
+            done_rows += len(chunk)
+            _report(done_rows, writer.rows, started)
+    finally:
+        writer.close()
+
+    print(f"Saved → {output_path}")
+
+
+def _load_store(store_path):
+    # Stored results indexed by fingerprint (duplicate listings share one row)
+    if not os.path.exists(store_path):
+        return None
+    store = pd.read_parquet(store_path)
+    return store.drop_duplicates("fingerprint").set_index("fingerprint")
+
+
+def _changelog_record(listing):
+    return {key: (None if pd.isna(value) else value) for key, value in listing.items()}
+
+
+def run_incremental_analysis(input_path=INPUT_PATH, output_path=OUTPUT_PATH, store_path=STORE_PATH,
+                             changelog_path=CHANGELOG_PATH, chunk_size=CHUNK_SIZE, workers=None):
+    """
+    Like run_analysis, but only new or changed listings are analyzed.
+
+    Each parsed row is fingerprinted (listing columns + params hash). Results
+    are kept in a Parquet store keyed by fingerprint; rows whose fingerprint
+    is already stored reuse the stored result, listings no longer in the
+    input are dropped from the store.
+
+    The changelog (JSON lines) lists what changed since the previous run:
+        {"op": "add", "fingerprint": ..., "listing": {...analyzed row...}}
+        {"op": "remove", "fingerprint": ..., "location": ..., "city": ...}
+    A listing whose price or details changed appears as remove + add.
+
+    Returns a summary dict: rows, analyzed, reused, added, removed.
+    """
+    started = time.perf_counter()
+    store = _load_store(store_path)
+    stored = store.index.to_numpy() if store is not None else np.array([], dtype=np.uint64)
+
+    contexts = deque()
+    seen = []
+
+    def fresh_listings():
+        # Parsing and store lookups happen here; only unseen rows go to the pool
+        for chunk in pd.read_csv(input_path, chunksize=chunk_size):
+            listings = parse_listings(chunk)
+            fingerprints = listing_fingerprints(listings)
+            hit = np.isin(fingerprints, stored)
+            seen.append(fingerprints)
+            contexts.append((len(chunk), fingerprints, hit))
+            yield listings[~hit]
+
+    store_tmp, changelog_tmp = ("{0}.tmp{1}".format(*os.path.splitext(path)) for path in (store_path, changelog_path))
+    writer, store_writer = _ChunkWriter(output_path), _ChunkWriter(store_tmp)
+    added = set()
+    done_rows = analyzed = 0
+
+    try:
+        with open(changelog_tmp, "w", encoding="utf-8") as changelog:
+            for fresh, result in _ordered_map(analyze_listings, fresh_listings(), workers):
+                size, fingerprints, hit = contexts.popleft()
+                result.index = np.flatnonzero(~hit)
+                cached = store.loc[fingerprints[hit]].set_axis(np.flatnonzero(hit)) if hit.any() else None
+                parts = [part for part in (cached, result) if part is not None and len(part)]
+                done_rows += size
+                analyzed += len(result)
+                if not parts:
+                    continue
+
+                out = pd.concat(parts).sort_index()[result.columns]
+                writer.write(out)
+                store_writer.write(out.assign(fingerprint=fingerprints))
+
+                for fingerprint, listing in zip(fingerprints[~hit], result.to_dict("records")):
+                    if fingerprint not in added:
+                        added.add(fingerprint)
+                        changelog.write(json.dumps({
+                            "op": "add", "fingerprint": format(fingerprint, "016x"),
+                            "listing": _changelog_record(listing)
+                        }) + "\n")
+                _report(done_rows, writer.rows, started)
+
+            current = np.concatenate(seen) if seen else np.array([], dtype=np.uint64)
+            removed = store[~np.isin(stored, current)] if store is not None else pd.DataFrame()
+            for fingerprint, listing in removed.iterrows():
+                changelog.write(json.dumps({
+                    "op": "remove", "fingerprint": format(fingerprint, "016x"),
+                    "location": listing["location"], "city": listing["city"]
+                }) + "\n")
+    finally:
+        writer.close()
+        store_writer.close()
+
+    # Swap in the new store and changelog only after a complete run
+    if os.path.exists(store_tmp):
+        os.replace(store_tmp, store_path)
+    elif os.path.exists(store_path):
+        os.remove(store_path)
+    os.replace(changelog_tmp, changelog_path)
+
+    summary = {
+        "rows": writer.rows,
+        "analyzed": analyzed,
+        "reused": writer.rows - analyzed,
+        "added": len(added),
+        "removed": len(removed),
+    }
+    print(f"Saved → {output_path} ({summary['analyzed']:,} analyzed, {summary['reused']:,} reused, "
+          f"{summary['added']:,} added, {summary['removed']:,} removed)")
+    return summary
+
+
+def read_changelog(path=CHANGELOG_PATH):
+    # Change events from the last incremental run, for the vector index and caches
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
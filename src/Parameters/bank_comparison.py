@@ -1,43 +1,128 @@
 # src/Analyzer/bank_comparison.py
 
 import json
+import os
+import threading
 from pathlib import Path
+import numpy as np
 import pandas as pd
 
+from src.Parameters.kernels import annuity_factor, growth_factor
+from src.Parameters.loan import emi_array
 
-def load_bank_rates(path="src/scrapers/bank_rates.json"):
+BANK_RATES_PATH = "src/scrapers/bank_rates.json"
+VALID_RATE_RANGE = (4.0, 20.0)  # Scraped rates outside this are parse errors (e.g. 100.0)
+
+_rates = None
+_rates_version = None
+_rates_lock = threading.Lock()
+
+
+def load_bank_rates(path=BANK_RATES_PATH):
     with open(Path(path), "r") as f:
         return json.load(f)
 
 
+def get_bank_rates(path=BANK_RATES_PATH):
+    # Rate table loaded once and reused; reloaded only when the file changes
+    global _rates, _rates_version
+    stat = os.stat(path)
+    version = (path, stat.st_mtime_ns, stat.st_size)
+
+    with _rates_lock:
+        if _rates is None or _rates_version != version:
+            low, high = VALID_RATE_RANGE
+            _rates = {
+                bank: float(rate) for bank, rate in load_bank_rates(path).items()
+                if low <= float(rate) <= high
+            }
+            _rates_version = version
+        return dict(_rates)
+
+
 def calculate_emi(principal, annual_rate, tenure_years):
-    r = annual_rate / 100 / 12
-    n = tenure_years * 12
-    return (principal * r * (1 + r) ** n) / ((1 + r) ** n - 1)
+    return principal * annuity_factor(annual_rate, tenure_years * 12)
+
+
+def bank_offer_matrix(prices, down_payment_percent=20, tenure_years=20, appreciation_rate=5,
+                      horizon_years=20, rates=None):
+    # Every (listing x bank) pair in one broadcast: rows are listings, columns banks
+    rates = rates if rates is not None else get_bank_rates()
+    banks = list(rates)
+    bank_rates = np.array([rates[bank] for bank in banks], dtype=float)[None, :]
+
+    prices = np.asarray(prices, dtype=float)[:, None]
+    down_payment = prices * down_payment_percent / 100
+    loan_amount = prices - down_payment
 
+    emi = emi_array(loan_amount, bank_rates, tenure_years * 12)
+    total_payment = emi * tenure_years * 12
+    total_interest = total_payment - loan_amount
+    future_value = prices * growth_factor(appreciation_rate, horizon_years)
+    wealth_buying = future_value - down_payment - total_payment
 
-def run_bank_comparison(property_price, down_payment, tenure_years=20):
-    loan_amount = property_price - down_payment
-    bank_rates = load_bank_rates()
+    return {
+        "banks": banks,
+        "rates": bank_rates[0],
+        "loan_amount": loan_amount[:, 0],
+        "emi": emi,
+        "total_interest": total_interest,
+        "total_payment": total_payment,
+        "wealth_buying": wealth_buying,
+    }
 
-    results = []
 
-    for bank, rate in bank_rates.items():
-        emi = calculate_emi(loan_amount, rate, tenure_years)
-        total_paid = emi * tenure_years * 12
-        interest_paid = total_paid - loan_amount
+BEST_OFFER_COLUMNS = ["loan_amount", "best_bank", "best_rate", "best_emi", "best_total_cost",
+                      "best_total_interest", "best_wealth_buying", "savings_vs_costliest"]
 
-        results.append({
-            "bank": bank,
-            "interest_rate (%)": rate,
-            "loan_amount": round(loan_amount, 2),
-            "monthly_emi": round(emi, 2),
-            "total_interest": round(interest_paid, 2),
-            "total_payment": round(total_paid, 2)
-        })
 
-    df = pd.DataFrame(results)
-    df.to_csv("data/outputs/bank_loan_comparison.csv", index=False)
-    print("Saved → data/outputs/bank_loan_comparison.csv")
+def best_bank_offers(prices, down_payment_percent=20, tenure_years=20, appreciation_rate=5, rates=None):
+    # Per listing: the bank with the lowest total cost. Loan terms are the same
+    # for every bank, so it is also the one maximising buy-wealth.
+    # No usable rates (e.g. nothing in range on the scraped page): empty frame
+    matrix = bank_offer_matrix(prices, down_payment_percent, tenure_years, appreciation_rate, rates=rates)
+    if not matrix["banks"]:
+        return pd.DataFrame(columns=BEST_OFFER_COLUMNS)
+    banks = np.array(matrix["banks"], dtype=object)
+    rows = np.arange(len(matrix["loan_amount"]))
+
+    best = np.argmin(matrix["total_payment"], axis=1)
+    dearest = np.argmax(matrix["total_payment"], axis=1)
+
+    return pd.DataFrame({
+        "loan_amount": np.round(matrix["loan_amount"], 2),
+        "best_bank": banks[best],
+        "best_rate": matrix["rates"][best],
+        "best_emi": np.round(matrix["emi"][rows, best], 2),
+        "best_total_cost": np.round(matrix["total_payment"][rows, best], 2),
+        "best_total_interest": np.round(matrix["total_interest"][rows, best], 2),
+        "best_wealth_buying": np.round(matrix["wealth_buying"][rows, best], 2),
+        "savings_vs_costliest": np.round(
+            matrix["total_payment"][rows, dearest] - matrix["total_payment"][rows, best], 2
+        ),
+    })
+
+
+def run_bank_comparison(property_price, down_payment, tenure_years=20, save_csv=True):
+    matrix = bank_offer_matrix(
+        [property_price], down_payment / property_price * 100, tenure_years
+    )
+
+    df = pd.DataFrame({
+        "bank": matrix["banks"],
+        "interest_rate (%)": matrix["rates"],
+        "loan_amount": round(float(matrix["loan_amount"][0]), 2),
+        "monthly_emi": np.round(matrix["emi"][0], 2),
+        "total_interest": np.round(matrix["total_interest"][0], 2),
+        "total_payment": np.round(matrix["total_payment"][0], 2),
+    })
+
+    if save_csv:
+        save_bank_comparison(df)
 
     return df
+
+
+def save_bank_comparison(df, path="data/outputs/bank_loan_comparison.csv"):
+    df.to_csv(path, index=False)
+    print(f"Saved → {path}")
@@ -1,30 +1,43 @@
 # src/Parameters/buy_vs_rent.py
 
+import numpy as np
+
+from src.Parameters.kernels import annuity_factor, sip_factor, growth_factor, escalating_sum_factor
+from src.Parameters.loan import amortization_arrays
+from src.Parameters.tax import tax_benefits
+
+
 def buying_case(
     property_price,
     down_payment,
     loan_rate,
     tax_rate,
     appreciation_rate,
-    tenure_years=20
+    tenure_years=20,
+    tax_bracket=0
 ):
     loan_amount = property_price - down_payment
-    r = loan_rate / 100 / 12
     n = tenure_years * 12
 
-    emi = (loan_amount * r * (1 + r) ** n) / ((1 + r) ** n - 1)
+    emi = loan_amount * annuity_factor(loan_rate, n)
     total_paid = emi * n
     interest_paid = total_paid - loan_amount
 
-    future_value = property_price * ((1 + appreciation_rate / 100) ** tenure_years)
+    future_value = property_price * growth_factor(appreciation_rate, tenure_years)
     tax_on_gain = (future_value - property_price) * (tax_rate / 100)
 
-    wealth_buying = future_value - tax_on_gain - total_paid - down_payment
+    # Section 24 / 80C deductions at the buyer's income tax bracket
+    tax_saving = 0
+    if tax_bracket:
+        tax_saving = tax_benefits(amortization_arrays(loan_amount, loan_rate, tenure_years), tax_bracket)
+
+    wealth_buying = future_value - tax_on_gain - total_paid - down_payment + tax_saving
 
     return {
         "emi": round(emi, 2),
         "interest_paid": round(interest_paid, 2),
         "future_property_value": round(future_value, 2),
+        "tax_saving": round(tax_saving, 2),
         "wealth_buying": round(wealth_buying, 2)
     }
 
@@ -38,21 +51,12 @@ def renting_case(
     tenure_years=20
 ):
     months = tenure_years * 12
-    annual_rate = invest_rate / 100
-    monthly_rate = annual_rate / 12
-
-    total_rent_paid = 0
-    current_rent = initial_rent
 
-    for _ in range(tenure_years):
-        total_rent_paid += current_rent * 12
-        current_rent *= (1 + escalation / 100)
+    total_rent_paid = initial_rent * 12 * escalating_sum_factor(escalation, tenure_years)
 
-    lump_sum_value = down_payment * ((1 + annual_rate) ** tenure_years)
+    lump_sum_value = down_payment * growth_factor(invest_rate, tenure_years)
 
-    sip_value = monthly_saving * (
-        ((1 + monthly_rate) ** months - 1) / monthly_rate
-    ) * (1 + monthly_rate)
+    sip_value = monthly_saving * sip_factor(invest_rate, months)
 
     wealth_renting = lump_sum_value + sip_value - total_rent_paid
 
@@ -71,3 +75,47 @@ def compare_results(buy, rent):
         return "RENTING is financially better"
     else:
         return "Both options are similar"
+
+
+# Array forms of the cases above, for whole columns of listings at once
+
+def buying_arrays(property_price, down_payment, loan_rate, tax_rate, appreciation_rate, tenure_years=20):
+    property_price = np.asarray(property_price, dtype=float)
+    loan_amount = property_price - np.asarray(down_payment, dtype=float)
+    n = tenure_years * 12
+
+    emi = loan_amount * annuity_factor(loan_rate, n)
+    total_paid = emi * n
+    future_value = property_price * growth_factor(appreciation_rate, tenure_years)
+    tax_on_gain = (future_value - property_price) * (tax_rate / 100)
+    wealth_buying = future_value - tax_on_gain - total_paid - down_payment
+
+    return {
+        "emi": np.round(emi, 2),
+        "interest_paid": np.round(total_paid - loan_amount, 2),
+        "future_property_value": np.round(future_value, 2),
+        "wealth_buying": np.round(wealth_buying, 2)
+    }
+
+
+def renting_arrays(initial_rent, escalation, down_payment, invest_rate, monthly_saving, tenure_years=20):
+    total_rent_paid = np.asarray(initial_rent, dtype=float) * 12 * escalating_sum_factor(escalation, tenure_years)
+    lump_sum_value = np.asarray(down_payment, dtype=float) * growth_factor(invest_rate, tenure_years)
+    sip_value = np.asarray(monthly_saving, dtype=float) * sip_factor(invest_rate, tenure_years * 12)
+    wealth_renting = lump_sum_value + sip_value - total_rent_paid
+
+    return {
+        "total_rent_paid": np.round(total_rent_paid, 2),
+        "lump_sum_value": np.round(lump_sum_value, 2),
+        "sip_value": np.round(sip_value, 2),
+        "wealth_renting": np.round(wealth_renting, 2)
+    }
+
+
+def compare_arrays(buy, rent):
+    wealth_buying, wealth_renting = buy["wealth_buying"], rent["wealth_renting"]
+    return np.select(
+        [wealth_buying > wealth_renting, wealth_renting > wealth_buying],
+        ["BUYING is financially better", "RENTING is financially better"],
+        "Both options are similar"
+    )
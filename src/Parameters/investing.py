@@ -1,8 +1,9 @@
+from src.Parameters.kernels import growth_factor, sip_factor
+
+
 def future_value_lumpsum(P, rate, years):
-    return P * (1 + rate / 100)**years
+    return P * growth_factor(rate, years)
 
 
 def future_value_sip(monthly, rate, years):
-    r = rate / 12 / 100
-    n = years * 12
-    return monthly * ((1 + r)**n - 1) / r
+    return monthly * sip_factor(rate, years * 12, due=False)
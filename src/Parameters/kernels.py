@@ -0,0 +1,126 @@
+# src/Parameters/kernels.py
+
+"""
+Shared financial kernels.
+
+Every EMI, SIP and compounding calculation goes through these factors so
+all modules agree (zero rate handled the same way everywhere). Scalar
+factors are memoized per (rate, period) with a bounded LRU; array versions
+evaluate each pair of distinct rate and period values once and broadcast
+the result, so per-listing work is a single multiply. Large or
+high-cardinality inputs use the closed-form array formulas instead.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+KERNEL_CACHE_SIZE = 4096
+# Above this many input values or distinct (rate, period) pairs, arrays are
+# computed directly (e.g. Monte Carlo samples, where every path has its own rate)
+MAX_CACHED_PAIRS = 512
+
+
+@lru_cache(maxsize=KERNEL_CACHE_SIZE)
+def annuity_factor(annual_rate, months):
+    # EMI per unit of principal: r(1+r)^n / ((1+r)^n - 1); 1/n at zero rate
+    if months <= 0:
+        return 0.0
+    r = annual_rate / 12 / 100
+    if r == 0:
+        return 1 / months
+    growth = (1 + r) ** months
+    return r * growth / (growth - 1)
+
+
+@lru_cache(maxsize=KERNEL_CACHE_SIZE)
+def sip_factor(annual_rate, months, due=True):
+    # Future value of 1 invested monthly for n months: ((1+r)^n - 1)/r,
+    # times (1+r) when invested at the start of each month (due=True)
+    r = annual_rate / 12 / 100
+    if r == 0:
+        return float(months)
+    factor = ((1 + r) ** months - 1) / r
+    return factor * (1 + r) if due else factor
+
+
+@lru_cache(maxsize=KERNEL_CACHE_SIZE)
+def growth_factor(annual_rate, years):
+    # Compound growth multiplier (1 + rate)^years
+    return (1 + annual_rate / 100) ** years
+
+
+@lru_cache(maxsize=KERNEL_CACHE_SIZE)
+def escalating_sum_factor(annual_rate, years):
+    # Sum of (1 + rate)^t for t = 0..years-1 (e.g. total rent with yearly escalation)
+    g = 1 + annual_rate / 100
+    if g == 1:
+        return float(years)
+    return (g ** years - 1) / (g - 1)
+
+
+def _vectorized(kernel, direct, rate, period):
+    rate = np.asarray(rate, dtype=float)
+    period = np.asarray(period, dtype=float)
+    if rate.ndim == 0 and period.ndim == 0:
+        return np.asarray(kernel(float(rate), float(period)))
+
+    # Large inputs (e.g. one rate per Monte Carlo path) are not worth
+    # deduplicating: sorting them costs more than the direct formula
+    if rate.size > MAX_CACHED_PAIRS or period.size > MAX_CACHED_PAIRS:
+        return direct(*np.broadcast_arrays(rate, period))
+    rates, rate_index = np.unique(rate, return_inverse=True)
+    periods, period_index = np.unique(period, return_inverse=True)
+    if len(rates) * len(periods) > MAX_CACHED_PAIRS:
+        return direct(*np.broadcast_arrays(rate, period))
+    # Distinct values of each input, so every pair is looked up once
+    values = np.array([[kernel(float(r), float(p)) for p in periods] for r in rates])
+    return values[rate_index.reshape(rate.shape), period_index.reshape(period.shape)]
+
+
+def _annuity_direct(annual_rate, months):
+    r = annual_rate / 12 / 100
+    safe_r = np.where(r != 0, r, 1.0)
+    safe_n = np.where(months > 0, months, 1.0)
+    growth = (1 + safe_r) ** safe_n
+    factor = np.where(r != 0, safe_r * growth / (growth - 1), 1 / safe_n)
+    return np.where(months > 0, factor, 0.0)
+
+
+def _sip_direct(annual_rate, months):
+    r = annual_rate / 12 / 100
+    safe_r = np.where(r != 0, r, 1.0)
+    return np.where(r != 0, ((1 + safe_r) ** months - 1) / safe_r * (1 + safe_r), months)
+
+
+def _growth_direct(annual_rate, years):
+    return (1 + annual_rate / 100) ** years
+
+
+def _escalating_direct(annual_rate, years):
+    g = 1 + annual_rate / 100
+    safe_g = np.where(g != 1, g, 2.0)
+    return np.where(g != 1, (safe_g ** years - 1) / (safe_g - 1), years)
+
+
+def annuity_factors(annual_rate, months):
+    return _vectorized(annuity_factor, _annuity_direct, annual_rate, months)
+
+
+def sip_factors(annual_rate, months):
+    return _vectorized(sip_factor, _sip_direct, annual_rate, months)
+
+
+def growth_factors(annual_rate, years):
+    return _vectorized(growth_factor, _growth_direct, annual_rate, years)
+
+
+def escalating_sum_factors(annual_rate, years):
+    return _vectorized(escalating_sum_factor, _escalating_direct, annual_rate, years)
+
+
+def kernel_cache_info():
+    return {
+        kernel.__name__: kernel.cache_info()._asdict()
+        for kernel in (annuity_factor, sip_factor, growth_factor, escalating_sum_factor)
+    }
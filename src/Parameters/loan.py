@@ -1,27 +1,125 @@
+import numpy as np
+
+from src.Parameters.kernels import annuity_factor, annuity_factors
+
+
 def calculate_emi(principal, annual_rate, tenure_years=20):
-    r = annual_rate / 12 / 100
-    n = tenure_years * 12
-    emi = principal * r * (1 + r)**n / ((1 + r)**n - 1)
-    return emi
+    return principal * annuity_factor(annual_rate, tenure_years * 12)
+
+
+def emi_array(principal, annual_rate, months):
+    # calculate_emi for arrays; months instead of years so resets can re-amortize
+    principal = np.asarray(principal, dtype=float)
+    emi = principal * annuity_factors(annual_rate, months)
+    return np.where(principal > 0, emi, 0.0)
+
+
+def _amortize_segment(balance, r, emi, length):
+    # Closed-form balances for `length` months at a fixed rate and EMI
+    # balance_k = B(1+r)^k - EMI((1+r)^k - 1)/r, clipped once the loan is repaid
+    k = np.arange(length + 1)[None, :]
+    b, rate, pay = balance[:, None], r[:, None], emi[:, None]
+
+    growth = (1 + rate) ** k
+    safe_rate = np.where(rate > 0, rate, 1.0)
+    annuity = np.where(rate > 0, (growth - 1) / safe_rate, k)
+    raw = b * growth - pay * annuity
+
+    before = np.clip(raw[:, :-1], 0, None)
+    interest = before * rate
+    principal = np.minimum(pay - interest, before)
+    after = before - principal
+    return interest, principal, after
+
+
+def amortization_arrays(principal, annual_rate, tenure_years=20, prepayments=None, rate_resets=None,
+                        prepayment_mode="tenure"):
+    """
+    Month-by-month amortization for a batch of loans, as columnar arrays.
+
+    principal, annual_rate and tenure_years are scalars or arrays of n loans.
+    Schedules are padded to the longest tenure (zeros after repayment).
+
+    Events (month m is applied after that month's EMI, i.e. from month m + 1):
+        prepayments: {month: amount}, amount scalar or per-loan array
+        rate_resets: {month: new_rate}, rate scalar or per-loan array;
+                     the EMI is recomputed over the remaining tenure
+        prepayment_mode: "tenure" keeps the EMI and shortens the loan,
+                         "emi" keeps the tenure and lowers the EMI
+
+    Returns dict of (n, months) arrays: payment, interest, principal,
+    prepayment, balance (after the month), plus month (1-based) and emi
+    (initial EMI per loan).
+    """
+    principal = np.atleast_1d(np.asarray(principal, dtype=float))
+    n = len(principal)
+    annual = np.broadcast_to(np.asarray(annual_rate, dtype=float), (n,))
+    rate = annual / 12 / 100
+    tenure_months = np.broadcast_to(np.round(np.asarray(tenure_years, dtype=float) * 12), (n,))
+    total_months = int(tenure_months.max()) if n else 0
+
+    prepayments = prepayments or {}
+    rate_resets = rate_resets or {}
+    event_months = sorted(m for m in set(prepayments) | set(rate_resets) if 0 < m < total_months)
+
+    columns = {name: np.zeros((n, total_months)) for name in ("interest", "principal", "prepayment", "balance")}
+
+    balance = principal.copy()
+    emi = emi_array(balance, annual, tenure_months)
+    initial_emi = emi.copy()
+
+    start = 0
+    for end in event_months + [total_months]:
+        interest, paid, after = _amortize_segment(balance, rate, emi, end - start)
+        columns["interest"][:, start:end] = interest
+        columns["principal"][:, start:end] = paid
+        columns["balance"][:, start:end] = after
+        balance = after[:, -1].copy()
+        if end == total_months:
+            break
+
+        remaining = np.clip(tenure_months - end, 0, None)
+        if end in prepayments:
+            amount = np.minimum(np.broadcast_to(np.asarray(prepayments[end], dtype=float), (n,)), balance)
+            columns["prepayment"][:, end - 1] = amount
+            columns["balance"][:, end - 1] -= amount
+            balance = balance - amount
+            if prepayment_mode == "emi":
+                emi = emi_array(balance, annual, remaining)
+        if end in rate_resets:
+            annual = np.broadcast_to(np.asarray(rate_resets[end], dtype=float), (n,))
+            rate = annual / 12 / 100
+            emi = emi_array(balance, annual, remaining)
+        start = end
+
+    columns["payment"] = columns["interest"] + columns["principal"]
+    columns["month"] = np.arange(1, total_months + 1)
+    columns["emi"] = initial_emi
+    return columns
+
+
+def yearly_totals(monthly):
+    # (n, months) -> (n, years) sums via reshape; a partial last year is zero-padded
+    monthly = np.atleast_2d(monthly)
+    pad = (-monthly.shape[1]) % 12
+    if pad:
+        monthly = np.pad(monthly, ((0, 0), (0, pad)))
+    return monthly.reshape(monthly.shape[0], -1, 12).sum(axis=2)
 
 
 def amortization_schedule(principal, annual_rate, tenure_years=20):
-    emi = calculate_emi(principal, annual_rate, tenure_years)
-    r = annual_rate / 12 / 100
-    balance = principal
-    schedule = []
-
-    for month in range(1, tenure_years * 12 + 1):
-        interest = balance * r
-        principal_paid = emi - interest
-        balance -= principal_paid
-
-        schedule.append({
-            "month": month,
-            "emi": emi,
-            "interest": interest,
-            "principal": principal_paid,
-            "balance": max(balance, 0)
-        })
+    arrays = amortization_arrays(principal, annual_rate, tenure_years)
+    emi = float(arrays["emi"][0])
 
-    return schedule
+    return [
+        {
+            "month": int(month),
+            "emi": emi,
+            "interest": float(interest),
+            "principal": float(principal_paid),
+            "balance": float(balance)
+        }
+        for month, interest, principal_paid, balance in zip(
+            arrays["month"], arrays["interest"][0], arrays["principal"][0], arrays["balance"][0]
+        )
+    ]
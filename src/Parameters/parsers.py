@@ -1,41 +1,254 @@
+# src/Parameters/parsers.py
+
+"""
+Listing text parsers shared by the scrapers and post-processing.
+
+Patterns are compiled once at import. Every scalar parser has a column
+variant that runs the same patterns with pandas .str.extract over Arrow
+strings (RE2, no Python call per row), so a whole raw scrape is parsed in a
+few vectorized passes and both paths return the same values:
+
+    price:    "₹1.2 Cr", "45 Lac", "45 Lakh", "₹45,00,000"  -> INR
+    per sqft: "₹8,000 per sqft", "₹8,000/sqft", "₹8,000 sqft" -> INR per sqft
+    area:     "1500 sqft", "450 sqyrd", "200 sq m", "1500"    -> sqft
+    bedrooms: "2 BHK", "3BHK", "Studio" (0), "1 RK"           -> count
+    city:     "Bangalore", "New Delhi", "gurugram"            -> scraper slug
+
+The scrapers call the scalar parsers: a page holds at most a few hundred
+cards, and the column variants only pay off above a few thousand rows.
+
+city_slug only applies CITY_SPELLINGS (other names of the same city). The
+RAG intent classifier matches queries with the looser CITY_ALIASES, which
+also maps abbreviations and neighbouring areas ("ncr", "greater noida") to
+a scraped city, so the cleaner must not use it.
+"""
+
 import re
 
-def parse_price(text):
-    if not text or text.strip() == "":
-        return None
+import numpy as np
+import pandas as pd
+
+# Pattern sources are RE2-compatible (named groups, inline flags) so the
+# column variants can run them in Arrow; the scalar parsers compile them
+_NUMBER = r"(?P<value>\d[\d,]*(?:\.\d+)?)"
+
+_PER_SQFT_UNIT = r"(?:per\s*|/\s*)?sq\.?\s*ft"
+_TOTAL_UNIT = r"(?P<unit>cr|lac|lakh)"
+
+PER_SQFT_PATTERN = r"(?i)" + _NUMBER + r"\s*" + _PER_SQFT_UNIT
+TOTAL_PATTERN = r"(?i)" + _NUMBER + r"\s*" + _TOTAL_UNIT
+# Either figure, so parse_price_text reads both in one left-to-right scan
+PRICE_AMOUNT_PATTERN = r"(?i)" + _NUMBER + r"\s*(?:" + _TOTAL_UNIT + "|" + _PER_SQFT_UNIT + ")"
+AMOUNT_PATTERN = _NUMBER
+AREA_PATTERN = r"(?i)" + _NUMBER + r"\s*(?P<unit>sq\.?\s*(?:ft|feet|yrd|yd|yard|mt|m)|sft)"
+BARE_AREA_PATTERN = r"^\s*" + _NUMBER + r"\s*$"
+STUDIO_PATTERN = r"(?i)studio"
+RK_PATTERN = r"(?i)(?P<value>\d+)\s*rk"
+BHK_PATTERN = r"(?i)(?P<value>\d+)\s*bhk"
+UNIT_CHARS_PATTERN = r"[^a-z]"
+SLUG_CHARS_PATTERN = r"[^a-z0-9]+"
+
+PER_SQFT_RE = re.compile(PER_SQFT_PATTERN)
+TOTAL_RE = re.compile(TOTAL_PATTERN)
+PRICE_AMOUNT_RE = re.compile(PRICE_AMOUNT_PATTERN)
+AMOUNT_RE = re.compile(AMOUNT_PATTERN)
+AREA_RE = re.compile(AREA_PATTERN)
+BARE_AREA_RE = re.compile(BARE_AREA_PATTERN)
+STUDIO_RE = re.compile(STUDIO_PATTERN)
+RK_RE = re.compile(RK_PATTERN)
+BHK_RE = re.compile(BHK_PATTERN)
+_UNIT_CHARS_RE = re.compile(UNIT_CHARS_PATTERN)
+_SLUG_CHARS_RE = re.compile(SLUG_CHARS_PATTERN)
+
+# Multipliers keyed by the unit's first letter (Cr, Lac / Lakh)
+PRICE_UNITS = {"c": 1e7, "l": 1e5}
+# Square feet per unit, keyed by the unit with "sq" and punctuation removed
+AREA_UNITS = {"ft": 1.0, "feet": 1.0, "sft": 1.0, "yrd": 9.0, "yd": 9.0, "yard": 9.0, "mt": 10.7639, "m": 10.7639}
 
-    # Take only first line (remove square foot price line)
-    text = text.split()[0]  
+# City slug (as in the scraper's CITIES) -> other spellings of that same city, for the cleaner
+CITY_SPELLINGS = {
+    "new-delhi": ["delhi", "new delhi"],
+    "mumbai": ["bombay"],
+    "chennai": ["madras"],
+    "kolkata": ["calcutta"],
+    "pune": ["poona"],
+    "gurgaon": ["gurugram"],
+    "navi-mumbai": ["new mumbai"],
+    "bengaluru": ["bangalore"],
+    "mysore": ["mysuru"],
+    "trivandrum": ["thiruvananthapuram"],
+    "kochi": ["cochin"],
+    "thrissur": ["trichur"],
+}
 
-    text = text.replace("₹", "").replace(",", "").replace("Onwards", "").strip()
+# City slug -> words in a query that point at it (spellings, abbreviations, nearby areas)
+CITY_ALIASES = {
+    "new-delhi": ["delhi", "new delhi", "new-delhi", "ncr"],
+    "mumbai": ["mumbai", "bombay"],
+    "chennai": ["chennai", "madras"],
+    "kolkata": ["kolkata", "calcutta"],
+    "hyderabad": ["hyderabad", "hyd"],
+    "pune": ["pune", "poona"],
+    "gurgaon": ["gurgaon", "gurugram", "ggn"],
+    "noida": ["noida", "greater noida"],
+    "navi-mumbai": ["navi mumbai", "navi-mumbai", "new mumbai"],
+    "bengaluru": ["bengaluru", "bangalore", "blr"],
+    "mysore": ["mysore", "mysuru"],
+    "trivandrum": ["trivandrum", "thiruvananthapuram"],
+    "kochi": ["kochi", "cochin"],
+    "thrissur": ["thrissur", "trichur"],
+}
 
-    # Remove everything except digits and dots
-    num = re.sub(r"[^0-9.]", "", text)
 
-    # If nothing numeric remains → invalid price
-    if num == "":
+def _number(text):
+    return float(text.replace(",", ""))
+
+
+def _area_unit(unit):
+    return AREA_UNITS[_UNIT_CHARS_RE.sub("", unit.lower()).removeprefix("sq")]
+
+
+def _slug(text):
+    return _SLUG_CHARS_RE.sub("-", text.lower()).strip("-")
+
+
+# Slugged spelling -> city slug
+CITY_SLUGS = {_slug(spelling): city for city, spellings in CITY_SPELLINGS.items() for spelling in spellings}
+
+
+def _unitless_price(text):
+    # No unit: the first amount that is not the per-sqft figure
+    match = AMOUNT_RE.search(PER_SQFT_RE.sub("", text))
+    return _number(match.group(1)) if match else None
+
+
+def parse_price(text):
+    """Total price in INR ("1.2 Cr", "45 Lac", "₹45,00,000"); None if absent."""
+    if not text:
         return None
+    match = TOTAL_RE.search(text)
+    return _number(match.group(1)) * PRICE_UNITS[match.group(2)[0].lower()] if match else _unitless_price(text)
 
-    # Handle Cr
-    if "Cr" in text:
-        return float(num) * 1e7
 
-    # Handle Lac or Lakh
-    if "Lac" in text or "Lakh" in text:
-        return float(num) * 1e5
+def parse_price_per_sqft(text):
+    """Price per sqft in INR ("₹8,000 per sqft", "₹8,000 sqft"); None if absent."""
+    match = PER_SQFT_RE.search(text) if text else None
+    return int(_number(match.group(1))) if match else None
 
-    return float(num)
 
+def parse_price_text(text):
+    """(total INR, INR per sqft) from a card's price text; same values as parse_price / parse_price_per_sqft."""
+    if not text:
+        return None, None
+    total = per_sqft = None
+    for match in PRICE_AMOUNT_RE.finditer(text):
+        value, unit = match.groups()
+        if unit:
+            if total is None:
+                total = _number(value) * PRICE_UNITS[unit[0].lower()]
+        elif per_sqft is None:
+            per_sqft = int(_number(value))
+        if total is not None and per_sqft is not None:
+            break
+    return (_unitless_price(text) if total is None else total), per_sqft
 
-import re
 
 def parse_area(text):
+    """Area in sqft from "1500 sqft", "450 sqyrd", "200 sqm" or a bare number."""
     if not text:
         return None
+    match = AREA_RE.search(text)
+    if match:
+        return _number(match.group(1)) * _area_unit(match.group(2))
+    match = BARE_AREA_RE.match(text)
+    return _number(match.group(1)) if match else None
 
-    # Find FIRST number in the string
-    match = re.search(r"[0-9]+\.?[0-9]*", text)
-    if not match:
+
+def parse_bedrooms(text):
+    """Bedrooms from a title: "2 BHK", "3BHK", "Studio" (0), "1 RK"."""
+    if not text:
         return None
+    lower = text.lower()
+    if "studio" in lower:
+        return 0
+    # Substring checks first: most titles have neither or only one of the patterns
+    match = ("rk" in lower and RK_RE.search(text)) or ("bhk" in lower and BHK_RE.search(text))
+    return int(match.group(1)) if match else None
+
+
+# Column variants (Arrow strings, so every pattern runs natively over the column)
+
+def _strings(texts):
+    import pyarrow as pa
+    return texts.astype(pd.ArrowDtype(pa.string()))
+
+
+def _numbers(values):
+    return values.str.replace(",", "", regex=False).astype("float64[pyarrow]")
+
+
+def _floats(values):
+    return values.astype("float64").to_numpy()
+
+
+def _fill_missing(values, texts, parse):
+    # Fallback parse only for the rows the primary pattern missed
+    missing = np.isnan(values)
+    if missing.any():
+        values[missing] = parse(texts[missing])
+    return values
+
+
+def parse_price_column(texts):
+    """parse_price over a Series (float, NaN where absent)."""
+    texts = _strings(texts)
+    total = texts.str.extract(TOTAL_PATTERN)
+    crore = (total["unit"].str.slice(0, 1).str.lower() == "c").fillna(False).to_numpy(dtype=bool)
+    values = _floats(_numbers(total["value"])) * np.where(crore, PRICE_UNITS["c"], PRICE_UNITS["l"])
+    values = _fill_missing(values, texts, lambda rest: _floats(_numbers(
+        rest.str.replace(PER_SQFT_PATTERN, "", regex=True).str.extract(AMOUNT_PATTERN)["value"])))
+    return pd.Series(values, index=texts.index)
+
+
+def parse_price_per_sqft_column(texts):
+    """parse_price_per_sqft over a Series (Int64, <NA> where absent)."""
+    values = np.trunc(_floats(_numbers(_strings(texts).str.extract(PER_SQFT_PATTERN)["value"])))
+    return pd.Series(values, index=texts.index).astype("Int64")
+
+
+def parse_area_column(texts):
+    """parse_area over a Series (float sqft, NaN where absent)."""
+    texts = _strings(texts)
+    area = texts.str.extract(AREA_PATTERN)
+    units = area["unit"].str.lower().str.replace(UNIT_CHARS_PATTERN, "", regex=True).str.removeprefix("sq")
+    factors = units.astype(object).map(AREA_UNITS).to_numpy(dtype=float, na_value=np.nan)
+    values = _floats(_numbers(area["value"])) * factors
+    values = _fill_missing(values, texts, lambda rest: _floats(_numbers(rest.str.extract(BARE_AREA_PATTERN)["value"])))
+    return pd.Series(values, index=texts.index)
+
+
+def parse_bedrooms_column(texts):
+    """parse_bedrooms over a Series (Int64, <NA> where absent)."""
+    texts = _strings(texts)
+    values = _floats(_numbers(texts.str.extract(RK_PATTERN)["value"]))
+    values = _fill_missing(values, texts, lambda rest: _floats(_numbers(rest.str.extract(BHK_PATTERN)["value"])))
+    studio = texts.str.contains(STUDIO_PATTERN).fillna(False).to_numpy(dtype=bool)
+    values[studio] = 0
+    return pd.Series(values, index=texts.index).astype("Int64")
+
+
+def city_slug(text):
+    """Scraper slug of a city name: "Bangalore" -> "bengaluru", "Navi Mumbai" -> "navi-mumbai"; None if blank."""
+    slug = _slug(text) if text else ""
+    return CITY_SLUGS.get(slug, slug) or None
+
+
+def city_slug_column(texts):
+    """city_slug over a Series (Arrow strings, <NA> where blank)."""
+    slugs = _strings(texts).str.lower().str.replace(SLUG_CHARS_PATTERN, "-", regex=True).str.strip("-")
+    slugs = slugs.mask(slugs == "")
+    # Few distinct cities: map the unique slugs, not the rows; code -1 (missing) picks the trailing None
+    codes, uniques = pd.factorize(slugs)
+    mapped = np.array([CITY_SLUGS.get(slug, slug) for slug in uniques] + [None], dtype=object)
+    return pd.Series(mapped[codes], index=texts.index, dtype=slugs.dtype)
 
-    return float(match.group(0))
@@ -1,18 +1,80 @@
+import numpy as np
+import pandas as pd
+
+from src.Parameters.loan import amortization_arrays, yearly_totals
+
+SECTION_24_INTEREST_CAP = 200000   # Home loan interest deduction per year
+SECTION_80C_PRINCIPAL_CAP = 150000  # Principal repayment deduction per year
+
+
+def tax_benefit_arrays(interest, principal, tax_rate):
+    # interest/principal: (n, months) arrays; tax_rate: scalar or per-loan (%)
+    # Returns (n, years) tax saved per year
+    return yearly_tax_savings(yearly_totals(interest), yearly_totals(principal), tax_rate)
+
+
+def yearly_tax_savings(yearly_interest, yearly_principal, tax_rate):
+    # Capped Section 24 / 80C deductions on (n, years) totals, times the tax rate
+    deduction = (np.minimum(yearly_interest, SECTION_24_INTEREST_CAP) +
+                 np.minimum(yearly_principal, SECTION_80C_PRINCIPAL_CAP))
+    rate = np.asarray(tax_rate, dtype=float)
+    if rate.ndim == 1:
+        rate = rate[:, None]
+    return deduction * (rate / 100)
+
+
 def tax_benefits(schedule, tax_rate):
-    yearly = {}
+    # schedule: amortization_schedule list, or amortization_arrays dict (first loan)
+    if isinstance(schedule, dict):
+        interest = schedule["interest"][:1]
+        principal = schedule["principal"][:1] + schedule["prepayment"][:1]
+    else:
+        interest = np.array([[item["interest"] for item in schedule]])
+        principal = np.array([[item["principal"] for item in schedule]])
+
+    return float(tax_benefit_arrays(interest, principal, tax_rate).sum())
+
+
+def _loan_tax_arrays(prices, down_payment_percent, loan_rate, tenure_years, tax_rate, horizon_years):
+    # (emi, total interest, (n, years) tax saved per year) for every listing in one pass
+    prices = np.asarray(prices, dtype=float)
+    loan_amount = prices * (1 - np.asarray(down_payment_percent, dtype=float) / 100)
+
+    if np.ndim(loan_rate) == 0 and np.ndim(tenure_years) == 0:
+        # One rate and tenure: schedules scale linearly with the principal, so
+        # amortize a unit loan once and work on (n, years) instead of (n, months)
+        unit = amortization_arrays(1.0, loan_rate, tenure_years)
+        principal = np.where(loan_amount > 0, loan_amount, 0.0)[:, None]
+        emi = principal[:, 0] * unit["emi"][0]
+        total_interest = principal[:, 0] * unit["interest"][0].sum()
+        savings = yearly_tax_savings(
+            principal * yearly_totals(unit["interest"]), principal * yearly_totals(unit["principal"]), tax_rate
+        )
+    else:
+        arrays = amortization_arrays(loan_amount, loan_rate, tenure_years)
+        emi = arrays["emi"]
+        total_interest = arrays["interest"].sum(axis=1)
+        savings = tax_benefit_arrays(arrays["interest"], arrays["principal"] + arrays["prepayment"], tax_rate)
+    if horizon_years is not None:
+        savings = savings[:, :int(horizon_years)]
+    return emi, total_interest, savings
 
-    for item in schedule:
-        year = (item["month"] - 1) // 12 + 1
-        yearly.setdefault(year, {"interest": 0, "principal": 0})
-        yearly[year]["interest"] += item["interest"]
-        yearly[year]["principal"] += item["principal"]
 
-    total = 0
-    for year, data in yearly.items():
-        interest_deduction = min(200000, data["interest"])
-        principal_deduction = min(150000, data["principal"])
-        deduction = interest_deduction + principal_deduction
+def loan_tax_savings_by_year(prices, down_payment_percent=20, loan_rate=8.5, tenure_years=20, tax_rate=30,
+                             horizon_years=None):
+    # (n, years) Section 24 / 80C tax saved in each loan year, e.g. for wealth trajectories
+    return _loan_tax_arrays(prices, down_payment_percent, loan_rate, tenure_years, tax_rate, horizon_years)[2]
 
-        total += deduction * (tax_rate / 100)
 
-    return total
+def loan_tax_columns(prices, down_payment_percent=20, loan_rate=8.5, tenure_years=20, tax_rate=30,
+                     horizon_years=None):
+    # EMI, total interest and total tax saving for every listing in one pass
+    # horizon_years limits tax savings to the first N years (e.g. a projection horizon)
+    emi, total_interest, savings = _loan_tax_arrays(
+        prices, down_payment_percent, loan_rate, tenure_years, tax_rate, horizon_years
+    )
+    return pd.DataFrame({
+        "monthly_emi": np.round(emi, 2),
+        "total_interest": np.round(total_interest, 2),
+        "tax_saving": np.round(savings.sum(axis=1), 2),
+    })
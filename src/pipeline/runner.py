@@ -0,0 +1,280 @@
+# src/pipeline/runner.py
+
+"""
+DAG pipeline runner.
+
+Each Stage declares the files it reads and writes. A stage is skipped when
+the content hashes of its inputs, its code and its params match the last
+successful run and its outputs are still on disk; otherwise it reruns.
+Because inputs are hashed by content, a stage whose upstream reran but
+produced identical files is skipped too.
+
+Stages whose dependencies are satisfied run in parallel on a thread pool
+(heavy stages parallelize internally with processes). Per-stage status and
+timing are returned and persisted in the state file.
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+from pathlib import Path
+
+STATE_PATH = "data/outputs/pipeline_state.json"
+HASH_BLOCK_SIZE = 1 << 20
+
+
+class Stage:
+    """
+    One pipeline step.
+
+    func: called with no arguments; must write every path in outputs
+    inputs / outputs: file or directory paths
+    code: extra modules or files whose source invalidates the stage when it
+          changes (func's own module is always included)
+    version: bump to force a rerun without a code change
+    """
+
+    def __init__(self, name, func, inputs=(), outputs=(), code=(), params=None, version="1"):
+        self.name = name
+        self.func = func
+        self.inputs = [str(path) for path in inputs]
+        self.outputs = [str(path) for path in outputs]
+        self.code = [inspect.getmodule(func), *code]
+        self.params = params or {}
+        self.version = str(version)
+
+    def __repr__(self):
+        return f"Stage({self.name!r})"
+
+
+def _files(path):
+    path = Path(path)
+    if path.is_dir():
+        return sorted(p for p in path.rglob("*") if p.is_file())
+    return [path] if path.exists() else []
+
+
+class _Hasher:
+    # Content hashes memoized by (path, size, mtime) so unchanged files are read once
+
+    def __init__(self, memo=None):
+        self.memo = dict(memo or {})
+        self.lock = threading.Lock()
+
+    def file(self, path):
+        stat = os.stat(path)
+        signature = [stat.st_size, stat.st_mtime_ns]
+        key = str(path)
+        with self.lock:
+            cached = self.memo.get(key)
+            if cached and cached[:2] == signature:
+                return cached[2]
+
+        digest = hashlib.sha1()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+        value = digest.hexdigest()
+        with self.lock:
+            self.memo[key] = signature + [value]
+        return value
+
+    def path(self, path):
+        files = _files(path)
+        if not files:
+            return None
+        if len(files) == 1 and str(files[0]) == str(path):
+            return self.file(files[0])
+        digest = hashlib.sha1()
+        for file in files:
+            digest.update(f"{file.relative_to(path)}:{self.file(file)}".encode())
+        return digest.hexdigest()
+
+
+def _source(code):
+    if isinstance(code, (str, Path)):
+        return Path(code).read_bytes()
+    return inspect.getsource(code).encode()
+
+
+class Pipeline:
+    def __init__(self, stages, state_path=STATE_PATH):
+        self.stages = {stage.name: stage for stage in stages}
+        if len(self.stages) != len(stages):
+            raise ValueError("Stage names must be unique")
+        self.state_path = state_path
+
+        # A stage depends on whichever stage produces one of its inputs
+        producers = {output: stage.name for stage in stages for output in stage.outputs}
+        self.deps = {
+            stage.name: sorted({producers[path] for path in stage.inputs if path in producers} - {stage.name})
+            for stage in stages
+        }
+        self._check_acyclic()
+
+    def _check_acyclic(self):
+        visiting, done = set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Pipeline has a cycle through stage '{name}'")
+            visiting.add(name)
+            for dep in self.deps[name]:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.stages:
+            visit(name)
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"stages": {}, "hashes": {}}
+
+    def _save_state(self, state):
+        Path(self.state_path).parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp, self.state_path)
+
+    def stage_key(self, stage, hasher):
+        # Fingerprint of everything that determines the stage's outputs
+        digest = hashlib.sha1()
+        digest.update(json.dumps({"version": stage.version, "params": stage.params}, sort_keys=True).encode())
+        for code in stage.code:
+            digest.update(hashlib.sha1(_source(code)).digest())
+        for path in stage.inputs:
+            digest.update(f"{path}={hasher.path(path)}".encode())
+        return digest.hexdigest()
+
+    def _plan(self, stage, hasher, previous, force):
+        missing_inputs = [path for path in stage.inputs if not _files(path)]
+        outputs_present = all(_files(path) for path in stage.outputs)
+
+        if stage.name in force:
+            return "forced", None
+        if missing_inputs:
+            # e.g. the raw scrape is deleted after cleaning: keep existing outputs
+            if outputs_present:
+                return "skip", "inputs missing, outputs kept"
+            raise FileNotFoundError(f"Stage '{stage.name}' is missing inputs {missing_inputs}")
+        if not outputs_present:
+            return "run", "outputs missing"
+        if not stage.inputs:
+            # Source stages (e.g. scrapers) refresh only on request
+            return "skip", "source stage, output present"
+
+        key = self.stage_key(stage, hasher)
+        if previous.get("key") != key:
+            return "run", "inputs or code changed" if previous else "never run"
+        return "skip", "up to date"
+
+    def run(self, targets=None, force=(), workers=None, dry_run=False):
+        """
+        Run the stages needed for targets (default: all), skipping up-to-date ones.
+
+        force: stage names to rerun regardless of hashes ("all" for every stage)
+        workers: max stages running at once (default: number of stages)
+        dry_run: only report what would run
+
+        Returns {stage: {"status", "reason", "seconds"}} in completion order;
+        status is ran, skipped, would run, failed or blocked (upstream failed).
+        A failure does not stop stages that do not depend on it.
+        """
+        names = self._closure(targets or list(self.stages))
+        force = set(names) if "all" in force else set(force)
+        unknown = force - set(self.stages)
+        if unknown:
+            raise ValueError(f"Unknown stages: {sorted(unknown)}")
+
+        state = self._load_state()
+        hasher = _Hasher(state.get("hashes"))
+        report = {}
+        state_lock = threading.Lock()
+
+        def execute(name):
+            stage = self.stages[name]
+            previous = state["stages"].get(name, {})
+            started = time.perf_counter()
+
+            action, reason = self._plan(stage, hasher, previous, force)
+            if action == "skip" or dry_run:
+                status = "skipped" if action == "skip" else "would run"
+                return {"status": status, "reason": reason or action, "seconds": 0.0}
+
+            # Forget the last success first: a run that fails (or is killed) after
+            # writing part of its outputs must not look up to date next time
+            with state_lock:
+                state["stages"].pop(name, None)
+                self._save_state(state)
+            stage.func()
+            seconds = round(time.perf_counter() - started, 3)
+            entry = {
+                "key": self.stage_key(stage, hasher),
+                "seconds": seconds,
+                "finished_at": datetime.now().isoformat(timespec="seconds"),
+            }
+            with state_lock:
+                state["stages"][name] = entry
+            return {"status": "ran", "reason": reason or action, "seconds": seconds}
+
+        pending = set(names)
+        failed = set()
+        with ThreadPoolExecutor(max_workers=workers or len(names) or 1) as pool:
+            running = {}
+            while pending or running:
+                # Repeat until nothing changes, so blocking spreads down a whole chain
+                before = None
+                while len(pending) != before:
+                    before = len(pending)
+                    for name in sorted(pending):
+                        deps = [dep for dep in self.deps[name] if dep in names]
+                        if any(dep in failed for dep in deps):
+                            pending.discard(name)
+                            failed.add(name)
+                            report[name] = {"status": "blocked", "reason": "upstream failed", "seconds": 0.0}
+                        elif all(dep in report for dep in deps):
+                            pending.discard(name)
+                            running[pool.submit(execute, name)] = name
+
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        report[name] = future.result()
+                    except Exception as e:
+                        failed.add(name)
+                        report[name] = {"status": "failed", "reason": f"{type(e).__name__}: {e}", "seconds": 0.0}
+                    print(f"[Pipeline] {name}: {report[name]['status']} ({report[name]['reason']}) "
+                          f"{report[name]['seconds']:.2f}s")
+
+        if not dry_run:
+            state["hashes"] = hasher.memo
+            self._save_state(state)
+        return report
+
+    def _closure(self, targets):
+        # targets plus everything upstream of them, in definition order
+        unknown = set(targets) - set(self.stages)
+        if unknown:
+            raise ValueError(f"Unknown stages: {sorted(unknown)}")
+        needed, stack = set(), list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in needed:
+                needed.add(name)
+                stack.extend(self.deps[name])
+        return [name for name in self.stages if name in needed]
@@ -0,0 +1,71 @@
+# src/pipeline/stages.py
+
+"""
+The project's data pipeline as stages:
+
+    raw scrape -> clean -> prepare -> analyze -> vector_store
+    bank_rates (independent)
+
+Scraping listings is not a stage (it is long-running and network bound);
+run the scraper, then the pipeline. Stages without inputs (bank_rates) only
+run when their output is missing or when forced.
+"""
+
+from src.pipeline.runner import Pipeline, Stage
+
+RAW_CSV = "data/outputs/magicbricks_india_properties.csv"
+CLEANED_CSV = "data/outputs/magicbricks_india_properties_cleaned.csv"
+CLEANING_REPORT = "data/outputs/cleaning_report.json"
+FINAL_CSV = "data/outputs/magicbricks_india_final.csv"
+ANALYZED_CSV = "data/outputs/analyzed_properties.csv"
+ANALYSIS_STORE = "data/outputs/analysis_store.parquet"
+ANALYSIS_CHANGELOG = "data/outputs/analysis_changelog.jsonl"
+VECTOR_DIR = "data/vectorstore"
+BANK_RATES_JSON = "src/scrapers/bank_rates.json"
+
+
+def clean():
+    from src.playwright_scraper.data_cleaner import clean_location_csv
+    clean_location_csv(input_csv=RAW_CSV, output_csv=CLEANED_CSV, drop_empty_location=True,
+                       report_path=CLEANING_REPORT)
+
+
+def prepare():
+    from process_csv import process_csv
+    process_csv(CLEANED_CSV, FINAL_CSV)
+
+
+def analyze():
+    from src.Parameters.analyzer import run_incremental_analysis
+    run_incremental_analysis(FINAL_CSV, ANALYZED_CSV, ANALYSIS_STORE, ANALYSIS_CHANGELOG, workers=0)
+
+
+def vector_store():
+    from src.rag.property_explanations import load_property_explanations
+    from src.rag.vector_store import rebuild_vector_store
+    rebuild_vector_store(load_property_explanations())
+
+
+def bank_rates():
+    from src.scrapers.bank_rates_scraper import scrape_bank_rates, save_bank_rates
+    save_bank_rates(scrape_bank_rates(), BANK_RATES_JSON)
+
+
+def build_pipeline(state_path=None):
+    import process_csv
+    from src.Parameters import analyzer, buy_vs_rent, kernels, loan, parsers, tax
+    from src.playwright_scraper import data_cleaner
+    from src.rag import property_explanations, vector_store as vector_store_module
+
+    stages = [
+        # CLEANING_REPORT is a by-product, not an output: the raw CSV is deleted after
+        # a crawl, and a missing report must not make the stage need inputs that are gone
+        Stage("clean", clean, inputs=[RAW_CSV], outputs=[CLEANED_CSV], code=[data_cleaner, parsers]),
+        Stage("prepare", prepare, inputs=[CLEANED_CSV], outputs=[FINAL_CSV], code=[process_csv]),
+        Stage("analyze", analyze, inputs=[FINAL_CSV], outputs=[ANALYZED_CSV, ANALYSIS_STORE, ANALYSIS_CHANGELOG],
+              code=[analyzer, buy_vs_rent, tax, loan, kernels]),
+        Stage("vector_store", vector_store, inputs=[ANALYZED_CSV], outputs=[VECTOR_DIR],
+              code=[property_explanations, vector_store_module]),
+        Stage("bank_rates", bank_rates, outputs=[BANK_RATES_JSON]),
+    ]
+    return Pipeline(stages, state_path) if state_path else Pipeline(stages)
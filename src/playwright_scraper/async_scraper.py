@@ -0,0 +1,351 @@
+"""
+Concurrent MagicBricks scraper (async Playwright).
+
+Same output as magicbricks_playwright_improved.run, but:
+- cities are scraped concurrently from a bounded pool of browser contexts
+- requests to each domain go through a politeness limiter (max concurrent
+  pages and a minimum gap between navigations)
+- waits are event-driven: after each scroll a MutationObserver resolves as
+  soon as the card count grows, instead of sleeping a fixed 1.5-3 s
+- all cards on a page are read in one evaluate call (EXTRACT_CARDS_JS)
+- each finished city is checkpointed to disk as it completes, and an
+  interrupted run resumes with the remaining cities
+- incremental runs (opt-in) stop scrolling a city once the loaded listings
+  reach a run of already-indexed, unchanged ones (see listing_index.py)
+
+url_builder is injectable, so the runner can be pointed at a local fixture
+server (see benchmarks/scraper_benchmark.py).
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from urllib.parse import urlsplit
+
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+
+from src.playwright_scraper.magicbricks_playwright_improved import (
+    CITIES, SELECTORS, CARD_FIELDS, EXTRACT_CARDS_JS, MAX_RETRIES, RETRY_DELAY, PAGE_LOAD_TIMEOUT,
+    CrawlCheckpoint, ListingIndex, MetricsRecorder, PageStats, build_city_url, first_party_hosts, should_block,
+    parse_cards, finish_crawl, logger
+)
+
+CONTEXT_POOL_SIZE = 4        # Browser contexts (cities in flight)
+DOMAIN_MAX_CONCURRENT = 4    # Pages open against one domain at a time
+DOMAIN_MIN_INTERVAL = 1.0    # Seconds between navigations to one domain
+CARD_WAIT_TIMEOUT = 15000    # ms for the first cards to render
+SCROLL_SETTLE_TIMEOUT = 4000  # ms to wait for new cards after a scroll
+MAX_SCROLLS = 20
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+# Resolves with the card count once it exceeds `previous`, or on timeout
+WAIT_FOR_MORE_CARDS_JS = """
+([selector, previous, timeout]) => new Promise(resolve => {
+    const count = () => document.querySelectorAll(selector).length;
+    if (count() > previous) return resolve(count());
+    const observer = new MutationObserver(() => {
+        const current = count();
+        if (current > previous) { observer.disconnect(); clearTimeout(timer); resolve(current); }
+    });
+    const timer = setTimeout(() => { observer.disconnect(); resolve(count()); }, timeout);
+    observer.observe(document.body, {childList: true, subtree: true});
+})
+"""
+
+class DomainLimiter:
+    """Per-domain politeness: bounded concurrency and a minimum gap between requests."""
+
+    def __init__(self, max_concurrent=DOMAIN_MAX_CONCURRENT, min_interval=DOMAIN_MIN_INTERVAL):
+        self.max_concurrent = max_concurrent
+        self.min_interval = min_interval
+        self._domains = {}
+
+    def _state(self, domain):
+        if domain not in self._domains:
+            self._domains[domain] = {
+                "semaphore": asyncio.Semaphore(self.max_concurrent),
+                "lock": asyncio.Lock(),
+                "last": 0.0,
+            }
+        return self._domains[domain]
+
+    async def acquire(self, url):
+        state = self._state(urlsplit(url).netloc)
+        await state["semaphore"].acquire()
+        async with state["lock"]:
+            delay = state["last"] + self.min_interval - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            state["last"] = time.monotonic()
+        return state["semaphore"]
+
+
+class ContextPool:
+    """Fixed set of browser contexts handed out to one city at a time."""
+
+    def __init__(self, browser, size=CONTEXT_POOL_SIZE):
+        self.browser = browser
+        self.size = size
+        self._queue = asyncio.Queue()
+
+    async def __aenter__(self):
+        for _ in range(self.size):
+            context = await self.browser.new_context(
+                user_agent=USER_AGENT,
+                viewport={"width": 1280, "height": 720}
+            )
+            await self._queue.put(context)
+        return self
+
+    async def __aexit__(self, *exc):
+        while not self._queue.empty():
+            await (self._queue.get_nowait()).close()
+
+    async def acquire(self):
+        return await self._queue.get()
+
+    def release(self, context):
+        self._queue.put_nowait(context)
+
+
+def track_page_usage(page, stats):
+    """Async counterpart of magicbricks_playwright_improved.track_page_usage."""
+    async def finished(request):
+        stats.record(await request.sizes())
+
+    page.on("requestfinished", finished)
+
+
+async def block_resources(page, first_party, stats):
+    """Async counterpart of magicbricks_playwright_improved.block_resources."""
+    async def handle(route):
+        request = route.request
+        if should_block(request.resource_type, request.url, first_party):
+            stats.blocked += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    await page.route("**/*", handle)
+
+
+async def wait_for_more_cards(page, previous, timeout=SCROLL_SETTLE_TIMEOUT):
+    """Card count once it grows past `previous` (or the current count after timeout)."""
+    return await page.evaluate(WAIT_FOR_MORE_CARDS_JS, [SELECTORS['card'][0], previous, timeout])
+
+
+async def scroll_until_loaded(page, max_scrolls=MAX_SCROLLS, max_listings=None, stop=None):
+    """
+    Scroll until no new cards appear (or enough are loaded, or the optional
+    async stop() returns True).
+
+    Returns:
+        Number of scrolls performed
+    """
+    count = await page.locator(SELECTORS['card'][0]).count()
+    for scrolls in range(max_scrolls):
+        if max_listings and count >= max_listings:
+            return scrolls
+        await page.mouse.wheel(0, 4000)
+        new_count = await wait_for_more_cards(page, count)
+        if new_count <= count:
+            logger.info(f"Reached end of content after {scrolls} scrolls")
+            return scrolls
+        count = new_count
+        if stop is not None and await stop():
+            logger.info(f"Reached already-scraped listings after {scrolls + 1} scrolls")
+            return scrolls + 1
+
+    logger.warning(f"Max scrolls ({max_scrolls}) reached, may not have all content")
+    return max_scrolls
+
+
+async def scrape_city(pool, limiter, city, max_listings=None, url_builder=build_city_url, lightweight=True,
+                      usage=None, stop=None, metrics=None, truncated=None):
+    """
+    Scrape all listings for one city on a pooled browser context.
+
+    lightweight blocks images, media, fonts and third-party hosts. The page's
+    requests, KB and seconds are logged and stored in usage[city] if given.
+    stop: optional callable(city, listings) ending the scroll early (see
+    ListingIndex.should_stop).
+    metrics: optional MetricsRecorder for the city's load time, scrolls,
+    cards, parse failures, retries and bytes.
+    truncated: optional set; the city is added when the crawl ended before
+    the last listing (max_listings or MAX_SCROLLS hit).
+
+    Returns:
+        List of property dictionaries
+    """
+    url = url_builder(city)
+    split = urlsplit(url)
+    base_url = f"{split.scheme}://{split.netloc}"
+    started = time.perf_counter()
+
+    for attempt in range(1, MAX_RETRIES + 1):
+        context = await pool.acquire()
+        semaphore = await limiter.acquire(url)
+        page = None
+        try:
+            page = await context.new_page()
+            stats = PageStats()
+            track_page_usage(page, stats)
+            if lightweight:
+                await block_resources(page, first_party_hosts(url), stats)
+            logger.info(f"Loading {city} (attempt {attempt}/{MAX_RETRIES}): {url}")
+            load_started = time.perf_counter()
+            await page.goto(url, wait_until="domcontentloaded" if lightweight else "networkidle",
+                            timeout=PAGE_LOAD_TIMEOUT)
+            await page.wait_for_selector(SELECTORS['card'][0], timeout=CARD_WAIT_TIMEOUT)
+            load_seconds = time.perf_counter() - load_started
+            stopped = False
+
+            async def check():
+                nonlocal stopped
+                raw = await page.eval_on_selector_all(SELECTORS['card'][0], EXTRACT_CARDS_JS, CARD_FIELDS)
+                stopped = stop(city, parse_cards(raw, city, base_url))
+                return stopped
+
+            scrolls = await scroll_until_loaded(page, max_listings=max_listings, stop=check if stop else None)
+            raw_cards = await page.eval_on_selector_all(SELECTORS['card'][0], EXTRACT_CARDS_JS, CARD_FIELDS)
+            # Scrolling stops once max_listings cards are loaded, so reaching the cap means more may exist
+            capped = bool(max_listings) and len(raw_cards) >= max_listings
+            incomplete = not stopped and (scrolls >= MAX_SCROLLS or capped)
+            if incomplete and truncated is not None:
+                truncated.add(city)
+            if max_listings:
+                raw_cards = raw_cards[:max_listings]
+
+            listings = parse_cards(raw_cards, city, base_url)
+            logger.info(f"Successfully scraped {len(listings)}/{len(raw_cards)} listings from {city}")
+            summary = stats.summary()
+            logger.info(f"{city}: {summary['kb']} KB in {summary['seconds']}s "
+                        f"({summary['requests']} requests, {summary['blocked']} blocked)")
+            if usage is not None:
+                usage[city] = summary
+            if metrics is not None:
+                status = "stopped early" if stopped else "incomplete" if incomplete else "ok"
+                metrics.record(city, status=status, attempts=attempt,
+                               load_seconds=load_seconds, scrolls=scrolls, cards=len(raw_cards), listings=listings,
+                               requests=summary["requests"], kb=summary["kb"],
+                               seconds=time.perf_counter() - started)
+            return listings
+
+        except PlaywrightTimeoutError:
+            logger.warning(f"Timeout for {city}, retrying... ({attempt}/{MAX_RETRIES})")
+        except Exception as e:
+            logger.error(f"Error scraping {city}: {e}, retrying... ({attempt}/{MAX_RETRIES})")
+        finally:
+            if page is not None:
+                await page.close()
+            semaphore.release()
+            pool.release(context)
+
+        if attempt < MAX_RETRIES:
+            await asyncio.sleep(RETRY_DELAY)
+
+    logger.error(f"Failed to scrape {city} after {MAX_RETRIES} attempts")
+    if metrics is not None:
+        metrics.record(city, status="failed", attempts=MAX_RETRIES, seconds=time.perf_counter() - started)
+    return []
+
+
+async def scrape_cities(cities=CITIES, headless=True, max_listings_per_city=None, pool_size=CONTEXT_POOL_SIZE,
+                        limiter=None, url_builder=build_city_url, lightweight=True, usage=None, on_city=None,
+                        stop=None, metrics=None, truncated=None):
+    """
+    Scrape cities concurrently.
+
+    usage: optional dict filled with per-city page usage (requests, kb, seconds)
+    on_city: optional callback(city, listings) run as each city finishes;
+             when given, listings are handed off instead of kept in memory
+    stop: optional callable(city, listings) ending a city early
+    metrics: optional MetricsRecorder receiving one record per city
+    truncated: optional set receiving the cities cut short (see scrape_city)
+
+    Returns:
+        (all listings in city order, {city: listing count}); the listings are
+        empty when on_city is given
+    """
+    limiter = limiter or DomainLimiter()
+
+    async def scrape(pool, city):
+        listings = await scrape_city(pool, limiter, city, max_listings_per_city, url_builder, lightweight, usage,
+                                     stop, metrics, truncated)
+        if on_city is None:
+            return listings
+        on_city(city, listings)
+        return len(listings)
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(
+            headless=headless,
+            args=["--disable-blink-features=AutomationControlled"]
+        )
+        try:
+            async with ContextPool(browser, size=min(pool_size, len(cities)) or 1) as pool:
+                results = await asyncio.gather(*(scrape(pool, city) for city in cities))
+        finally:
+            await browser.close()
+
+    if on_city is not None:
+        return [], dict(zip(cities, results))
+    all_results = [listing for listings in results for listing in listings]
+    city_stats = {city: len(listings) for city, listings in zip(cities, results)}
+    return all_results, city_stats
+
+
+def run(headless=True, max_listings_per_city=None, pool_size=CONTEXT_POOL_SIZE, resume=True, incremental=False):
+    """
+    Concurrent drop-in for magicbricks_playwright_improved.run.
+
+    Args:
+        headless: Run browser in headless mode (faster)
+        max_listings_per_city: Limit listings per city (None = all)
+        pool_size: Browser contexts scraping in parallel
+        resume: Skip cities completed by a previous interrupted run
+                (False discards the checkpoint and starts over)
+        incremental: Stop each city at a run of known, unchanged listings.
+                     Off by default: this assumes newest-first results, and
+                     build_city_url does not sort by posting date. False
+                     crawls every city to the end (and detects deletes)
+    """
+    start_time = datetime.now()
+    logger.info("=" * 50)
+    logger.info("Starting MagicBricks Scraper (Async Version)")
+    logger.info(f"Context pool: {pool_size} | Per-domain limit: {DOMAIN_MAX_CONCURRENT} pages, "
+                f"{DOMAIN_MIN_INTERVAL}s between requests")
+    logger.info("=" * 50)
+
+    checkpoint = CrawlCheckpoint()
+    if not resume:
+        checkpoint.clear()
+    done = checkpoint.completed()
+    pending = [city for city in CITIES if city not in done]
+    if done:
+        logger.info(f"Resuming crawl: {len(done)} cities already done, {len(pending)} to go")
+    index = ListingIndex()
+    metrics = MetricsRecorder("async")
+    truncated = set()
+
+    def on_city(city, listings):
+        # Cities that came back empty are retried on the next resume
+        if listings:
+            complete = city not in index.stopped and city not in truncated
+            checkpoint.save_city(city, listings, complete=complete)
+
+    asyncio.run(scrape_cities(pending, headless, max_listings_per_city, pool_size, on_city=on_city,
+                              stop=index.should_stop if incremental else None, metrics=metrics,
+                              truncated=truncated))
+
+    # Merge, clean and summarize exactly like the sequential scraper
+    finish_crawl(checkpoint, start_time, index, metrics)
+
+
+if __name__ == "__main__":
+    run(headless=True, max_listings_per_city=None)
@@ -0,0 +1,121 @@
+"""
+Crawl checkpoints for the MagicBricks scrapers.
+
+Every finished city is written to its own CSV chunk and recorded in a
+manifest, so a crashed crawl resumes with the cities that are not done yet
+and memory does not grow with the number of listings. merge() streams the
+chunks into the final CSV, de-duplicating listings by link.
+"""
+
+import csv
+import json
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+
+CHECKPOINT_DIR = "data/outputs/crawl_checkpoint"
+
+CSV_FIELDS = [
+    "title", "location", "city", "price_total_inr",
+    "price_per_sqft", "area_sqft", "bedrooms", "bathrooms", "link"
+]
+
+
+def _chunk_name(city):
+    return "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in city) + ".csv"
+
+
+class CrawlCheckpoint:
+    """Append-only per-city chunks plus a manifest of completed cities."""
+
+    def __init__(self, directory=CHECKPOINT_DIR):
+        self.directory = Path(directory)
+        self.manifest_path = self.directory / "manifest.json"
+        self.manifest = self._load()
+
+    def _load(self):
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"started_at": datetime.now().isoformat(timespec="seconds"), "cities": {}}
+
+    def _write_manifest(self):
+        tmp = self.manifest_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp, self.manifest_path)
+
+    def completed(self):
+        """Cities whose chunk is on disk."""
+        return {
+            city for city, entry in self.manifest["cities"].items()
+            if (self.directory / entry["file"]).exists()
+        }
+
+    def city_counts(self):
+        return {city: entry["rows"] for city, entry in self.manifest["cities"].items()}
+
+    def save_city(self, city, listings, complete=True):
+        """
+        Write one city's listings as a chunk, then mark the city done.
+
+        complete=False records that the crawl stopped before the end of the
+        city's results (see ListingIndex.should_stop).
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        name = _chunk_name(city)
+        tmp = self.directory / (name + ".tmp")
+        with open(tmp, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(listings)
+        os.replace(tmp, self.directory / name)
+
+        self.manifest["cities"][city] = {
+            "file": name,
+            "rows": len(listings),
+            "complete": complete,
+            "finished_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        self._write_manifest()
+
+    def is_complete(self, city):
+        return self.manifest["cities"][city].get("complete", True)
+
+    def rows(self, city):
+        """Stream one completed city's rows from its chunk."""
+        with open(self.directory / self.manifest["cities"][city]["file"], newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+
+    def merge(self, output_path, cities=None):
+        """
+        Stream every completed chunk into output_path, dropping repeated links.
+
+        Listings without a link are always kept. Returns the rows written.
+        """
+        cities = [city for city in (cities or self.manifest["cities"]) if city in self.completed()]
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        seen_links = set()
+        rows = 0
+
+        with open(output_path, "w", newline="", encoding="utf-8") as out:
+            writer = csv.DictWriter(out, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            for city in cities:
+                for row in self.rows(city):
+                    link = row.get("link")
+                    if link:
+                        if link in seen_links:
+                            continue
+                        seen_links.add(link)
+                    writer.writerow(row)
+                    rows += 1
+        return rows
+
+    def clear(self):
+        """Remove all chunks and the manifest (after a successful merge)."""
+        if self.directory.exists():
+            shutil.rmtree(self.directory)
+        self.manifest = self._load()
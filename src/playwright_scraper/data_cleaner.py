@@ -1,16 +1,158 @@
-import pandas as pd
+"""
+Cleaning stage between the raw scrape and process_csv.
+
+Every step is a vectorized pass over the whole frame (Arrow strings for the
+text columns), and rows are dropped here so aggregates, the analysis store
+and the vector index downstream never see them:
+
+- city names are normalized to the scraper's slugs (CITY_SPELLINGS):
+  "Bangalore" and "bengaluru" are one city, "Greater Noida" stays its own
+- listings without a plausible total price, area or price per sqft (unit
+  errors such as a price in lakhs read as rupees) are dropped
+- duplicates on normalized (location, city, price, area) are dropped
+- price per sqft outliers are dropped per city, by robust z-score
+  (median / MAD of log price per sqft)
+
+Each run writes a compact validation report (REPORT_PATH) with the rows
+dropped by each step.
+"""
+
+import json
+import os
+from datetime import datetime
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
+
+from src.Parameters.parsers import city_slug_column
+
+REPORT_PATH = "data/outputs/cleaning_report.json"
+PRICE_RANGE = (1e5, 1e10)      # INR: ₹1 Lac to ₹1000 Cr
+AREA_RANGE = (100, 100_000)    # sqft
+PER_SQFT_RANGE = (500, 250_000)  # INR per sqft, scraped or total / area
+Z_LIMIT = 3.5                  # |robust z| above this is an outlier
+MIN_CITY_LISTINGS = 20         # Smaller cities are not screened: their MAD is too noisy
+NUMERIC_COLUMNS = ["price_total_inr", "price_per_sqft", "area_sqft"]
+
+
+def _text_key(values):
+    # Lowercase words only, so "Lodha  Palava," and "lodha palava" compare equal
+    words = values.astype("string[pyarrow]").str.lower().str.replace(r"[^a-z0-9]+", " ", regex=True)
+    return words.str.strip()
+
+
+def robust_z_scores(values, groups, min_count=MIN_CITY_LISTINGS):
+    """
+    0.6745 * (x - median) / MAD of values within each group.
+
+    NaN for missing values and for groups with fewer than min_count values
+    or no spread (MAD of 0).
+    """
+    grouped = values.groupby(groups)
+    median = grouped.transform("median")
+    deviation = (values - median).abs()
+    mad = deviation.groupby(groups).transform("median")
+    count = grouped.transform("count")
+    usable = (count >= min_count) & (mad > 0)
+    return (0.6745 * (values - median) / mad).where(usable)
+
+
+def clean_listings(df, drop_empty_location=False, drop_outliers=True):
+    """
+    Clean a raw scrape.
+
+    Returns:
+        (cleaned DataFrame with the same columns, validation report dict)
+    """
+    if "location" not in df.columns:
+        raise ValueError("Column 'location' not found in CSV")
+    df = df.reset_index(drop=True)
+    rows_in = len(df)
+    for column in NUMERIC_COLUMNS:
+        df[column] = pd.to_numeric(df[column], errors="coerce")
+
+    raw_cities = df["city"].astype("string[pyarrow]").str.strip()
+    slugs = city_slug_column(df["city"])
+    renamed = raw_cities.ne(slugs).fillna(False).to_numpy(dtype=bool)
+    cities_renamed = dict(sorted(set(zip(raw_cities[renamed].to_numpy(), slugs[renamed].to_numpy()))))
+    df["city"] = slugs.astype(object)
+    location_key = _text_key(df["location"]).fillna("")
+
+    dropped = {}
+
+    def drop(name, mask):
+        nonlocal df
+        mask = np.asarray(mask, dtype=bool)
+        dropped[name] = int(mask.sum())
+        df = df[~mask]
+
+    if drop_empty_location:
+        drop("empty_location", location_key.eq("").to_numpy(dtype=bool))
+    drop("no_city", df["city"].isna())
+
+    drop("invalid_price", ~df["price_total_inr"].between(*PRICE_RANGE))
+    area = df["area_sqft"]
+    drop("invalid_area", area.notna() & ~area.between(*AREA_RANGE))
+
+    key = pd.DataFrame({
+        "location": location_key[df.index],
+        "city": df["city"],
+        "price": df["price_total_inr"].round(),
+        "area": df["area_sqft"].round(),
+    })
+    drop("duplicates", key.duplicated())
+
+    # Scraped price per sqft, else total / area
+    per_sqft = df["price_per_sqft"].where(df["price_per_sqft"] > 0, df["price_total_inr"] / df["area_sqft"])
+    invalid = per_sqft.notna() & ~per_sqft.between(*PER_SQFT_RANGE)
+    drop("invalid_price_per_sqft", invalid)
+    per_sqft = per_sqft[~invalid.to_numpy()]
+    z = robust_z_scores(np.log(per_sqft), df["city"])
+    outliers = (z.abs() > Z_LIMIT).to_numpy(dtype=bool)
+    outliers_by_city = df.loc[outliers, "city"].value_counts().sort_index()
+    if drop_outliers:
+        drop("outliers", outliers)
+
+    df = df.reset_index(drop=True)
+    report = {
+        "at": datetime.now().isoformat(timespec="seconds"),
+        "rows_in": rows_in,
+        "rows_out": len(df),
+        "dropped": dropped,
+        "outliers": int(outliers.sum()),
+        "outliers_by_city": {city: int(n) for city, n in outliers_by_city.items()},
+        "cities": int(df["city"].nunique()),
+        "cities_renamed": cities_renamed,
+        "missing": {column: round(float(df[column].isna().mean()), 3) if len(df) else None
+                    for column in ["location", *NUMERIC_COLUMNS]},
+    }
+    return df, report
+
+
+def write_report(report, path=REPORT_PATH):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    os.replace(tmp, path)
+
+
 def clean_location_csv(
     input_csv="data/outputs/magicbricks_india_properties.csv",
     output_csv="data/outputs/magicbricks_india_properties_cleaned.csv",
-    drop_empty_location = False
+    drop_empty_location = False,
+    drop_outliers=True,
+    report_path=REPORT_PATH
 ):
     """
-    Cleans the scraped CSV file.
+    Cleans the scraped CSV file (see clean_listings).
 
     - Removes rows with empty / null location (optional)
-    - Saves a new cleaned CSV (does NOT overwrite raw data)
+    - Normalizes cities, drops implausible, duplicate and outlier listings
+    - Saves a new cleaned CSV (does NOT overwrite raw data) and the
+      validation report (report_path=None skips it)
 
     Returns:
     - Cleaned pandas DataFrame
@@ -19,22 +161,19 @@ def clean_location_csv(
     input_csv = Path(input_csv)
     output_csv = Path(output_csv)
 
-    df = pd.read_csv(input_csv)
-    before_rows = len(df)
-
-    if drop_empty_location:
-        if "location" not in df.columns:
-            raise ValueError("Column 'location' not found in CSV")
-
-        df = df.dropna(subset=["location"])
-        df = df[df["location"].str.strip() != ""]
-
-    after_rows = len(df)
+    df = pd.read_csv(input_csv, engine="pyarrow")
+    df, report = clean_listings(df, drop_empty_location, drop_outliers)
+    report["input"] = str(input_csv)
 
     output_csv.parent.mkdir(parents=True, exist_ok=True)
     df.to_csv(output_csv, index=False)
+    if report_path:
+        write_report(report, report_path)
 
-    print(f"[Cleaner] Rows before: {before_rows}")
-    print(f"[Cleaner] Rows after : {after_rows}")
+    print(f"[Cleaner] Rows before: {report['rows_in']}")
+    print(f"[Cleaner] Rows after : {report['rows_out']}")
+    print(f"[Cleaner] Dropped    : " + ", ".join(f"{name} {n}" for name, n in report["dropped"].items()))
+    if report["cities_renamed"]:
+        print(f"[Cleaner] Cities renamed: {report['cities_renamed']}")
     print(f"[Cleaner] Saved cleaned file → {output_csv}")
-
+    return df
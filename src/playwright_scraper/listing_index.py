@@ -0,0 +1,163 @@
+"""
+Persistent index of scraped listings, for incremental crawls.
+
+Every listing seen is stored by link with a hash of its content. During a
+crawl, should_stop() tells the scrapers to stop paginating a city once they
+hit UNCHANGED_RUN consecutive listings that are already indexed and
+unchanged. That only means the rest of the city is known when results come
+newest first, so the scrapers use it only when run with incremental=True.
+
+apply() folds one city's scraped rows into the index and returns the
+change events; write_changes() writes them for downstream stages:
+
+    {"op": "insert", "link": ..., "city": ..., "listing": {...}}
+    {"op": "update", "link": ..., "city": ..., "listing": {...}}
+    {"op": "delete", "link": ..., "city": ...}
+
+Deletes are only detected for cities crawled to the end; a city whose
+crawl stopped early keeps its unseen listings. Listings without a link
+cannot be tracked and are left out of the index; write_snapshot() writes
+this run's ones alongside the indexed listings.
+"""
+
+import csv
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+from checkpoint import CSV_FIELDS
+
+INDEX_PATH = "data/outputs/listing_index.json"
+CHANGES_PATH = "data/outputs/listing_changes.jsonl"
+UNCHANGED_RUN = 20  # Consecutive known, unchanged listings that end a city
+
+# Fields whose change makes a listing an update (link is the key)
+CONTENT_FIELDS = [field for field in CSV_FIELDS if field != "link"]
+
+
+def _cell(value):
+    # Values as the CSV writer stores them, so scraped and re-read rows hash alike
+    return "" if value is None else str(value)
+
+
+def listing_hash(listing):
+    content = "\x1f".join(_cell(listing.get(field)) for field in CONTENT_FIELDS)
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+class ListingIndex:
+    """Seen listings by link: content hash, city, first/last seen and the row."""
+
+    def __init__(self, path=INDEX_PATH):
+        self.path = Path(path)
+        self.listings = self._load()
+        self.stopped = set()  # Cities whose crawl stopped early this run
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)["listings"]
+        except (OSError, ValueError, KeyError):
+            return {}
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"updated_at": datetime.now().isoformat(timespec="seconds"), "listings": self.listings}, f)
+        os.replace(tmp, self.path)
+
+    def is_known(self, listing):
+        """Listing is indexed and its content has not changed."""
+        entry = self.listings.get(listing.get("link"))
+        return entry is not None and entry["hash"] == listing_hash(listing)
+
+    def should_stop(self, city, listings):
+        """
+        Whether a city's crawl can stop: listings (in page order) contain a
+        run of UNCHANGED_RUN known, unchanged listings.
+        """
+        run = 0
+        for listing in listings:
+            run = run + 1 if self.is_known(listing) else 0
+            if run >= UNCHANGED_RUN:
+                self.stopped.add(city)
+                return True
+        return False
+
+    def apply(self, city, rows, complete=True):
+        """
+        Fold one city's scraped rows into the index.
+
+        complete: the city was crawled to the end, so indexed listings of the
+                  city that were not seen are deleted
+
+        Returns:
+            List of change events (insert, update, delete)
+        """
+        now = datetime.now().isoformat(timespec="seconds")
+        events, seen = [], set()
+        for row in rows:
+            link = row.get("link")
+            if not link or link in seen:
+                continue
+            seen.add(link)
+            row = {field: _cell(row.get(field)) for field in CSV_FIELDS}
+            digest = listing_hash(row)
+            entry = self.listings.get(link)
+            if entry is None or entry["hash"] != digest:
+                events.append({"op": "insert" if entry is None else "update", "link": link, "city": city,
+                               "listing": row})
+                self.listings[link] = {
+                    "hash": digest, "city": city, "row": row,
+                    "first_seen": entry["first_seen"] if entry else now, "last_seen": now,
+                }
+            else:
+                entry["last_seen"] = now
+
+        if complete:
+            for link in [link for link, entry in self.listings.items() if entry["city"] == city and link not in seen]:
+                del self.listings[link]
+                events.append({"op": "delete", "link": link, "city": city})
+        return events
+
+    def write_snapshot(self, output_path, cities=None, unlinked=()):
+        """
+        Write every indexed listing (current market state) as the raw CSV.
+
+        unlinked: this run's scraped rows without a link, which apply()
+                  cannot index; written with their city's listings
+
+        Returns:
+            Rows written
+        """
+        order = {city: i for i, city in enumerate(cities or [])}
+        rows = [(entry["city"], entry["row"]) for entry in self.listings.values()]
+        rows += [(row.get("city"), {field: _cell(row.get(field)) for field in CSV_FIELDS}) for row in unlinked]
+        rows.sort(key=lambda item: order.get(item[0], len(order)))
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            writer.writerows(row for _, row in rows)
+        return len(rows)
+
+
+def write_changes(events, path=CHANGES_PATH):
+    """Write this run's change events as JSON lines (replacing the previous run's)."""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        for event in events:
+            f.write(json.dumps(event) + "\n")
+    os.replace(tmp, path)
+
+
+def read_changes(path=CHANGES_PATH):
+    # Change events from the last crawl, for downstream stages
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
@@ -1,68 +1,109 @@
 import csv
 import time
-import re
-import logging
 import sys
-from pathlib import Path
 from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlsplit
 from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
-from data_cleaner import clean_location_csv
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('logs/scraper.logs'),
-        logging.StreamHandler()
-    ]
+# Configuration, card parsing and the crawl flow are Playwright-free (shared with the HTTP scraper)
+from scraper_common import (
+    CITIES, SELECTORS, MAX_RETRIES, RETRY_DELAY, CrawlCheckpoint, CSV_FIELDS, ListingIndex, MetricsRecorder,
+    build_city_url, listing_from_card, parse_cards, parse_price_text, parse_area, parse_bedrooms, delete_csv_file,
+    finish_crawl, logger
 )
-logger = logging.getLogger(__name__)
-
-# Configuration
-CITIES = [
-    "mumbai", "thane", "navi-mumbai", "pune", "new-delhi", "noida", "gurgaon", 
-    "jaipur", "udaipur", "ahmedabad", "surat", "vadodara", "indore", "bhopal", 
-    "lucknow", "kanpur", "patna", "gaya", "kolkata", "howrah", "bhubaneswar", 
-    "cuttack", "ranchi", "jamshedpur", "raipur", "bilaspur", "nagpur", "nashik", 
-    "aurangabad", "bengaluru", "mysore", "chennai", "coimbatore", "hyderabad", 
-    "warangal", "kochi", "trivandrum", "thrissur", "kottayam"
-]
-
-# CSS Selectors with fallbacks
-SELECTORS = {
-    'card': ['div.mb-srp__card', 'div[data-property-card]'],
-    'title': ['a.mb-srp__card--title', 'a.property-title'],
-    'price': ['div.mb-srp__card__price', 'span.property-price'],
-    'area': ['div.mb-srp__card__summary--value', 'span.property-area'],
-    'location': ['div.mb-srp__card__society', 'div.property-location']
-}
-
-MAX_RETRIES = 3
-RETRY_DELAY = 5  # seconds
+
+# Card fields read in the page; each list is tried in order like SELECTORS
+CARD_FIELDS = {field: SELECTORS[field] for field in ('title', 'price', 'area', 'location')}
+
+# Raw texts of every card in one call (one IPC round trip per page, not ~13 per card)
+EXTRACT_CARDS_JS = """
+(cards, fields) => cards.map(card => {
+    const pick = (selectors) => {
+        for (const selector of selectors) {
+            const el = card.querySelector(selector);
+            if (el) return el;
+        }
+        return null;
+    };
+    const text = (el) => el ? el.innerText.trim() : null;
+    const title = pick(fields.title);
+    return {
+        title: text(title),
+        href: title ? title.getAttribute('href') : null,
+        price: text(pick(fields.price)),
+        area: text(pick(fields.area)),
+        location: text(pick(fields.location)),
+    };
+})
+"""
+
+# Lightweight mode: resource types never downloaded (third-party hosts are blocked too)
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+
 PAGE_LOAD_TIMEOUT = 60000  # ms
+MAX_SCROLLS = 20
 PAGINATION_THRESHOLD = 20  # Stop if listings aren't increasing
 
 
-def build_city_url(city_slug, bedroom_filter="2,3"):
-    """
-    Build MagicBricks URL with configurable filters.
-    
-    Args:
-        city_slug: City name
-        bedroom_filter: Comma-separated bedroom counts (default: "2,3")
-    """
-    return (
-        "https://www.magicbricks.com/property-for-sale/"
-        "residential-real-estate?"
-        f"bedroom={bedroom_filter}&"
-        "proptype=Multistorey-Apartment,Builder-Floor-Apartment,"
-        "Penthouse,Studio-Apartment,Residential-House,Villa&"
-        f"cityName={city_slug}"
-    )
+class PageStats:
+    """Requests, blocked requests, bytes received and elapsed time for one page load."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.requests = 0
+        self.blocked = 0
+        self.bytes = 0
+        self.started = time.perf_counter()
+
+    def record(self, sizes):
+        # sizes: Request.sizes() of a finished request
+        self.requests += 1
+        self.bytes += max(sizes.get("responseBodySize", 0), 0) + max(sizes.get("responseHeadersSize", 0), 0)
+
+    def summary(self):
+        return {
+            "requests": self.requests,
+            "blocked": self.blocked,
+            "kb": round(self.bytes / 1024, 1),
+            "seconds": round(time.perf_counter() - self.started, 2),
+        }
+
+
+def first_party_hosts(url):
+    """Hosts treated as first party for url (the site and its subdomains)."""
+    host = urlsplit(url).hostname or ""
+    return (host[4:] if host.startswith("www.") else host,)
+
+
+def should_block(resource_type, url, first_party):
+    """Lightweight mode: block heavy resource types and any third-party host."""
+    if resource_type in BLOCKED_RESOURCE_TYPES:
+        return True
+    host = urlsplit(url).hostname or ""
+    return not any(host == allowed or host.endswith("." + allowed) for allowed in first_party)
+
+
+def track_page_usage(page, stats):
+    """Count every finished request of page (and its bytes) into stats."""
+    page.on("requestfinished", lambda request: stats.record(request.sizes()))
+
+
+def block_resources(page, first_party, stats):
+    """Lightweight mode: abort requests matched by should_block, counting them in stats."""
+    def handle(route):
+        request = route.request
+        if should_block(request.resource_type, request.url, first_party):
+            stats.blocked += 1
+            route.abort()
+        else:
+            route.continue_()
+
+    page.route("**/*", handle)
 
 
 def wait_for_element(page, selectors, timeout=10000):
@@ -86,13 +127,15 @@ def wait_for_element(page, selectors, timeout=10000):
     return None
 
 
-def smart_scroll(page, max_scrolls=20):
+def smart_scroll(page, max_scrolls=MAX_SCROLLS, stop=None):
     """
     Intelligently scroll to load all dynamic content.
     
     Args:
         page: Playwright page object
         max_scrolls: Maximum scroll attempts
+        stop: Optional callable checked after each scroll; True ends scrolling
+              (incremental crawls stop once the loaded listings are known)
     
     Returns:
         Number of actual scrolls performed
@@ -113,6 +156,10 @@ def smart_scroll(page, max_scrolls=20):
         
         previous_height = new_height
         scrolls += 1
+
+        if stop is not None and stop():
+            logger.info(f"Reached already-scraped listings after {scrolls} scrolls")
+            return scrolls
     
     logger.warning(f"Max scrolls ({max_scrolls}) reached, may not have all content")
     return scrolls
@@ -127,98 +174,6 @@ def safe_text(el):
         return None
 
 
-def parse_price(price_text):
-    """
-    Parse price text and return (total_price_inr, price_per_sqft).
-    Handles: "₹ 2.5 Cr", "45 Lac", "₹ 2,500 per sqft"
-    """
-    if not price_text:
-        return None, None
-
-    total_price = None
-    price_psf = None
-
-    # Handle Crores
-    cr_match = re.search(r'([\d.]+)\s*Cr', price_text, re.IGNORECASE)
-    if cr_match:
-        try:
-            total_price = float(cr_match.group(1)) * 1e7
-        except ValueError:
-            logger.warning(f"Failed to parse Cr price: {price_text}")
-
-    # Handle Lacs (if Cr not found)
-    if not total_price:
-        lac_match = re.search(r'([\d.]+)\s*Lac', price_text, re.IGNORECASE)
-        if lac_match:
-            try:
-                total_price = float(lac_match.group(1)) * 1e5
-            except ValueError:
-                logger.warning(f"Failed to parse Lac price: {price_text}")
-
-    # Handle per sqft price
-    psf_match = re.search(r'₹\s*([\d,]+)\s*(?:per\s*)?sqft', price_text, re.IGNORECASE)
-    if psf_match:
-        try:
-            price_psf = int(psf_match.group(1).replace(",", ""))
-        except ValueError:
-            logger.warning(f"Failed to parse per sqft price: {price_text}")
-
-    return total_price, price_psf
-
-
-def parse_area(area_text):
-    """
-    Convert area to sqft. Handles: "1500 sqft", "450 sqyrd", "200 sqm"
-    """
-    if not area_text:
-        return None
-
-    match = re.search(r'([\d.]+)\s*(sqft|sqyrd|sqm)', area_text.lower())
-    if not match:
-        return None
-
-    try:
-        value = float(match.group(1))
-        unit = match.group(2).lower()
-
-        if unit == "sqft":
-            return value
-        elif unit == "sqyrd":
-            return value * 9
-        elif unit == "sqm":
-            return value * 10.7639
-    except ValueError:
-        logger.warning(f"Failed to parse area: {area_text}")
-
-    return None
-
-
-def parse_bedrooms(title_text):
-    """
-    Extract number of bedrooms from title.
-    Handles: "2 BHK", "3BHK", "Studio", "1 RK"
-    """
-    if not title_text:
-        return None
-
-    # Special cases
-    if "studio" in title_text.lower():
-        return 0
-    
-    if "1 rk" in title_text.lower() or "1rk" in title_text.lower():
-        return 1
-
-    # Standard BHK parsing
-    try:
-        match = re.search(r'(\d+)\s*(?:bhk|bhk)', title_text, re.IGNORECASE)
-        if match:
-            return int(match.group(1))
-    except (ValueError, AttributeError):
-        pass
-
-    return None
-
-
 def scrape_listing(card, city_name):
     """
     Extract data from a single property card.
@@ -276,7 +231,7 @@ def scrape_listing(card, city_name):
         bedrooms = parse_bedrooms(title_text)
 
         # Parse price
-        price_total, price_psf = parse_price(price_raw)
+        price_total, price_psf = parse_price_text(price_raw)
 
         # Parse area
         area_sqft = parse_area(area_raw)
@@ -298,7 +253,23 @@ def scrape_listing(card, city_name):
         return None
 
 
-def scrape_city(page, city, max_listings=None):
+def extract_cards(page, max_listings=None):
+    """
+    Raw texts of every card on the page via a single eval_on_selector_all.
+
+    Returns:
+        List of dicts with title, href, price, area and location (None if missing)
+    """
+    raw_cards = []
+    for selector in SELECTORS['card']:
+        raw_cards = page.eval_on_selector_all(selector, EXTRACT_CARDS_JS, CARD_FIELDS)
+        if raw_cards:
+            break
+    return raw_cards[:max_listings] if max_listings else raw_cards
+
+
+def scrape_city(page, city, max_listings=None, stats=None, lightweight=False, stop=None, metrics=None,
+                truncated=None):
     """
     Scrape all listings for a single city.
     
@@ -306,45 +277,73 @@ def scrape_city(page, city, max_listings=None):
         page: Playwright page object
         city: City name
         max_listings: Maximum listings to scrape (None = all)
+        stats: PageStats tracking page (see track_page_usage); usage is
+               reset and logged per city
+        lightweight: Page blocks heavy resources (see block_resources), so
+                     only wait for DOMContentLoaded and the cards
+        stop: Optional callable(city, listings) telling when the listings
+              loaded so far are enough (see ListingIndex.should_stop)
+        metrics: Optional MetricsRecorder; the city's load time, scrolls,
+                 cards, parse failures, retries and bytes are recorded
+        truncated: Optional set; the city is added when the crawl ended
+                   before the last listing (max_listings or MAX_SCROLLS hit)
     
     Returns:
         List of property dictionaries
     """
     listings = []
     attempt = 0
+    started = time.perf_counter()
     
     while attempt < MAX_RETRIES:
         try:
             url = build_city_url(city)
             logger.info(f"Loading {city} (attempt {attempt + 1}/{MAX_RETRIES}): {url}")
             
-            page.goto(url, wait_until="networkidle", timeout=PAGE_LOAD_TIMEOUT)
+            if stats is not None:
+                stats.reset()
+            load_started = time.perf_counter()
+            page.goto(url, wait_until="domcontentloaded" if lightweight else "networkidle",
+                      timeout=PAGE_LOAD_TIMEOUT)
             
             # Wait for cards to appear
             page.wait_for_selector("div.mb-srp__card", timeout=15000)
-            time.sleep(2)
+            load_seconds = time.perf_counter() - load_started
+            if not lightweight:
+                time.sleep(2)
             
-            # Smart scroll to load all content
-            smart_scroll(page, max_scrolls=20)
+            # Smart scroll to load all content (or until stop says the rest is known)
+            stopped = False
+
+            def check():
+                nonlocal stopped
+                stopped = stop(city, parse_cards(extract_cards(page), city))
+                return stopped
+
+            scrolls = smart_scroll(page, max_scrolls=MAX_SCROLLS, stop=check if stop else None)
             
-            # Get all cards
-            cards = page.query_selector_all("div.mb-srp__card")
+            # Extract every card in one round trip, then parse the batch
+            cards = extract_cards(page)
             logger.info(f"Found {len(cards)} total listings in {city}")
-            
-            if max_listings:
-                cards = cards[:max_listings]
-            
-            # Scrape each card
-            successful = 0
-            for idx, card in enumerate(cards):
-                listing = scrape_listing(card, city)
-                if listing and listing.get('price_total_inr') or listing.get('area_sqft'):
-                    listings.append(listing)
-                    successful += 1
-                else:
-                    logger.debug(f"Skipped incomplete listing {idx + 1}/{len(cards)}")
-            
-            logger.info(f"Successfully scraped {successful}/{len(cards)} listings from {city}")
+            # Cut short by the cap or the scroll limit, not at the end of the results
+            capped = bool(max_listings) and len(cards) > max_listings
+            incomplete = not stopped and (scrolls >= MAX_SCROLLS or capped)
+            cards = cards[:max_listings] if max_listings else cards
+            if incomplete and truncated is not None:
+                truncated.add(city)
+
+            listings = parse_cards(cards, city)
+            logger.info(f"Successfully scraped {len(listings)}/{len(cards)} listings from {city}")
+            usage = stats.summary() if stats is not None else {}
+            if usage:
+                logger.info(f"{city}: {usage['kb']} KB in {usage['seconds']}s "
+                            f"({usage['requests']} requests, {usage['blocked']} blocked)")
+            if metrics is not None:
+                status = "stopped early" if stopped else "incomplete" if incomplete else "ok"
+                metrics.record(city, status=status, attempts=attempt + 1,
+                               load_seconds=load_seconds, scrolls=scrolls, cards=len(cards), listings=listings,
+                               requests=usage.get("requests"), kb=usage.get("kb"),
+                               seconds=time.perf_counter() - started)
             return listings
             
         except PlaywrightTimeoutError:
@@ -359,6 +358,8 @@ def scrape_city(page, city, max_listings=None):
                 time.sleep(RETRY_DELAY)
     
     logger.error(f"Failed to scrape {city} after {MAX_RETRIES} attempts")
+    if metrics is not None:
+        metrics.record(city, status="failed", attempts=MAX_RETRIES, seconds=time.perf_counter() - started)
     return listings
 
 
@@ -370,14 +371,9 @@ def save_to_csv(results, output_path):
     
     Path(output_path).parent.mkdir(parents=True, exist_ok=True)
     
-    fieldnames = [
-        "title", "location", "city", "price_total_inr", 
-        "price_per_sqft", "area_sqft", "bedrooms", "bathrooms", "link"
-    ]
-    
     try:
         with open(output_path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
             writer.writeheader()
             writer.writerows(results)
         logger.info(f"Saved {len(results)} listings to {output_path}")
@@ -385,21 +381,25 @@ def save_to_csv(results, output_path):
         logger.error(f"Failed to save CSV: {e}")
 
 
-def delete_csv_file(file_path):
-    """Delete a CSV file if it exists."""
-    file_path = Path(file_path)
-    if file_path.exists():
-        file_path.unlink()
-        logger.info(f"Deleted file: {file_path}")
-
-
-def run(headless=True, max_listings_per_city=None):
+def run(headless=True, max_listings_per_city=None, lightweight=True, resume=True, incremental=False):
     """
     Main scraper function.
     
+    Each finished city is checkpointed to disk, so an interrupted crawl
+    picks up where it stopped on the next call. Scraped listings are
+    tracked in a ListingIndex and only the changes are emitted. Per-city
+    metrics go to data/outputs/scraper_metrics.jsonl.
+
     Args:
         headless: Run browser in headless mode (faster)
         max_listings_per_city: Limit listings per city (None = all)
+        lightweight: Block images, media, fonts and third-party hosts
+        resume: Skip cities completed by a previous interrupted run
+                (False discards the checkpoint and starts over)
+        incremental: Stop each city at a run of known, unchanged listings.
+                     Off by default: this assumes newest-first results, and
+                     build_city_url does not sort by posting date. False
+                     crawls every city to the end (and detects deletes)
     """
     start_time = datetime.now()
     logger.info("=" * 50)
@@ -408,8 +408,17 @@ def run(headless=True, max_listings_per_city=None):
     logger.info(f"Max listings per city: {max_listings_per_city or 'All'}")
     logger.info("=" * 50)
     
-    all_results = []
-    city_stats = {}
+    checkpoint = CrawlCheckpoint()
+    if not resume:
+        checkpoint.clear()
+    done = checkpoint.completed()
+    pending = [city for city in CITIES if city not in done]
+    if done:
+        logger.info(f"Resuming crawl: {len(done)} cities already done, {len(pending)} to go")
+    index = ListingIndex()
+    stop = index.should_stop if incremental else None
+    metrics = MetricsRecorder("sync")
+    truncated = set()
 
     with sync_playwright() as p:
         browser = p.chromium.launch(
@@ -427,43 +436,26 @@ def run(headless=True, max_listings_per_city=None):
         )
 
         page = context.new_page()
+        stats = PageStats()
+        track_page_usage(page, stats)
+        if lightweight:
+            block_resources(page, first_party_hosts(build_city_url(CITIES[0])), stats)
 
-        for idx, city in enumerate(CITIES, 1):
-            logger.info(f"\n[{idx}/{len(CITIES)}] Processing {city}")
+        for idx, city in enumerate(pending, 1):
+            logger.info(f"\n[{idx}/{len(pending)}] Processing {city}")
             
-            results = scrape_city(page, city, max_listings=max_listings_per_city)
-            all_results.extend(results)
-            city_stats[city] = len(results)
+            results = scrape_city(page, city, max_listings=max_listings_per_city, stats=stats,
+                                  lightweight=lightweight, stop=stop, metrics=metrics, truncated=truncated)
+            # Cities that came back empty are retried on the next resume
+            if results:
+                complete = city not in index.stopped and city not in truncated
+                checkpoint.save_city(city, results, complete=complete)
             
             time.sleep(3)  # Rate limiting between cities
 
         browser.close()
 
-    # Save results
-    output_path = "data/outputs/magicbricks_india_properties.csv"
-    save_to_csv(all_results, output_path)
-
-    # Clean data
-    logger.info("Cleaning location data...")
-    clean_location_csv(
-        input_csv=output_path,
-        output_csv="data/outputs/magicbricks_india_properties_cleaned.csv",
-        drop_empty_location=True
-    )
-    delete_csv_file(output_path)
-
-    # Summary
-    elapsed = (datetime.now() - start_time).total_seconds()
-    logger.info("\n" + "=" * 50)
-    logger.info("SCRAPING SUMMARY")
-    logger.info("=" * 50)
-    logger.info(f"Total listings scraped: {len(all_results)}")
-    logger.info(f"Time elapsed: {elapsed:.1f} seconds ({elapsed/60:.1f} minutes)")
-    logger.info(f"Average per city: {len(all_results)/len(CITIES):.1f}")
-    logger.info("\nListings per city:")
-    for city, count in sorted(city_stats.items(), key=lambda x: x[1], reverse=True):
-        logger.info(f"  {city}: {count}")
-    logger.info("=" * 50)
+    finish_crawl(checkpoint, start_time, index, metrics)
 
 
 if __name__ == "__main__":
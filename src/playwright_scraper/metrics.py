@@ -0,0 +1,178 @@
+"""
+Per-city scraper metrics and the run health report.
+
+Each scraper records one JSON line per city and run in METRICS_PATH:
+
+    {"run_id", "scraper", "city", "status", "attempts", "load_seconds",
+     "scrolls", "pages", "cards", "listings", "parse_failure_rate",
+     "missing", "requests", "kb", "seconds", "listings_per_sec", "at"}
+
+status is ok, failed, stopped early (incremental crawl), incomplete (the
+crawl ended before the last page, e.g. on a failed page fetch) or needs js
+(HTTP scraper). parse_failure_rate is the share of cards dropped by
+parse_cards; missing is the share of parsed listings without each key
+field, which is how a broken selector shows up.
+
+summarize() compares a run with the previous record of each city and flags
+cities whose yield dropped or latency rose, plus likely broken selectors.
+
+Usage:
+    python src/playwright_scraper/metrics.py [run_id]
+"""
+
+import json
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+
+METRICS_PATH = "data/outputs/scraper_metrics.jsonl"
+YIELD_DROP = 0.3        # Flag a city whose listings fell by more than 30%
+LATENCY_RISE = 0.5      # Flag a city whose page load time rose by more than 50%...
+LATENCY_MIN_DELTA = 0.5  # ...and by at least this many seconds
+PARSE_FAILURE_LIMIT = 0.2
+MISSING_LIMIT = 0.5     # A field missing from most listings means a broken selector
+TRACKED_FIELDS = ("title", "location", "price_total_inr", "area_sqft", "bedrooms")
+
+
+def missing_rates(listings):
+    """Share of listings without each of TRACKED_FIELDS."""
+    if not listings:
+        return {}
+    return {
+        field: round(sum(1 for listing in listings if listing.get(field) in (None, "")) / len(listings), 3)
+        for field in TRACKED_FIELDS
+    }
+
+
+class MetricsRecorder:
+    """Appends per-city metrics of one run (thread-safe)."""
+
+    def __init__(self, scraper, path=METRICS_PATH, run_id=None):
+        self.scraper = scraper
+        self.path = Path(path)
+        self.run_id = run_id or datetime.now().isoformat(timespec="seconds")
+        self.lock = threading.Lock()
+
+    def record(self, city, status="ok", attempts=1, load_seconds=None, scrolls=None, pages=None, cards=0,
+               listings=(), requests=None, kb=None, seconds=None):
+        """Write one city's metrics; listings are the parsed listing dicts."""
+        parsed = len(listings)
+        entry = {
+            "run_id": self.run_id,
+            "scraper": self.scraper,
+            "city": city,
+            "status": status,
+            "attempts": attempts,
+            "load_seconds": None if load_seconds is None else round(load_seconds, 3),
+            "scrolls": scrolls,
+            "pages": pages,
+            "cards": cards,
+            "listings": parsed,
+            "parse_failure_rate": round(1 - parsed / cards, 3) if cards else None,
+            "missing": missing_rates(listings),
+            "requests": requests,
+            "kb": kb,
+            "seconds": None if seconds is None else round(seconds, 3),
+            "listings_per_sec": round(parsed / seconds, 1) if seconds else None,
+            "at": datetime.now().isoformat(timespec="seconds"),
+        }
+        with self.lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+        return entry
+
+
+def read_metrics(path=METRICS_PATH):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except OSError:
+        return []
+
+
+def _rise(current, previous):
+    if current is None or not previous:
+        return None
+    return (current - previous) / previous
+
+
+def summarize(path=METRICS_PATH, run_id=None):
+    """
+    Totals for one run (default: the latest) and its flagged cities.
+
+    Returns:
+        {"run_id", "cities", "listings", "failed", "listings_per_sec",
+         "flags": [{"city", "issue", "current", "previous"}]}
+    """
+    records = read_metrics(path)
+    if not records:
+        return {"run_id": None, "cities": 0, "listings": 0, "failed": [], "listings_per_sec": None, "flags": []}
+    run_id = run_id or records[-1]["run_id"]
+    current = [r for r in records if r["run_id"] == run_id]
+    # Per scraper: a city's HTTP and Playwright records are not comparable
+    previous = {}
+    for r in records:
+        if r["run_id"] < run_id and r["status"] in ("ok", "stopped early"):
+            previous[r["scraper"], r["city"]] = r
+
+    flags = []
+    for r in current:
+        city, before = r["city"], previous.get((r["scraper"], r["city"]))
+        if r["status"] == "failed":
+            flags.append({"city": city, "issue": "failed", "current": r["attempts"], "previous": None})
+            continue
+        if r["status"] == "incomplete":
+            flags.append({"city": city, "issue": "incomplete", "current": r["listings"],
+                          "previous": before and before["listings"]})
+        # Early-stopped crawls only load new listings, so their yield is not comparable
+        if before and r["status"] == "ok" and before["status"] == "ok":
+            if r["listings"] < before["listings"] * (1 - YIELD_DROP):
+                flags.append({"city": city, "issue": "yield dropped", "current": r["listings"],
+                              "previous": before["listings"]})
+        if before:
+            rise = _rise(r["load_seconds"], before["load_seconds"])
+            slower = rise is not None and r["load_seconds"] - before["load_seconds"] >= LATENCY_MIN_DELTA
+            if slower and rise > LATENCY_RISE:
+                flags.append({"city": city, "issue": "latency rose", "current": r["load_seconds"],
+                              "previous": before["load_seconds"]})
+        if r["parse_failure_rate"] is not None and r["parse_failure_rate"] > PARSE_FAILURE_LIMIT:
+            flags.append({"city": city, "issue": "parse failures", "current": r["parse_failure_rate"],
+                          "previous": before and before["parse_failure_rate"]})
+        for field, rate in (r.get("missing") or {}).items():
+            if rate > MISSING_LIMIT:
+                flags.append({"city": city, "issue": f"{field} missing (selector?)", "current": rate,
+                              "previous": before and (before.get("missing") or {}).get(field)})
+
+    listings = sum(r["listings"] for r in current)
+    # Wall time of the run: cities overlap in the concurrent scrapers
+    ends = [datetime.fromisoformat(r["at"]).timestamp() for r in current]
+    seconds = max(ends) - min(end - (r["seconds"] or 0) for end, r in zip(ends, current))
+    return {
+        "run_id": run_id,
+        # A city can have two records (needs js, then the Playwright fallback)
+        "cities": len({r["city"] for r in current}),
+        "listings": listings,
+        "failed": [r["city"] for r in current if r["status"] == "failed"],
+        "listings_per_sec": round(listings / seconds, 1) if seconds else None,
+        "flags": flags,
+    }
+
+
+def format_report(report):
+    """Human-readable lines for the log."""
+    lines = [
+        f"Run {report['run_id']}: {report['listings']} listings from {report['cities']} cities "
+        f"({report['listings_per_sec']} listings/sec), {len(report['failed'])} failed"
+    ]
+    if not report["flags"]:
+        lines.append("No regressions against the previous run")
+    for flag in report["flags"]:
+        previous = "" if flag["previous"] is None else f" (previous: {flag['previous']})"
+        lines.append(f"  {flag['city']}: {flag['issue']}: {flag['current']}{previous}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    print(format_report(summarize(run_id=sys.argv[1] if len(sys.argv) > 1 else None)))
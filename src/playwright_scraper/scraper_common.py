@@ -0,0 +1,177 @@
+"""
+Configuration, card parsing and the end-of-crawl flow shared by every
+MagicBricks scraper.
+
+Nothing here imports Playwright, so the HTTP scraper (and the benchmarks)
+run without a browser installed; the Playwright scrapers re-export these
+names from magicbricks_playwright_improved.
+"""
+
+import logging
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add this directory (and the repo root, for src.Parameters) to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(1, str(Path(__file__).resolve().parents[2]))
+from data_cleaner import clean_location_csv
+from checkpoint import CrawlCheckpoint, CSV_FIELDS
+from listing_index import ListingIndex, write_changes
+from metrics import MetricsRecorder, summarize, format_report
+from src.Parameters.parsers import parse_price_text, parse_area, parse_bedrooms
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    handlers=[
+        logging.FileHandler('logs/scraper.logs'),
+        logging.StreamHandler()
+    ]
+)
+logger = logging.getLogger(__name__)
+
+# Configuration
+CITIES = [
+    "mumbai", "thane", "navi-mumbai", "pune", "new-delhi", "noida", "gurgaon",
+    "jaipur", "udaipur", "ahmedabad", "surat", "vadodara", "indore", "bhopal",
+    "lucknow", "kanpur", "patna", "gaya", "kolkata", "howrah", "bhubaneswar",
+    "cuttack", "ranchi", "jamshedpur", "raipur", "bilaspur", "nagpur", "nashik",
+    "aurangabad", "bengaluru", "mysore", "chennai", "coimbatore", "hyderabad",
+    "warangal", "kochi", "trivandrum", "thrissur", "kottayam"
+]
+
+# CSS Selectors with fallbacks
+SELECTORS = {
+    'card': ['div.mb-srp__card', 'div[data-property-card]'],
+    'title': ['a.mb-srp__card--title', 'a.property-title'],
+    'price': ['div.mb-srp__card__price', 'span.property-price'],
+    'area': ['div.mb-srp__card__summary--value', 'span.property-area'],
+    'location': ['div.mb-srp__card__society', 'div.property-location']
+}
+
+MAX_RETRIES = 3
+RETRY_DELAY = 5  # seconds
+
+
+def build_city_url(city_slug, bedroom_filter="2,3"):
+    """
+    Build MagicBricks URL with configurable filters.
+
+    Args:
+        city_slug: City name
+        bedroom_filter: Comma-separated bedroom counts (default: "2,3")
+    """
+    return (
+        "https://www.magicbricks.com/property-for-sale/"
+        "residential-real-estate?"
+        f"bedroom={bedroom_filter}&"
+        "proptype=Multistorey-Apartment,Builder-Floor-Apartment,"
+        "Penthouse,Studio-Apartment,Residential-House,Villa&"
+        f"cityName={city_slug}"
+    )
+
+
+def listing_from_card(raw, city_name, base_url="https://www.magicbricks.com"):
+    """Build the scraper's listing dict from one card's raw texts."""
+    link = raw.get("href")
+    if link and not link.startswith("http"):
+        link = base_url + link
+
+    price_total, price_psf = parse_price_text(raw.get("price"))
+    return {
+        "title": raw.get("title"),
+        "location": raw.get("location"),
+        "city": city_name,
+        "price_total_inr": price_total,
+        "price_per_sqft": price_psf,
+        "area_sqft": parse_area(raw.get("area")),
+        "bedrooms": parse_bedrooms(raw.get("title")),
+        "bathrooms": None,  # Not available in current HTML
+        "link": link
+    }
+
+
+def parse_cards(raw_cards, city_name, base_url="https://www.magicbricks.com"):
+    """
+    Parse a batch of extracted cards, dropping those with neither price nor area.
+
+    Returns:
+        List of property dictionaries (same shape as scrape_listing)
+    """
+    listings = (listing_from_card(raw, city_name, base_url) for raw in raw_cards)
+    return [listing for listing in listings if listing["price_total_inr"] or listing["area_sqft"]]
+
+
+def delete_csv_file(file_path):
+    """Delete a CSV file if it exists."""
+    file_path = Path(file_path)
+    if file_path.exists():
+        file_path.unlink()
+        logger.info(f"Deleted file: {file_path}")
+
+
+def finish_crawl(checkpoint, start_time, index=None, metrics=None):
+    """
+    Merge the checkpointed cities into the raw CSV, clean it, and log a summary.
+
+    With a ListingIndex, the scraped cities are folded into the index, the
+    inserts, updates and deletes are written to listing_changes.jsonl, and
+    the raw CSV is the index's full current state (cities that stopped
+    early keep their unseen listings) plus this run's listings without a
+    link, which the index cannot track.
+
+    With a MetricsRecorder, the run's health report (regressions against
+    the previous run) is logged after the summary.
+
+    The checkpoint is removed only once the cleaned file has been written,
+    so a failure here can be retried without re-scraping.
+    """
+    output_path = "data/outputs/magicbricks_india_properties.csv"
+    city_stats = checkpoint.city_counts()
+    done = checkpoint.completed()
+    cities = [city for city in CITIES if city in done]
+    if index is None:
+        total = checkpoint.merge(output_path, cities=cities)
+        logger.info(f"Merged {total} unique listings to {output_path}")
+    else:
+        events, unlinked = [], []
+        for city in cities:
+            rows = list(checkpoint.rows(city))
+            events.extend(index.apply(city, rows, complete=checkpoint.is_complete(city)))
+            unlinked.extend(row for row in rows if not row.get("link"))
+        # Changes first: if saving the index fails, the next run re-emits them
+        write_changes(events)
+        index.save()
+        ops = [event["op"] for event in events]
+        logger.info(f"Changes: {ops.count('insert')} inserts, {ops.count('update')} updates, "
+                    f"{ops.count('delete')} deletes")
+        total = index.write_snapshot(output_path, CITIES, unlinked)
+        logger.info(f"Wrote {total} current listings to {output_path}")
+
+    # Clean data
+    logger.info("Cleaning location data...")
+    clean_location_csv(
+        input_csv=output_path,
+        output_csv="data/outputs/magicbricks_india_properties_cleaned.csv",
+        drop_empty_location=True
+    )
+    delete_csv_file(output_path)
+    checkpoint.clear()
+
+    # Summary
+    elapsed = (datetime.now() - start_time).total_seconds()
+    logger.info("\n" + "=" * 50)
+    logger.info("SCRAPING SUMMARY")
+    logger.info("=" * 50)
+    scraped = sum(city_stats.values())
+    logger.info(f"Total listings scraped: {scraped}")
+    logger.info(f"Time elapsed: {elapsed:.1f} seconds ({elapsed/60:.1f} minutes)")
+    logger.info(f"Average per city: {scraped/len(CITIES):.1f}")
+    logger.info("\nListings per city:")
+    for city, count in sorted(city_stats.items(), key=lambda x: x[1], reverse=True):
+        logger.info(f"  {city}: {count}")
+    logger.info("=" * 50)
+    if metrics is not None:
+        logger.info("\n" + format_report(summarize(metrics.path, metrics.run_id)))
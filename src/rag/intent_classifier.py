@@ -20,6 +20,8 @@ ENHANCED INTENT CLASSIFICATION:
 
 import re
 
+from src.Parameters.parsers import CITY_ALIASES
+
 INTENTS = {
     "SPECIFIC_PROPERTY": "Queries about a specific named property/project",
     "AGGREGATE": "Statistical queries (averages, counts, totals)",
@@ -352,28 +354,8 @@ def extract_cities_from_query(query: str, available_cities: list) -> list:
     q = query.lower()
     detected = []
     
-    # Normalize city name variations to match dataset
-    # Dataset cities: ahmedabad, aurangabad, bhopal, bhubaneswar, bilaspur, chennai, coimbatore, 
-    # cuttack, gaya, gurgaon, hyderabad, indore, jaipur, jamshedpur, kanpur, kochi, kolkata, 
-    # kottayam, lucknow, mumbai, mysore, nagpur, nashik, navi-mumbai, new-delhi, noida, patna, 
-    # pune, raipur, ranchi, surat, thane, thrissur, trivandrum, udaipur, vadodara
-    city_aliases = {
-        "new-delhi": ["delhi", "new delhi", "new-delhi", "ncr"],
-        "mumbai": ["mumbai", "bombay"],
-        "chennai": ["chennai", "madras"],
-        "kolkata": ["kolkata", "calcutta"],
-        "hyderabad": ["hyderabad", "hyd"],
-        "pune": ["pune", "poona"],
-        "gurgaon": ["gurgaon", "gurugram", "ggn"],
-        "noida": ["noida", "greater noida"],
-        "navi-mumbai": ["navi mumbai", "navi-mumbai", "new mumbai"],
-        "trivandrum": ["trivandrum", "thiruvananthapuram"],
-        "kochi": ["kochi", "cochin"],
-        "thrissur": ["thrissur", "trichur"],
-    }
-    
-    # Check aliases first
-    for canonical, aliases in city_aliases.items():
+    # Check aliases first (query-only: they include abbreviations and nearby areas)
+    for canonical, aliases in CITY_ALIASES.items():
         for alias in aliases:
             if alias in q:
                 # Find the actual city name in available_cities
@@ -415,3 +397,82 @@ def extract_bhk_from_query(query: str) -> int:
             return num
     
     return None
+
+
+# Phrases that name each sweepable assumption (see services.sensitivity.SENSITIVITY_PARAMS)
+SENSITIVITY_KEYWORDS = {
+    "loan_rate": ["interest rate", "loan rate", "home loan rate", "emi rate"],
+    "appreciation_rate": ["appreciation", "property value growth", "price growth"],
+    "down_payment_percent": ["down payment", "downpayment"],
+    "loan_tenure_years": ["tenure", "loan term", "loan period"],
+    "investment_return_rate": ["investment return", "market return", "equity return", "sip return"],
+}
+
+
+# Bare "rate(s)" means the loan rate ("if rates go to 9%") unless it names another rate
+GENERIC_RATE_PATTERN = r"(?<!appreciation )(?<!growth )(?<!return )(?<!tax )(?<!rental )\brates?\b"
+
+# Plausible stated values per assumption; anything else (a year, a price) is not a value
+SENSITIVITY_VALUE_RANGES = {
+    "loan_rate": (0, 30),
+    "appreciation_rate": (0, 30),
+    "down_payment_percent": (0, 100),
+    "loan_tenure_years": (1, 40),
+    "investment_return_rate": (0, 30),
+}
+
+# A number only counts as the value when it carries its unit or follows a linking word
+_LINK_WORDS = r"\b(?:to|is|at|of|be|becomes?)\s*"
+_NUMBER = r"(\d+(?:\.\d+)?)(?![\d.]|\s*(?:bhk|rk|cr|lakh|lac))"
+
+
+def _sensitivity_keyword_pattern(param: str) -> str:
+    keywords = [re.escape(kw) for kw in SENSITIVITY_KEYWORDS[param]]
+    if param == "loan_rate":
+        keywords.append(GENERIC_RATE_PATTERN)
+    return "(?:" + "|".join(keywords) + ")"
+
+
+def extract_sensitivity_params_from_query(query: str) -> list:
+    """
+    Extract assumptions a sensitivity question asks about.
+    
+    Returns:
+        list: Parameter names (see services.sensitivity.SENSITIVITY_PARAMS), may be empty
+    """
+    q = query.lower()
+    return [param for param in SENSITIVITY_KEYWORDS if re.search(_sensitivity_keyword_pattern(param), q)]
+
+
+def extract_sensitivity_values_from_query(query: str) -> dict:
+    """
+    Values the user states for the assumptions they ask about, e.g.
+    "if interest rate is 9.5%", "rates go to 9%" or "at 3% appreciation".
+    
+    A number counts only with its unit (% / percent, years for the tenure)
+    or after a linking word (to, is, at, of), and only inside
+    SENSITIVITY_VALUE_RANGES, so "interest rate rises in 2025" has no value.
+    
+    Returns:
+        dict: {parameter name: value}, only for parameters with a stated value
+    """
+    q = query.lower()
+    values = {}
+    for param in SENSITIVITY_KEYWORDS:
+        kw = _sensitivity_keyword_pattern(param)
+        unit = r"(?:years?|yrs?)" if param == "loan_tenure_years" else r"(?:%|percent)"
+        low, high = SENSITIVITY_VALUE_RANGES[param]
+        patterns = [
+            # After the keyword: "rate goes to 9", "tenure of 25 years", "rate 9.5%"
+            kw + r"[^\d?.,;]{0,25}?" + _LINK_WORDS + _NUMBER,
+            kw + r"[^\d?.,;]{0,25}?(?<!by )" + _NUMBER + r"\s*" + unit,
+            # Right before it: "3% appreciation", "20 year tenure"
+            r"(\d+(?:\.\d+)?)\s*" + unit + r"\s+(?:\w+\s+)?" + kw,
+        ]
+        for pattern in patterns:
+            found = [float(m.group(1)) for m in re.finditer(pattern, q)]
+            found = [value for value in found if low <= value <= high]
+            if found:
+                values[param] = found[0]
+                break
+    return values
@@ -13,12 +13,18 @@ NEW FEATURES:
 - Scenario Sensitivity (Conservative/Moderate/Aggressive)
 - Market Trend Signals (Overheated/Stable/Cooling)
 - Investment Context Explanations
+- Precomputed Intelligence Table (per dataset version)
+- Top-K Opportunity Index (per city / BHK, updated incrementally)
 """
 
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Any, Optional
+import copy
 import os
+import threading
+
+from src.rag.opportunity_index import OpportunityIndex
 
 CSV_PATH = "data/outputs/analyzed_properties.csv"
 
@@ -74,15 +80,25 @@ ASSUMPTIONS = {
 # DATA LOADING
 # ============================================================================
 _df = None
+_df_version = None
+
+
+def _dataset_version():
+    """Identify the dataset on disk by (mtime, size) - cheap enough to check per request."""
+    try:
+        st = os.stat(CSV_PATH)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
 
 def _get_df():
-    """Lazy load the DataFrame"""
-    global _df
-    if _df is None:
-        if os.path.exists(CSV_PATH):
-            _df = pd.read_csv(CSV_PATH)
-        else:
-            _df = pd.DataFrame()
+    """Lazy load the DataFrame, reloading when the CSV changes on disk"""
+    global _df, _df_version
+    version = _dataset_version()
+    if _df is None or version != _df_version:
+        _df = pd.read_csv(CSV_PATH) if version else pd.DataFrame()
+        _df_version = version
     return _df
 
 
@@ -107,23 +123,26 @@ def calculate_price_volatility_risk(city: str = None, location: str = None) -> D
         return {"risk_level": "unknown", "cv_percent": 0, "explanation": "No data available"}
     
     # Filter by city/location if provided
-    subset = df.copy()
+    subset = df
     if city:
         subset = subset[subset['city'].str.lower() == city.lower()]
     if location:
         subset = subset[subset['location'].str.lower().str.contains(location.lower(), na=False)]
     
-    if len(subset) < 3:
+    price_per_sqft = subset['price_per_sqft']
+    return _price_volatility_from_stats(len(subset), price_per_sqft.mean(), price_per_sqft.std())
+
+
+def _price_volatility_from_stats(count: int, mean_price: float, std_price: float) -> Dict[str, Any]:
+    """Classify price volatility from pre-aggregated price/sqft statistics."""
+    if count < 3:
         return {
             "risk_level": "unknown",
             "cv_percent": 0,
-            "explanation": f"Insufficient data (only {len(subset)} properties) to assess volatility"
+            "explanation": f"Insufficient data (only {count} properties) to assess volatility"
         }
     
-    # Calculate Coefficient of Variation for price per sqft
-    price_per_sqft = subset['price_per_sqft']
-    mean_price = price_per_sqft.mean()
-    std_price = price_per_sqft.std()
+    # Coefficient of Variation for price per sqft
     cv = (std_price / mean_price) * 100 if mean_price > 0 else 0
     
     # Determine risk level
@@ -142,7 +161,7 @@ def calculate_price_volatility_risk(city: str = None, location: str = None) -> D
         "cv_percent": round(cv, 1),
         "mean_price_per_sqft": round(mean_price, 0),
         "std_price_per_sqft": round(std_price, 0),
-        "sample_size": len(subset),
+        "sample_size": count,
         "explanation": explanation
     }
 
@@ -163,12 +182,15 @@ def calculate_liquidity_risk(city: str = None) -> Dict[str, Any]:
     if df.empty:
         return {"risk_level": "unknown", "listing_count": 0, "explanation": "No data available"}
     
-    subset = df.copy()
+    subset = df
     if city:
         subset = subset[subset['city'].str.lower() == city.lower()]
     
-    count = len(subset)
-    
+    return _liquidity_from_count(len(subset))
+
+
+def _liquidity_from_count(count: int) -> Dict[str, Any]:
+    """Classify liquidity risk from a listing count."""
     if count < 20:
         risk_level = "high"
         explanation = f"Only {count} listings in this market. Low liquidity may make it harder to sell and could affect pricing power."
@@ -203,16 +225,10 @@ def calculate_rental_stability_risk(city: str = None) -> Dict[str, Any]:
     if df.empty:
         return {"risk_level": "unknown", "explanation": "No data available"}
     
-    subset = df.copy()
+    subset = df
     if city:
         subset = subset[subset['city'].str.lower() == city.lower()]
     
-    if len(subset) < 5:
-        return {
-            "risk_level": "unknown",
-            "explanation": f"Insufficient data ({len(subset)} properties) for rental stability analysis"
-        }
-    
     # Check for estimated_rent column, otherwise derive
     if 'estimated_rent' in subset.columns:
         rents = subset['estimated_rent'].dropna()
@@ -220,11 +236,20 @@ def calculate_rental_stability_risk(city: str = None) -> Dict[str, Any]:
         # Derive from price using typical rent-to-price ratio
         rents = subset['price'] * ASSUMPTIONS['rent_to_price_ratio']
     
-    if len(rents) < 5:
+    return _rental_stability_from_stats(len(subset), len(rents), rents.mean(), rents.std())
+
+
+def _rental_stability_from_stats(count: int, rent_count: int, mean_rent: float, std_rent: float) -> Dict[str, Any]:
+    """Classify rental stability from pre-aggregated rent statistics."""
+    if count < 5:
+        return {
+            "risk_level": "unknown",
+            "explanation": f"Insufficient data ({count} properties) for rental stability analysis"
+        }
+    
+    if rent_count < 5:
         return {"risk_level": "unknown", "explanation": "Insufficient rental data"}
     
-    mean_rent = rents.mean()
-    std_rent = rents.std()
     cv = (std_rent / mean_rent) * 100 if mean_rent > 0 else 0
     
     if cv > 40:
@@ -241,7 +266,7 @@ def calculate_rental_stability_risk(city: str = None) -> Dict[str, Any]:
         "risk_level": risk_level,
         "cv_percent": round(cv, 1),
         "avg_estimated_rent": round(mean_rent, 0),
-        "sample_size": len(rents),
+        "sample_size": rent_count,
         "explanation": explanation
     }
 
@@ -250,13 +275,26 @@ def get_risk_summary(city: str = None, location: str = None) -> Dict[str, Any]:
     """
     Get comprehensive risk summary combining all risk indicators.
     
+    City-level (and whole-market) summaries are served from the precomputed
+    intelligence table; only location-filtered requests are computed live.
+    
     Returns:
         Dict with all risk indicators and overall risk assessment
     """
-    price_vol = calculate_price_volatility_risk(city, location)
-    liquidity = calculate_liquidity_risk(city)
-    rental_stability = calculate_rental_stability_risk(city)
-    
+    if location is None:
+        entry = _lookup_city_intelligence(city)
+        if entry is not None:
+            return copy.deepcopy(entry["risk"])
+    
+    return _combine_risk(
+        calculate_price_volatility_risk(city, location),
+        calculate_liquidity_risk(city),
+        calculate_rental_stability_risk(city)
+    )
+
+
+def _combine_risk(price_vol: Dict, liquidity: Dict, rental_stability: Dict) -> Dict[str, Any]:
+    """Combine the three risk indicators into an overall risk summary."""
     # Calculate overall risk score (0-100, higher = more risky)
     risk_scores = {
         "high": 30,
@@ -298,7 +336,71 @@ def get_risk_summary(city: str = None, location: str = None) -> Dict[str, Any]:
 # INVESTMENT SCORE (Composite 0-100)
 # ============================================================================
 
-def calculate_investment_score(property_data: Dict, city_stats: Dict = None) -> Dict[str, Any]:
+# Score bands shared by the scalar and vectorized scorers.
+# Each band is (threshold, points, explanation template); the first matching
+# band wins and anything matching none (including NaN) takes the fallback.
+ROI_BANDS = [
+    (150, 30, "Excellent ROI ({roi:.1f}%) significantly above target"),
+    (100, 25, "Strong ROI ({roi:.1f}%) above average"),
+    (50, 20, "Moderate ROI ({roi:.1f}%)"),
+    (0, 10, "Low ROI ({roi:.1f}%), limited growth potential"),
+]
+ROI_FALLBACK = (0, "Negative ROI ({roi:.1f}%), value decline expected")
+
+YIELD_BANDS = [
+    (5, 20, "Excellent rental yield ({rental_yield:.2f}%)"),
+    (4, 16, "Good rental yield ({rental_yield:.2f}%)"),
+    (3, 12, "Average rental yield ({rental_yield:.2f}%)"),
+    (2, 8, "Below average rental yield ({rental_yield:.2f}%)"),
+]
+YIELD_FALLBACK = (4, "Low rental yield ({rental_yield:.2f}%)")
+
+# Value bands compare price/sqft to the city average (ratio <= threshold)
+VALUE_BANDS = [
+    (0.7, 25, "Significantly undervalued ({below:.0f}% below city avg)"),
+    (0.85, 20, "Moderately undervalued ({below:.0f}% below city avg)"),
+    (1.0, 15, "Fair value (at or slightly below city avg)"),
+    (1.15, 10, "Slightly overpriced ({above:.0f}% above city avg)"),
+]
+VALUE_FALLBACK = (5, "Significantly overpriced ({above:.0f}% above city avg)")
+VALUE_NEUTRAL = (12, "Value assessment unavailable (no city comparison)")
+
+RISK_PENALTY_BANDS = [
+    (60, -10, "High risk penalty (-10) for elevated market risk"),
+    (30, -5, "Moderate risk penalty (-5)"),
+]
+RISK_PENALTY_FALLBACK = (0, "No risk penalty - favorable risk profile")
+RISK_PENALTY_NO_CITY = -5  # Default moderate penalty if city unknown
+
+# (minimum score, grade, explanation), checked top-down
+GRADES = [
+    (80, "A", "Excellent investment opportunity"),
+    (65, "B", "Good investment potential"),
+    (50, "C", "Average opportunity - careful evaluation needed"),
+    (35, "D", "Below average - consider alternatives"),
+]
+GRADE_FALLBACK = ("F", "Poor investment metrics - not recommended")
+
+SCORE_METHODOLOGY = "Score = ROI(30) + Yield(20) + Value(25) + Recommendation(15) - Risk(10 max)"
+
+
+def _match_band(value: float, bands: List, fallback: tuple, at_most: bool = False) -> tuple:
+    """Return (points, template) of the first band the value falls in."""
+    for threshold, points, template in bands:
+        if (value <= threshold) if at_most else (value >= threshold):
+            return points, template
+    return fallback
+
+
+def _grade_for(total_score: float) -> tuple:
+    for threshold, grade, explanation in GRADES:
+        if total_score >= threshold:
+            return grade, explanation
+    return GRADE_FALLBACK
+
+
+def calculate_investment_score(property_data: Dict, city_stats: Dict = None,
+                               risk_score: float = None) -> Dict[str, Any]:
     """
     Calculate composite investment score (0-100) for a property.
     
@@ -309,132 +411,185 @@ def calculate_investment_score(property_data: Dict, city_stats: Dict = None) ->
     - Buy Recommendation (15 pts): From buy vs rent analysis
     - Risk Penalty (-10 pts max): Based on risk indicators
     
+    Scores a single dict; use score_properties to score a whole DataFrame.
+    
     Args:
         property_data: Dict with property metrics
         city_stats: Optional city-level stats for comparison
+        risk_score: Optional overall city risk score (skips the risk lookup)
     
     Returns:
         Dict with total_score, component_scores, explanation
     """
-    scores = {}
-    explanations = []
-    
-    # 1. ROI Component (0-30 points)
-    roi = property_data.get('roi_percent', 0)
-    if roi >= 150:
-        scores['roi'] = 30
-        explanations.append(f"Excellent ROI ({roi:.1f}%) significantly above target")
-    elif roi >= 100:
-        scores['roi'] = 25
-        explanations.append(f"Strong ROI ({roi:.1f}%) above average")
-    elif roi >= 50:
-        scores['roi'] = 20
-        explanations.append(f"Moderate ROI ({roi:.1f}%)")
-    elif roi >= 0:
-        scores['roi'] = 10
-        explanations.append(f"Low ROI ({roi:.1f}%), limited growth potential")
-    else:
-        scores['roi'] = 0
-        explanations.append(f"Negative ROI ({roi:.1f}%), value decline expected")
-    
-    # 2. Rental Yield Component (0-20 points)
-    rental_yield = property_data.get('rental_yield', 0)
-    if rental_yield >= 5:
-        scores['rental_yield'] = 20
-        explanations.append(f"Excellent rental yield ({rental_yield:.2f}%)")
-    elif rental_yield >= 4:
-        scores['rental_yield'] = 16
-        explanations.append(f"Good rental yield ({rental_yield:.2f}%)")
-    elif rental_yield >= 3:
-        scores['rental_yield'] = 12
-        explanations.append(f"Average rental yield ({rental_yield:.2f}%)")
-    elif rental_yield >= 2:
-        scores['rental_yield'] = 8
-        explanations.append(f"Below average rental yield ({rental_yield:.2f}%)")
-    else:
-        scores['rental_yield'] = 4
-        explanations.append(f"Low rental yield ({rental_yield:.2f}%)")
+    city_avg = (city_stats or {}).get('avg_price_per_sqft')
+    city = property_data.get('city', '')
+    if city and risk_score is None:
+        risk_score = get_risk_summary(city).get('overall_risk_score', 50)
     
-    # 3. Value Component (0-25 points) - Price/sqft vs city average
     price_per_sqft = property_data.get('price_per_sqft', 0)
-    if city_stats and city_stats.get('avg_price_per_sqft'):
-        city_avg = city_stats['avg_price_per_sqft']
-        value_ratio = price_per_sqft / city_avg if city_avg > 0 else 1
-        
-        if value_ratio <= 0.7:
-            scores['value'] = 25
-            explanations.append(f"Significantly undervalued ({(1-value_ratio)*100:.0f}% below city avg)")
-        elif value_ratio <= 0.85:
-            scores['value'] = 20
-            explanations.append(f"Moderately undervalued ({(1-value_ratio)*100:.0f}% below city avg)")
-        elif value_ratio <= 1.0:
-            scores['value'] = 15
-            explanations.append(f"Fair value (at or slightly below city avg)")
-        elif value_ratio <= 1.15:
-            scores['value'] = 10
-            explanations.append(f"Slightly overpriced ({(value_ratio-1)*100:.0f}% above city avg)")
-        else:
-            scores['value'] = 5
-            explanations.append(f"Significantly overpriced ({(value_ratio-1)*100:.0f}% above city avg)")
-    else:
-        scores['value'] = 12  # Neutral if no comparison
-        explanations.append("Value assessment unavailable (no city comparison)")
-    
-    # 4. Buy Recommendation Component (0-15 points)
-    decision = property_data.get('decision', '').lower()
-    if 'buy' in decision:
-        scores['recommendation'] = 15
-        explanations.append("Buy recommendation based on wealth projection")
-    else:
-        scores['recommendation'] = 5
-        explanations.append("Rent recommendation - better alternatives may exist")
+    row = {
+        'roi_percent': property_data.get('roi_percent', 0),
+        'rental_yield': property_data.get('rental_yield', 0),
+        'value_ratio': (price_per_sqft / city_avg if city_avg > 0 else 1) if city_avg else np.nan,
+        'is_buy': 'buy' in property_data.get('decision', '').lower(),
+        'city_risk_score': risk_score if city else np.nan,
+    }
     
-    # 5. Risk Penalty (0 to -10 points)
-    city = property_data.get('city', '')
-    if city:
-        risk_summary = get_risk_summary(city)
-        overall_risk = risk_summary.get('overall_risk_score', 50)
-        if overall_risk >= 60:
-            scores['risk_penalty'] = -10
-            explanations.append(f"High risk penalty (-10) for elevated market risk")
-        elif overall_risk >= 30:
-            scores['risk_penalty'] = -5
-            explanations.append(f"Moderate risk penalty (-5)")
-        else:
-            scores['risk_penalty'] = 0
-            explanations.append("No risk penalty - favorable risk profile")
+    points, _ = _score_components(row)
+    total_score = max(0, min(100, sum(points.values())))  # Clamp to 0-100
+    return _score_result(total_score, points, explain_investment_score(row))
+
+
+def _score_components(row: Dict) -> tuple:
+    """Scalar band lookup for one row of score inputs -> (points, templates)."""
+    points, templates = {}, {}
+    points['roi'], templates['roi'] = _match_band(row['roi_percent'], ROI_BANDS, ROI_FALLBACK)
+    points['rental_yield'], templates['rental_yield'] = _match_band(row['rental_yield'], YIELD_BANDS, YIELD_FALLBACK)
+    
+    if pd.isna(row['value_ratio']):
+        points['value'], templates['value'] = VALUE_NEUTRAL
     else:
-        scores['risk_penalty'] = -5  # Default moderate penalty if city unknown
+        points['value'], templates['value'] = _match_band(row['value_ratio'], VALUE_BANDS, VALUE_FALLBACK, at_most=True)
     
-    # Calculate total score
-    total_score = sum(scores.values())
-    total_score = max(0, min(100, total_score))  # Clamp to 0-100
+    if row['is_buy']:
+        points['recommendation'], templates['recommendation'] = 15, "Buy recommendation based on wealth projection"
+    else:
+        points['recommendation'], templates['recommendation'] = 5, "Rent recommendation - better alternatives may exist"
     
-    # Generate grade
-    if total_score >= 80:
-        grade = "A"
-        grade_explanation = "Excellent investment opportunity"
-    elif total_score >= 65:
-        grade = "B"
-        grade_explanation = "Good investment potential"
-    elif total_score >= 50:
-        grade = "C"
-        grade_explanation = "Average opportunity - careful evaluation needed"
-    elif total_score >= 35:
-        grade = "D"
-        grade_explanation = "Below average - consider alternatives"
+    if pd.isna(row['city_risk_score']):
+        points['risk_penalty'], templates['risk_penalty'] = RISK_PENALTY_NO_CITY, None
     else:
-        grade = "F"
-        grade_explanation = "Poor investment metrics - not recommended"
+        points['risk_penalty'], templates['risk_penalty'] = _match_band(
+            row['city_risk_score'], RISK_PENALTY_BANDS, RISK_PENALTY_FALLBACK
+        )
+    return points, templates
+
+
+def explain_investment_score(row: Dict) -> List[str]:
+    """
+    Build the score explanations for one row of score inputs.
     
+    Accepts a dict or a row of the frame returned by score_properties, so
+    vectorized scores can be explained on demand.
+    """
+    _, templates = _score_components(row)
+    ratio = row['value_ratio']
+    values = {
+        'roi': row['roi_percent'],
+        'rental_yield': row['rental_yield'],
+        'below': (1 - ratio) * 100 if not pd.isna(ratio) else 0,
+        'above': (ratio - 1) * 100 if not pd.isna(ratio) else 0,
+    }
+    return [t.format(**values) for t in templates.values() if t is not None]
+
+
+def _score_result(total_score, points: Dict, explanations: List[str]) -> Dict[str, Any]:
+    grade, grade_explanation = _grade_for(total_score)
     return {
         "total_score": total_score,
         "grade": grade,
         "grade_explanation": grade_explanation,
-        "component_scores": scores,
+        "component_scores": points,
         "explanations": explanations,
-        "methodology": "Score = ROI(30) + Yield(20) + Value(25) + Recommendation(15) - Risk(10 max)"
+        "methodology": SCORE_METHODOLOGY
+    }
+
+
+def _select_bands(values: np.ndarray, bands: List, fallback_points: float, at_most: bool = False) -> np.ndarray:
+    conditions = [(values <= t) if at_most else (values >= t) for t, _, _ in bands]
+    return np.select(conditions, [p for _, p, _ in bands], default=fallback_points)
+
+
+def score_properties(df: pd.DataFrame, city_avg_price_per_sqft: Dict = None,
+                     risk_scores: Dict = None) -> pd.DataFrame:
+    """
+    Vectorized investment scoring for every listing in a DataFrame.
+    
+    Same bands as calculate_investment_score, evaluated column-wise with
+    np.select / np.digitize instead of one dict at a time.
+    
+    Args:
+        df: Properties DataFrame (roi_percent/rental_yield optional, default 0)
+        city_avg_price_per_sqft: Optional {city: avg price/sqft}; defaults to
+            the mean price/sqft of each city within df
+        risk_scores: Optional {city: overall risk score}; defaults to get_risk_summary
+    
+    Returns:
+        DataFrame aligned to df.index with score inputs, component points,
+        investment_score and investment_grade
+    """
+    n = len(df)
+    city_key = df['city'].fillna('').astype(str).str.lower() if 'city' in df.columns else pd.Series('', index=df.index)
+    zeros = pd.Series(0.0, index=df.index)
+    
+    roi = df['roi_percent'] if 'roi_percent' in df.columns else zeros
+    rental_yield = df['rental_yield'] if 'rental_yield' in df.columns else zeros
+    price_per_sqft = df['price_per_sqft'] if 'price_per_sqft' in df.columns else zeros
+    
+    if city_avg_price_per_sqft is None:
+        city_avg = price_per_sqft.groupby(city_key).transform('mean')
+    else:
+        city_avg = city_key.map(city_avg_price_per_sqft).astype(float)
+    # Falsy city average (missing or 0) means no comparison -> neutral value score
+    value_ratio = (price_per_sqft / city_avg).where(city_avg.fillna(0) != 0)
+    
+    if risk_scores is None:
+        risk_scores = {c: get_risk_summary(c).get('overall_risk_score', 50) for c in city_key.unique() if c}
+    city_risk = city_key.map(risk_scores).astype(float).where(city_key != '')
+    
+    decision = df['decision'] if 'decision' in df.columns else pd.Series('', index=df.index)
+    is_buy = decision.str.contains('buy', case=False, na=False).to_numpy()
+    
+    roi_points = _select_bands(roi.to_numpy(dtype=float), ROI_BANDS, ROI_FALLBACK[0])
+    yield_points = _select_bands(rental_yield.to_numpy(dtype=float), YIELD_BANDS, YIELD_FALLBACK[0])
+    ratio = value_ratio.to_numpy(dtype=float)
+    value_points = np.where(
+        np.isnan(ratio), VALUE_NEUTRAL[0],
+        _select_bands(ratio, VALUE_BANDS, VALUE_FALLBACK[0], at_most=True)
+    )
+    recommendation_points = np.where(is_buy, 15, 5)
+    risk = city_risk.to_numpy(dtype=float)
+    risk_penalty = np.where(
+        np.isnan(risk), RISK_PENALTY_NO_CITY,
+        _select_bands(risk, RISK_PENALTY_BANDS, RISK_PENALTY_FALLBACK[0])
+    )
+    
+    total = np.clip(roi_points + yield_points + value_points + recommendation_points + risk_penalty, 0, 100)
+    
+    # np.digitize over ascending grade thresholds: F < 35 <= D < 50 <= C < 65 <= B < 80 <= A
+    grade_labels = np.array([GRADE_FALLBACK[0]] + [g for _, g, _ in reversed(GRADES)])
+    grade_thresholds = [t for t, _, _ in reversed(GRADES)]
+    grades = grade_labels[np.digitize(total, grade_thresholds)] if n else np.array([], dtype=str)
+    
+    return pd.DataFrame({
+        'roi_percent': roi.to_numpy(dtype=float),
+        'rental_yield': rental_yield.to_numpy(dtype=float),
+        'value_ratio': ratio,
+        'is_buy': is_buy,
+        'city_risk_score': risk,
+        'roi_points': roi_points.astype(int),
+        'yield_points': yield_points.astype(int),
+        'value_points': value_points.astype(int),
+        'recommendation_points': recommendation_points.astype(int),
+        'risk_penalty': risk_penalty.astype(int),
+        'investment_score': total.astype(int),
+        'investment_grade': grades,
+    }, index=df.index)
+
+
+def score_result_from_row(row) -> Dict[str, Any]:
+    """
+    Expand one row of score_properties output into the calculate_investment_score format.
+    Explanations are generated here, on demand, rather than for every listing.
+    """
+    points = {
+        'roi': int(row['roi_points']),
+        'rental_yield': int(row['yield_points']),
+        'value': int(row['value_points']),
+        'recommendation': int(row['recommendation_points']),
+        'risk_penalty': int(row['risk_penalty']),
     }
+    return _score_result(int(row['investment_score']), points, explain_investment_score(row))
 
 
 # ============================================================================
@@ -453,37 +608,40 @@ def get_city_investment_profile(city: str) -> Dict[str, Any]:
     - Risk summary
     - Investment opportunities count
     
+    Profiles are read from the precomputed intelligence table.
+    
     Returns:
         Dict with city investment profile
     """
-    df = _get_df()
-    if df.empty:
+    table = get_intelligence_table()
+    if table is None:
         return {"error": "No data available"}
     
-    city_df = df[df['city'].str.lower() == city.lower()]
-    if city_df.empty:
+    entry = table["cities"].get(city.lower())
+    if entry is None:
         return {"error": f"No data found for city: {city}"}
     
-    # Basic metrics
-    avg_price = city_df['price'].mean()
-    avg_price_per_sqft = city_df['price_per_sqft'].mean()
-    total_properties = len(city_df)
+    return copy.deepcopy(entry["profile"])
+
+
+def _build_city_profile(city: str, city_df: pd.DataFrame, stats: pd.Series, overall_avg_price_sqft: float,
+                        risk: Dict, trend: Dict, index: OpportunityIndex) -> Dict[str, Any]:
+    """Assemble a city profile from pre-aggregated stats, risk, trend and the opportunity index."""
+    avg_price = stats['price_mean']
+    avg_price_per_sqft = stats['ppsf_mean']
+    total_properties = int(stats['count'])
     
     # Calculate rental yield if data available
     if 'estimated_rent' in city_df.columns:
-        avg_rent = city_df['estimated_rent'].mean()
+        avg_rent = stats['rent_mean']
         avg_rental_yield = (avg_rent * 12 / avg_price) * 100 if avg_price > 0 else 0
     else:
-        avg_rent = avg_price * ASSUMPTIONS['rent_to_price_ratio']
         avg_rental_yield = ASSUMPTIONS['rent_to_price_ratio'] * 12 * 100
     
     # Buy vs Rent distribution
-    buy_count = city_df['decision'].str.contains('buy', case=False, na=False).sum()
-    buy_percentage = (buy_count / total_properties) * 100 if total_properties > 0 else 0
+    buy_percentage = (stats['buy_count'] / total_properties) * 100 if total_properties > 0 else 0
     
     # Calculate market signal
-    all_df = _get_df()
-    overall_avg_price_sqft = all_df['price_per_sqft'].mean()
     price_ratio = avg_price_per_sqft / overall_avg_price_sqft if overall_avg_price_sqft > 0 else 1
     
     if price_ratio < 0.85:
@@ -496,24 +654,15 @@ def get_city_investment_profile(city: str) -> Dict[str, Any]:
         market_signal = "Fair"
         market_explanation = "Prices in line with market averages"
     
-    # Calculate trend signal (based on price distribution)
-    trend_signal = calculate_trend_signal(city)
-    
-    # Risk summary
-    risk = get_risk_summary(city)
-    
-    # Find top opportunities (high investment score properties)
-    opportunities = []
-    for _, prop in city_df.head(20).iterrows():
-        prop_dict = prop.to_dict()
-        score = calculate_investment_score(prop_dict, {"avg_price_per_sqft": avg_price_per_sqft})
-        if score['total_score'] >= 60:
-            opportunities.append({
-                "location": prop_dict.get('location'),
-                "score": score['total_score'],
-                "grade": score['grade']
-            })
-    opportunities.sort(key=lambda x: x['score'], reverse=True)
+    # Top opportunities: best-scoring listings in the city (score 60+)
+    opportunities = [
+        {
+            "location": prop.get('location'),
+            "score": int(prop['investment_score']),
+            "grade": prop['investment_grade']
+        }
+        for prop in index.top("investment_score", city=city, limit=5, min_value=60)
+    ]
     
     return {
         "city": city.title(),
@@ -527,7 +676,7 @@ def get_city_investment_profile(city: str) -> Dict[str, Any]:
         },
         "market_signal": market_signal,
         "market_explanation": market_explanation,
-        "trend": trend_signal,
+        "trend": trend,
         "risk_summary": {
             "overall_level": risk['overall_risk_level'],
             "overall_score": risk['overall_risk_score'],
@@ -586,7 +735,10 @@ def calculate_trend_signal(city: str = None) -> Dict[str, Any]:
     if df.empty:
         return {"signal": "unknown", "confidence": "low", "explanation": "No data available"}
     
-    all_df = df.copy()
+    entry = _lookup_city_intelligence(city)
+    if entry is not None:
+        return copy.deepcopy(entry["trend"])
+    
     if city:
         city_df = df[df['city'].str.lower() == city.lower()]
         if city_df.empty:
@@ -595,15 +747,20 @@ def calculate_trend_signal(city: str = None) -> Dict[str, Any]:
         city_df = df
     
     # Calculate metrics for trend analysis
-    city_avg_price_sqft = city_df['price_per_sqft'].mean()
-    overall_avg_price_sqft = all_df['price_per_sqft'].mean()
+    city_ppsf = city_df['price_per_sqft']
+    avg_listings_per_city = len(df) / df['city'].nunique() if df['city'].nunique() > 0 else 50
+    return _trend_from_stats(
+        city_ppsf.mean(), city_ppsf.std(), len(city_df),
+        df['price_per_sqft'].mean(), avg_listings_per_city
+    )
+
+
+def _trend_from_stats(city_avg_price_sqft: float, city_std_price_sqft: float, listing_count: int,
+                      overall_avg_price_sqft: float, avg_listings_per_city: float) -> Dict[str, Any]:
+    """Derive the trend signal from pre-aggregated city and market statistics."""
     price_ratio = city_avg_price_sqft / overall_avg_price_sqft if overall_avg_price_sqft > 0 else 1
-    
-    listing_count = len(city_df)
-    avg_listings_per_city = len(all_df) / all_df['city'].nunique() if all_df['city'].nunique() > 0 else 50
     listing_ratio = listing_count / avg_listings_per_city if avg_listings_per_city > 0 else 1
-    
-    price_cv = (city_df['price_per_sqft'].std() / city_df['price_per_sqft'].mean() * 100) if city_df['price_per_sqft'].mean() > 0 else 0
+    price_cv = (city_std_price_sqft / city_avg_price_sqft * 100) if city_avg_price_sqft > 0 else 0
     
     # Determine signal
     score = 0  # Higher = more overheated
@@ -900,6 +1057,224 @@ def run_all_scenarios(property_price: float, monthly_rent: float) -> Dict[str, A
     }
 
 
+# ============================================================================
+# PRECOMPUTED INTELLIGENCE TABLE
+# ============================================================================
+# City risk/trend/profile entries and per-property scores, built once per
+# dataset version so chat intents read results instead of rescanning the frame.
+_intelligence = None
+_intelligence_version = None
+_intelligence_lock = threading.Lock()
+
+
+def _property_key(prop: Dict) -> tuple:
+    """Identity used to look up a listing's precomputed score."""
+    return (
+        str(prop.get('city', '')).lower(),
+        str(prop.get('location', '')),
+        float(prop.get('price', 0) or 0),
+        float(prop.get('area_sqft', 0) or 0),
+    )
+
+
+def _aggregate_stats(df: pd.DataFrame, by=None) -> pd.DataFrame:
+    """Per-group (or whole-frame) aggregates feeding the risk/trend/profile rules."""
+    has_rent = 'estimated_rent' in df.columns
+    rents = df['estimated_rent'] if has_rent else df['price'] * ASSUMPTIONS['rent_to_price_ratio']
+    work = pd.DataFrame({
+        'group': by if by is not None else 'all',
+        'ppsf': df['price_per_sqft'],
+        'price': df['price'],
+        'rent': rents,
+        'is_buy': df['decision'].str.contains('buy', case=False, na=False),
+    })
+    return work.groupby('group').agg(
+        count=('ppsf', 'size'),
+        ppsf_mean=('ppsf', 'mean'),
+        ppsf_std=('ppsf', 'std'),
+        price_mean=('price', 'mean'),
+        rent_mean=('rent', 'mean'),
+        rent_std=('rent', 'std'),
+        rent_count=('rent', 'count' if has_rent else 'size'),
+        buy_count=('is_buy', 'sum'),
+    )
+
+
+def compute_buy_advantage(df: pd.DataFrame) -> pd.Series:
+    """Buying wealth advantage over renting, in percent of renting wealth (0 if no renting wealth)."""
+    renting = df['wealth_renting']
+    advantage = (df['wealth_buying'] - renting) / renting.where(renting > 0) * 100
+    return advantage.where(renting > 0, 0.0)
+
+
+def _listing_records(scored: pd.DataFrame) -> Dict[tuple, Dict]:
+    """Scored rows keyed by listing identity (property key + occurrence), NaN as None."""
+    records = scored.astype(object).where(scored.notna(), None).to_dict('records')
+    seen = {}
+    listings = {}
+    for record in records:
+        key = _property_key(record)
+        seen[key] = seen.get(key, -1) + 1
+        listings[key + (seen[key],)] = record
+    return listings
+
+
+def _risk_from_aggregates(stats: pd.Series) -> Dict[str, Any]:
+    count = int(stats['count'])
+    return _combine_risk(
+        _price_volatility_from_stats(count, stats['ppsf_mean'], stats['ppsf_std']),
+        _liquidity_from_count(count),
+        _rental_stability_from_stats(count, int(stats['rent_count']), stats['rent_mean'], stats['rent_std'])
+    )
+
+
+def build_intelligence_table(df: pd.DataFrame, index: OpportunityIndex = None) -> Dict[str, Any]:
+    """
+    Precompute city-level intelligence and per-property scores for a dataset.
+    
+    Args:
+        df: Analyzed properties
+        index: Opportunity index from the previous build; only listings whose
+            scored record changed are moved. A new index is built if omitted.
+    
+    Returns:
+        Dict with 'cities' (city -> risk/trend/profile), 'market' (whole dataset
+        risk/trend), 'scores' (score_properties output), 'scored' (df plus
+        investment_score/investment_grade/buy_advantage), 'positions'
+        (property key -> row) and 'index' (OpportunityIndex)
+    """
+    city_key = df['city'].str.lower()
+    city_stats = _aggregate_stats(df, city_key)
+    market_stats = _aggregate_stats(df).iloc[0]
+    
+    overall_avg_price_sqft = market_stats['ppsf_mean']
+    avg_listings_per_city = len(df) / len(city_stats) if len(city_stats) > 0 else 50
+    
+    risks, trends = {}, {}
+    for city, stats in city_stats.iterrows():
+        risks[city] = _risk_from_aggregates(stats)
+        trends[city] = _trend_from_stats(
+            stats['ppsf_mean'], stats['ppsf_std'], int(stats['count']),
+            overall_avg_price_sqft, avg_listings_per_city
+        )
+    
+    # Per-property scores in one vectorized pass, using the city aggregates
+    scores = score_properties(
+        df,
+        city_avg_price_per_sqft=city_stats['ppsf_mean'].to_dict(),
+        risk_scores={city: risk['overall_risk_score'] for city, risk in risks.items()}
+    )
+    scored = pd.concat([df, scores[['investment_score', 'investment_grade']]], axis=1)
+    if {'wealth_buying', 'wealth_renting'}.issubset(df.columns):
+        scored['buy_advantage'] = compute_buy_advantage(df)
+    
+    if index is None:
+        index = OpportunityIndex()
+    index.sync(_listing_records(scored))
+    
+    cities = {}
+    for city, city_df in scored.groupby(city_key, sort=False):
+        cities[city] = {
+            "avg_price_per_sqft": city_stats.at[city, 'ppsf_mean'],
+            "risk": risks[city],
+            "trend": trends[city],
+            "profile": _build_city_profile(
+                city, city_df, city_stats.loc[city], overall_avg_price_sqft,
+                risks[city], trends[city], index
+            ),
+        }
+    
+    # Listing identity -> row position, for score lookups from property dicts
+    positions = {}
+    for pos, prop in enumerate(df[['city', 'location', 'price', 'area_sqft']].to_dict('records')):
+        positions.setdefault(_property_key(prop), pos)
+    
+    return {
+        "cities": cities,
+        "market": {
+            "risk": _risk_from_aggregates(market_stats),
+            "trend": _trend_from_stats(
+                overall_avg_price_sqft, market_stats['ppsf_std'], int(market_stats['count']),
+                overall_avg_price_sqft, avg_listings_per_city
+            ),
+        },
+        "scores": scores,
+        "scored": scored,
+        "positions": positions,
+        "index": index,
+    }
+
+
+def get_intelligence_table() -> Optional[Dict[str, Any]]:
+    """
+    Get the precomputed intelligence table, rebuilding it when the dataset changes.
+    
+    Returns:
+        Intelligence table dict, or None if no data is available
+    """
+    global _intelligence, _intelligence_version
+    df = _get_df()
+    if df.empty:
+        return None
+    
+    with _intelligence_lock:
+        if _intelligence is None or _intelligence_version != _df_version:
+            previous_index = _intelligence["index"] if _intelligence is not None else None
+            _intelligence = build_intelligence_table(df, previous_index)
+            _intelligence_version = _df_version
+        return _intelligence
+
+
+def _lookup_city_intelligence(city: str = None) -> Optional[Dict[str, Any]]:
+    """Table entry for a city (or the whole market when city is None)."""
+    table = get_intelligence_table()
+    if table is None:
+        return None
+    if not city:
+        return table["market"]
+    return table["cities"].get(city.lower())
+
+
+def get_property_score(property_data: Dict, city_stats: Dict = None) -> Dict[str, Any]:
+    """
+    Get the investment score for a property, preferring the precomputed table.
+    
+    The table's scores use the dataset's city averages, so a listing's cached
+    row is only used when city_stats is None. Otherwise (and for listings not
+    in the dataset, e.g. custom properties) calculate_investment_score runs,
+    still reading city averages and risk from the table when not given.
+    """
+    table = get_intelligence_table()
+    if table is not None:
+        pos = table["positions"].get(_property_key(property_data)) if city_stats is None else None
+        if pos is not None:
+            return score_result_from_row(table["scores"].iloc[pos])
+        entry = table["cities"].get(str(property_data.get('city', '')).lower())
+        if city_stats is None and entry is not None:
+            city_stats = {"avg_price_per_sqft": entry["avg_price_per_sqft"]}
+    return calculate_investment_score(property_data, city_stats)
+
+
+def rank_investment_opportunities(city: str = None, limit: int = 10, bhk: int = None,
+                                  by: str = "investment_score") -> List[Dict[str, Any]]:
+    """
+    Best listings across a city (optionally one BHK) or the whole dataset.
+    
+    Args:
+        city: City to rank within, or None for all cities
+        limit: Number of listings to return
+        bhk: Restrict to a BHK count
+        by: 'investment_score' or 'buy_advantage'
+    
+    Returns:
+        List of property dicts (with investment_score/investment_grade/buy_advantage), best first
+    """
+    table = get_intelligence_table()
+    if table is None:
+        return []
+    return table["index"].top(by, city=city, bhk=bhk, limit=limit)
+
+
 # ============================================================================
 # FORMATTED OUTPUT FOR AI ASSISTANT
 # ============================================================================
@@ -917,7 +1292,7 @@ def format_investment_context(property_data: Dict, city: str = None) -> str:
     city_stats = get_city_stats(city) if city else {}
     
     # Investment Score
-    score = calculate_investment_score(property_data, city_stats)
+    score = get_property_score(property_data, city_stats)
     lines.append(f"## Investment Score: {score['total_score']}/100 (Grade: {score['grade']})")
     lines.append(f"{score['grade_explanation']}")
     lines.append("")
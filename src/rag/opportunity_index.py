@@ -0,0 +1,172 @@
+# src/rag/opportunity_index.py
+
+"""
+Top-K Opportunity Index
+
+Keeps listings ordered by a ranking metric (investment score, buy advantage)
+within every scope they belong to: the whole market, each city, each BHK and
+each city + BHK pair. Orders are maintained incrementally with bisect, so
+listing changes move only the affected entries and a top-K read is O(K).
+"""
+
+import bisect
+import math
+import threading
+from typing import Dict, List, Any, Optional, Iterable
+
+RANK_METRICS = ("investment_score", "buy_advantage")
+
+
+def scopes_for(record: Dict) -> List[tuple]:
+    """Scopes (city, bhk) a listing is ranked in; None means 'any'."""
+    city = str(record.get('city', '')).lower() or None
+    bhk = record.get('bhk')
+    try:
+        bhk = int(bhk) if bhk is not None and not (isinstance(bhk, float) and math.isnan(bhk)) else None
+    except (TypeError, ValueError):
+        bhk = None
+
+    scopes = [(None, None)]
+    if city:
+        scopes.append((city, None))
+    if bhk is not None:
+        scopes.append((None, bhk))
+        if city:
+            scopes.append((city, bhk))
+    return scopes
+
+
+def _rank_value(record: Dict, metric: str) -> Optional[float]:
+    """Metric value for ordering, or None when the listing is not rankable."""
+    value = record.get(metric)
+    if value is None:
+        return None
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(value) else value
+
+
+class OpportunityIndex:
+    """
+    Per-scope descending orders of listings for each ranking metric.
+
+    Entries are (-value, listing_id) tuples in sorted lists, one per
+    (metric, scope). Ties are broken by listing id, which is stable across
+    syncs, so a listing's position does not depend on where its row sits
+    in the dataset. Listing ids must be mutually comparable.
+    """
+
+    def __init__(self, metrics: Iterable[str] = RANK_METRICS):
+        self.metrics = tuple(metrics)
+        self._orders: Dict[tuple, List[tuple]] = {}
+        self._records: Dict[Any, Dict] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def _entries(self, listing_id, record: Dict):
+        """(order key, entry) pairs for a listing; derived, not stored, to keep the index lean."""
+        for scope in scopes_for(record):
+            for metric in self.metrics:
+                value = _rank_value(record, metric)
+                if value is not None:
+                    yield (metric, scope), (-value, listing_id)
+
+    def _remove_locked(self, listing_id) -> None:
+        record = self._records.pop(listing_id, None)
+        if record is None:
+            return
+        for order_key, entry in self._entries(listing_id, record):
+            order = self._orders[order_key]
+            pos = bisect.bisect_left(order, entry)
+            if pos < len(order) and order[pos] == entry:
+                del order[pos]
+            if not order:
+                del self._orders[order_key]
+
+    def _insert_locked(self, listing_id, record: Dict, touched: set = None) -> None:
+        """Add a listing's entries; with `touched`, append unsorted and let the caller sort."""
+        for order_key, entry in self._entries(listing_id, record):
+            if touched is None:
+                bisect.insort(self._orders.setdefault(order_key, []), entry)
+            else:
+                self._orders.setdefault(order_key, []).append(entry)
+                touched.add(order_key)
+        self._records[listing_id] = record
+
+    def upsert(self, listing_id, record: Dict) -> None:
+        """Insert a listing or move it to its new rank positions."""
+        with self._lock:
+            self._remove_locked(listing_id)
+            self._insert_locked(listing_id, record)
+
+    def remove(self, listing_id) -> None:
+        """Drop a listing from every order it appears in."""
+        with self._lock:
+            self._remove_locked(listing_id)
+
+    def sync(self, records: Dict[Any, Dict]) -> Dict[str, int]:
+        """
+        Bring the index in line with a full set of listings.
+
+        Only listings that were added, removed or whose record changed are
+        touched; moving a row within `records` changes nothing.
+
+        Returns:
+            Dict with 'added', 'updated' and 'removed' counts
+        """
+        counts = {"added": 0, "updated": 0, "removed": 0}
+        with self._lock:
+            for listing_id in [lid for lid in self._records if lid not in records]:
+                self._remove_locked(listing_id)
+                counts["removed"] += 1
+
+            pending = []
+            for listing_id, record in records.items():
+                previous = self._records.get(listing_id)
+                if previous is not None:
+                    if previous == record:
+                        continue
+                    self._remove_locked(listing_id)
+                    counts["updated"] += 1
+                else:
+                    counts["added"] += 1
+                pending.append((listing_id, record))
+
+            # Append changed entries, then re-sort each touched order once
+            touched = set()
+            for listing_id, record in pending:
+                self._insert_locked(listing_id, record, touched)
+            for order_key in touched:
+                self._orders[order_key].sort()
+        return counts
+
+    def top(self, metric: str = "investment_score", city: str = None, bhk: int = None,
+            limit: int = 10, min_value: float = None) -> List[Dict]:
+        """
+        Best listings for a scope, highest metric first.
+
+        Args:
+            metric: One of the indexed metrics
+            city: Restrict to a city (case-insensitive)
+            bhk: Restrict to a BHK count
+            limit: Maximum number of listings
+            min_value: Stop once the metric falls below this value
+
+        Returns:
+            List of listing record copies
+        """
+        if metric not in self.metrics:
+            raise ValueError(f"Unknown ranking metric: {metric}")
+        scope = (city.lower() if city else None, int(bhk) if bhk else None)
+
+        results = []
+        with self._lock:
+            for neg_value, listing_id in self._orders.get((metric, scope), [])[:limit]:
+                if min_value is not None and -neg_value < min_value:
+                    break
+                results.append(dict(self._records[listing_id]))
+        return results
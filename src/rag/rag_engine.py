@@ -17,7 +17,36 @@ from functools import lru_cache
 from dotenv import load_dotenv
 load_dotenv()
 
-from langchain_google_genai import ChatGoogleGenerativeAI
+
+# ============================================================================
+# LLM FACTORY: Gemini by default, swappable for offline runs (benchmarks)
+# ============================================================================
+_llm_factory = None
+
+
+def set_llm_factory(factory):
+    """
+    Override how chat models are constructed.
+    
+    Args:
+        factory: Zero-argument callable returning an object with
+                 ``invoke(prompt).content``, or None to restore Gemini.
+    """
+    global _llm_factory
+    _llm_factory = factory
+
+
+def _create_llm():
+    """Build the chat model used by generate_rag_response."""
+    if _llm_factory is not None:
+        return _llm_factory()
+    
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    return ChatGoogleGenerativeAI(
+        model="gemini-2.0-flash",
+        temperature=0,  # Zero temperature for factual responses
+        timeout=30      # 30 second timeout
+    )
 
 
 # ============================================================================
@@ -195,11 +224,7 @@ Your data-grounded response:"""
             _llm_throttler.record_call()
             
             # Initialize LLM with timeout
-            llm = ChatGoogleGenerativeAI(
-                model="gemini-2.0-flash",
-                temperature=0,  # Zero temperature for factual responses
-                timeout=30      # 30 second timeout
-            )
+            llm = _create_llm()
             
             response = llm.invoke(prompt).content
             
@@ -410,15 +435,15 @@ def generate_advisory_response(property_data: dict, city_stats: dict = None) ->
     """
     try:
         from src.rag.investment_intelligence import (
-            calculate_investment_score,
+            get_property_score,
             get_risk_summary,
             generate_metric_explanation
         )
         
-        # Calculate investment score
-        score_result = calculate_investment_score(property_data, city_stats)
+        # Investment score (precomputed for dataset listings)
+        score_result = get_property_score(property_data, city_stats)
         
-        # Get risk summary
+        # Get risk summary (served from the precomputed city table)
         city = property_data.get('city', '')
         risk = get_risk_summary(city) if city else None
         
@@ -649,7 +674,18 @@ def generate_scenario_response(property_price: float, monthly_rent: float, scena
         lines.append(f"   • Investment Return: 8% / {moderate['investment_return']}% / 12%")
         lines.append(f"   • Loan Rate: 9.5% / {moderate['loan_rate']}% / 7.5%")
         lines.append("")
-        
+
+        # Monte Carlo: probability across sampled market conditions
+        from services.monte_carlo import run_monte_carlo
+        mc = run_monte_carlo(property_price, monthly_rent, seed=0)
+        diff = mc['wealth_difference']
+        lines.append(f"### Monte Carlo ({mc['simulations']:,} simulations)")
+        lines.append(f"   • Probability buying wins: {mc['probability_buy_wins'] * 100:.1f}%")
+        lines.append(f"   • Median wealth difference (buy - rent): ₹{diff['p50'] / 10000000:.2f} Cr")
+        lines.append(f"   • 90% range: ₹{diff['p5'] / 10000000:.2f} Cr to ₹{diff['p95'] / 10000000:.2f} Cr")
+        lines.append("   *Appreciation, rent growth, investment return and loan rate sampled per path*")
+        lines.append("")
+
         lines.append("📊 *See INVESTMENT_METRICS.md for full methodology.*")
         
         return "\n".join(lines)
@@ -657,3 +693,78 @@ def generate_scenario_response(property_price: float, monthly_rent: float, scena
     except Exception as e:
         return f"Unable to generate scenario analysis. Error: {str(e)[:100]}"
 
+
+
+def generate_sensitivity_response(property_price: float, monthly_rent: float, params: list = None,
+                                  values: dict = None) -> str:
+    """
+    Generate sensitivity analysis response (tornado ranges + break-even sweeps).
+    
+    Args:
+        property_price: Property price
+        monthly_rent: Monthly rent
+        params: Optional assumptions to sweep (default: all, tornado only)
+        values: Values the user stated ({param: value}); they become the base
+            case and a point of each sweep
+        
+    Returns:
+        str: Sensitivity analysis (NEVER None)
+    """
+    try:
+        import numpy as np
+        from services.sensitivity import (
+            sensitivity_grid, tornado_analysis, grid_values, SENSITIVITY_PARAMS, BASE_PARAMS
+        )
+        
+        values = {param: value for param, value in (values or {}).items() if param in SENSITIVITY_PARAMS}
+        tornado = tornado_analysis(property_price, monthly_rent, base_params=values)
+        price_cr = property_price / 10000000
+        
+        lines = []
+        lines.append("## Sensitivity Analysis")
+        lines.append(f"**Property Price:** ₹{price_cr:.2f} Cr | **Monthly Rent:** ₹{monthly_rent:,.0f}")
+        lines.append(f"**Base case:** {tornado['base_recommendation']} "
+                     f"(buy - rent wealth: ₹{tornado['base_difference'] / 10000000:.2f} Cr)")
+        lines.append("")
+        
+        # Tornado: which assumption moves the outcome most
+        lines.append("### What Moves the Decision Most")
+        for bar in tornado['bars']:
+            unit = bar['unit']
+            flip = " ⚡ flips the decision" if bar['flips_decision'] else ""
+            lines.append(
+                f"   • **{bar['label']}** ({bar['low_value']}{unit} → {bar['high_value']}{unit}): "
+                f"₹{bar['low_difference'] / 10000000:.2f} Cr to ₹{bar['high_difference'] / 10000000:.2f} Cr{flip}"
+            )
+        lines.append("")
+        
+        # Sweeps for the assumptions the user asked about
+        for param in params or []:
+            spec = SENSITIVITY_PARAMS[param]
+            sweep = grid_values(param, steps=7)
+            stated = values.get(param)
+            if stated is not None:
+                # Sweep through the stated value, widening the range if it lies outside
+                sweep = grid_values(param, np.union1d(sweep, [stated]))
+            grid = sensitivity_grid(property_price, monthly_rent, param, x_values=sweep, base_params=values)
+            lines.append(f"### {spec['label']} Sweep")
+            for value, diff in zip(grid['x_values'], grid['wealth_difference']):
+                rec = "Buy" if diff > 0 else "Rent"
+                yours = " ← your value" if stated is not None and np.isclose(value, stated) else ""
+                lines.append(f"   • {value:.4g}{spec['unit']}: ₹{diff / 10000000:.2f} Cr → {rec}{yours}")
+            if grid['break_even'] is not None:
+                lines.append(f"   *Break-even at {spec['label'].lower()} ≈ {grid['break_even']:.2f}{spec['unit']}*")
+            else:
+                low, high = grid['x_values'][0], grid['x_values'][-1]
+                lines.append(f"   *No break-even within {low:.4g}{spec['unit']}–{high:.4g}{spec['unit']}*")
+            lines.append("")
+        
+        base = {**BASE_PARAMS, **values}
+        lines.append(f"*Other assumptions held at base: {base['down_payment_percent']:g}% down, "
+                     f"{base['loan_rate']:g}% loan, {base['loan_tenure_years']:g} yrs, "
+                     f"{base['appreciation_rate']:g}% appreciation, {base['investment_return_rate']:g}% return.*")
+        
+        return "\n".join(lines)
+        
+    except Exception as e:
+        return f"Unable to generate sensitivity analysis. Error: {str(e)[:100]}"
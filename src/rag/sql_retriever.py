@@ -145,13 +145,11 @@ def format_single_property(prop: dict) -> str:
     price_cr = price / 10000000 if price else 0
     city = prop.get('city', 'Unknown')
     
-    # Get investment score
+    # Get investment score and risk from the precomputed intelligence table
     try:
-        from src.rag.investment_intelligence import calculate_investment_score, get_risk_summary
-        from src.rag.sql_retriever import get_city_stats
+        from src.rag.investment_intelligence import get_property_score, get_risk_summary
         
-        city_stats = get_city_stats(city)
-        score_result = calculate_investment_score(prop, city_stats)
+        score_result = get_property_score(prop)
         risk = get_risk_summary(city)
         
         has_intelligence = True
@@ -5,8 +5,6 @@ Vector store for property embeddings using FAISS.
 Provides semantic search over property documents.
 """
 
-from langchain_community.vectorstores import FAISS
-from langchain_huggingface import HuggingFaceEmbeddings
 import os
 
 VECTOR_DIR = "data/vectorstore"
@@ -14,6 +12,7 @@ VECTOR_DIR = "data/vectorstore"
 
 def get_embeddings():
     """Get the embedding model instance."""
+    from langchain_huggingface import HuggingFaceEmbeddings
     return HuggingFaceEmbeddings(
         model_name="sentence-transformers/all-MiniLM-L6-v2"
     )
@@ -30,6 +29,8 @@ def build_or_load_vector_store(text_documents: list[str], force_rebuild: bool =
     Returns:
         FAISS vector store instance
     """
+    from langchain_community.vectorstores import FAISS
+
     embeddings = get_embeddings()
 
     if os.path.exists(VECTOR_DIR) and not force_rebuild:
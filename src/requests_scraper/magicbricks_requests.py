@@ -1,79 +1,344 @@
-import csv
+"""
+HTTP-first MagicBricks scraper.
+
+Search result pages that are server-rendered are fetched with plain HTTP
+instead of a headless browser:
+- one pooled requests.Session (keep-alive connections, urllib3 retries with
+  backoff on 429/5xx) shared by a thread pool
+- city x page URLs are fetched in parallel; each city keeps up to
+  PAGE_LOOKAHEAD pages in flight and stops at the first empty page
+- cards are parsed with lxml and turned into listings by the Playwright
+  scraper's parse_cards, so both paths produce identical rows
+
+Cities whose first page has no cards need JS rendering and are handed to
+the async Playwright scraper (imported only then, so Playwright is not
+needed for server-rendered cities). Output goes through the same checkpoint,
+listing index and cleaning steps as the browser scrapers; incremental runs
+(opt-in) stop paginating a city once its pages reach already-indexed listings.
+
+Usage:
+    python -m src.requests_scraper.magicbricks_requests
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+from urllib.parse import urlsplit
+
+import lxml.html
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from src.playwright_scraper.scraper_common import (
+    CITIES, SELECTORS, MAX_RETRIES, CrawlCheckpoint, ListingIndex, MetricsRecorder, build_city_url, parse_cards,
+    finish_crawl, logger
+)
+
+WORKERS = 8              # Pages fetched in parallel (and pooled connections)
+MAX_PAGES = 10           # Result pages per city
+PAGE_LOOKAHEAD = 2       # Pages of one city in flight at once
+REQUEST_TIMEOUT = 20     # seconds (connect and read)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/120.0.0.0 Safari/537.36"
+    ),
+    "Accept-Language": "en-IN,en;q=0.9",
+}
+
+
+def _xpath(selector):
+    # 'tag.class' or 'tag[attr]' (the forms used in SELECTORS) as a relative XPath
+    if "[" in selector:
+        tag, attr = selector.rstrip("]").split("[", 1)
+        return f".//{tag or '*'}[@{attr}]"
+    tag, cls = selector.split(".", 1)
+    return f".//{tag or '*'}[contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')]"
+
+
+# SELECTORS as XPaths, tried in the same order
+XPATHS = {field: [_xpath(selector) for selector in selectors] for field, selectors in SELECTORS.items()}
+
+
+def build_page_url(city, page=1):
+    """Search URL for one result page of a city (page 1 is the plain city URL)."""
+    url = build_city_url(city)
+    return url if page == 1 else f"{url}&page={page}"
+
+
+def make_session(pool_size=WORKERS, retries=MAX_RETRIES):
+    """requests.Session with a keep-alive pool of pool_size and retries with backoff."""
+    retry = Retry(total=retries, backoff_factor=1, status_forcelist=RETRY_STATUSES, allowed_methods=["GET"])
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def extract_cards_html(html):
+    """
+    Raw texts of every card in a server-rendered page.
+
+    Returns:
+        List of dicts with title, href, price, area and location, the same
+        shape as magicbricks_playwright_improved.extract_cards
+    """
+    tree = lxml.html.fromstring(html)
+    # innerText renders <br> as a newline; keep the texts identical to the browser path
+    for br in tree.iter("br"):
+        br.tail = "\n" + (br.tail or "")
+
+    def pick(card, field):
+        for xpath in XPATHS[field]:
+            found = card.xpath(xpath)
+            if found:
+                return found[0]
+        return None
+
+    def text(el):
+        return el.text_content().strip() if el is not None else None
+
+    cards = []
+    for xpath in XPATHS["card"]:
+        cards = tree.xpath(xpath)
+        if cards:
+            break
+
+    raw_cards = []
+    for card in cards:
+        title = pick(card, "title")
+        raw_cards.append({
+            "title": text(title),
+            "href": title.get("href") if title is not None else None,
+            "price": text(pick(card, "price")),
+            "area": text(pick(card, "area")),
+            "location": text(pick(card, "location")),
+        })
+    return raw_cards
+
 
 class Scraper:
-    def __init__(self):
-        self.results = []
+    """Parallel HTTP scraper over city x page URLs."""
+
+    def __init__(self, workers=WORKERS, max_pages=MAX_PAGES, timeout=REQUEST_TIMEOUT, url_builder=build_page_url,
+                 metrics=None):
+        self.workers = workers
+        self.max_pages = max_pages
+        self.timeout = timeout
+        self.url_builder = url_builder
+        self.metrics = metrics  # Optional MetricsRecorder, one record per city
+        self.session = make_session(workers)
+        self.truncated = set()  # Cities whose pagination ended before the last page (see scrape_cities)
 
     def fetch(self, url):
-        print(f"HTTP GET request to URL: {url}", end="")
-        res = requests.get(url, headers={
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
-        })
-        print(f" | Status code: {res.status_code}")
+        res = self.session.get(url, timeout=self.timeout)
+        res.raise_for_status()
         return res
 
-    def parse(self, html):
-        soup = BeautifulSoup(html, 'html.parser')
+    def parse(self, html, city, base_url="https://www.magicbricks.com"):
+        """Listings of one page, plus its raw card count (0 = no server-rendered cards)."""
+        raw_cards = extract_cards_html(html)
+        return parse_cards(raw_cards, city, base_url), len(raw_cards)
 
-        # MagicBricks listing cards
-        cards = soup.select("div.mb-srp__card")
+    def fetch_page(self, city, page):
+        """
+        Fetch and parse one result page.
 
-        print(f"Found {len(cards)} listings")
+        Returns:
+            (listings, raw card count, {"seconds", "bytes", "retries"} of the request)
+        """
+        url = self.url_builder(city, page)
+        split = urlsplit(url)
+        started = time.perf_counter()
+        res = self.fetch(url)
+        seconds = time.perf_counter() - started
+        retries = res.raw.retries.history if getattr(res.raw, "retries", None) else ()
+        listings, card_count = self.parse(res.text, city, f"{split.scheme}://{split.netloc}")
+        return listings, card_count, {"seconds": seconds, "bytes": len(res.content), "retries": len(retries)}
 
-        for card in cards:
-            # Title
-            title_el = card.select_one("a.mb-srp__card--title")
-            title = title_el.get_text(strip=True) if title_el else None
+    def scrape_cities(self, cities, max_listings_per_city=None, on_city=None, stop=None):
+        """
+        Scrape every page of cities in parallel.
 
-            # Property link
-            link = title_el.get("href") if title_el else None
-            if link and not link.startswith("http"):
-                link = "https://www.magicbricks.com" + link
+        on_city: optional callback(city, listings) run as each city finishes;
+                 when given, listings are handed off instead of kept in memory
+        stop: optional callable(city, listings) checked on each city's
+              contiguous pages so far; True ends the city's pagination
 
-            # Extract price
-            price_el = card.select_one("div.mb-srp__card__price")
-            price = price_el.get_text(strip=True) if price_el else None
+        A city that ends before its last page keeps the pages it has but is
+        recorded as incomplete (and added to self.truncated): page N > 1
+        failed to fetch, max_listings_per_city was reached, or max_pages
+        pages all had cards.
 
-            # Extract area
-            area_el = card.select_one("div.mb-srp__card__summary--value")
-            area = area_el.get_text(strip=True) if area_el else None
+        Returns:
+            ({city: listings} for cities with server-rendered cards,
+             cities whose first page had no cards, i.e. need JS rendering)
+        """
+        state = {
+            city: {"next": 1, "end": None, "in_flight": 0, "pages": {}, "count": 0,
+                   "cards": {}, "errors": set(), "requests": 0, "bytes": 0, "retries": 0, "load": 0.0, "started": time.perf_counter()}
+            for city in cities
+        }
+        results, needs_js = {}, []
 
-            # Extract locality
-            loc_el = card.select_one("div.mb-srp__card__society")
-            locality = loc_el.get_text(strip=True) if loc_el else None
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            running = {}
 
-            print(title, "->", link)
+            def schedule(city):
+                s = state[city]
+                while s["end"] is None and s["next"] <= self.max_pages and s["in_flight"] < PAGE_LOOKAHEAD:
+                    running[pool.submit(self.fetch_page, city, s["next"])] = (city, s["next"])
+                    s["next"] += 1
+                    s["in_flight"] += 1
 
-            self.results.append({
-                "title": title,
-                "location": locality,
-                "price": price,
-                "area_sqft": area,
-                "link": link
-            })
+            def record(city, s, status, listings=()):
+                if self.metrics is not None:
+                    self.metrics.record(
+                        city, status=status, attempts=1 + s["retries"],
+                        load_seconds=s["load"] / s["requests"] if s["requests"] else None,
+                        pages=len(s["pages"]), cards=sum(s["cards"].get(page, 0) for page in s["pages"]),
+                        listings=listings, requests=s["requests"],
+                        kb=round(s["bytes"] / 1024, 1), seconds=time.perf_counter() - s["started"],
+                    )
 
-    def to_csv(self, filename="magicbricks_requests_results.csv"):
-        with open(filename, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(
-                f,
-                fieldnames=["title", "location", "price", "area_sqft", "link"]
-            )
-            writer.writeheader()
-            writer.writerows(self.results)
+            def finish(city):
+                s = state.pop(city)
+                if s["end"] == 1:
+                    if s.get("js"):
+                        needs_js.append(city)
+                    record(city, s, "needs js" if s.get("js") else "failed")
+                    return
+                listings = [listing for page in sorted(s["pages"]) for listing in s["pages"][page]]
+                if max_listings_per_city:
+                    listings = listings[:max_listings_per_city]
+                logger.info(f"Scraped {len(listings)} listings from {city} over {len(s['pages'])} pages")
+                if s["end"] in s["errors"]:
+                    reason = f"page {s['end']} failed"
+                elif s.get("capped"):
+                    reason = f"capped at {max_listings_per_city} listings"
+                elif s["end"] is None:
+                    reason = f"max pages ({self.max_pages}) reached"
+                else:
+                    reason = None
+                if reason:
+                    logger.warning(f"{city} is incomplete: {reason}")
+                    self.truncated.add(city)
+                    status = "incomplete"
+                else:
+                    status = "stopped early" if s.get("stopped") else "ok"
+                record(city, s, status, listings)
+                if on_city is not None:
+                    on_city(city, listings)
+                else:
+                    results[city] = listings
 
-        print(f"\nSaved {len(self.results)} listings to {filename}")
+            for city in cities:
+                schedule(city)
 
-    def run(self):
-        # Mumbai fixed URL (you can later extend city-wise)
-        url = "https://www.magicbricks.com/property-for-sale-in-mumbai"
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    city, page = running.pop(future)
+                    s = state[city]
+                    s["in_flight"] -= 1
+                    try:
+                        listings, card_count, request = future.result()
+                        s["requests"] += 1
+                        s["bytes"] += request["bytes"]
+                        s["retries"] += request["retries"]
+                        s["load"] += request["seconds"]
+                    except Exception as e:
+                        logger.error(f"Error fetching {city} page {page}: {e}")
+                        listings, card_count = None, 0
+                        s["errors"].add(page)
 
-        res = self.fetch(url)
-        self.parse(res.text)
-        self.to_csv()
+                    if listings is None or card_count == 0:
+                        # The first missing page ends the city; pages past it are ignored
+                        s["end"] = page if s["end"] is None else min(s["end"], page)
+                        if page == 1 and listings is not None:
+                            s["js"] = True
+                        s["pages"] = {p: rows for p, rows in s["pages"].items() if p < s["end"]}
+                    elif s["end"] is None or page < s["end"]:
+                        s["pages"][page] = listings
+                        s["count"] += len(listings)
+                        s["cards"][page] = card_count
+                        if max_listings_per_city and s["count"] >= max_listings_per_city:
+                            s["capped"] = True
+                            s["end"] = s["next"]
+                        elif stop is not None and s["end"] is None:
+                            prefix, first_missing = [], 1
+                            while first_missing in s["pages"]:
+                                prefix.extend(s["pages"][first_missing])
+                                first_missing += 1
+                            if stop(city, prefix):
+                                s["stopped"] = True
+                                s["end"] = first_missing
+                                s["pages"] = {p: rows for p, rows in s["pages"].items() if p < first_missing}
+
+                    schedule(city)
+                    if s["in_flight"] == 0:
+                        finish(city)
+
+        return results, needs_js
+
+
+def run(headless=True, max_listings_per_city=None, workers=WORKERS, resume=True, incremental=False):
+    """
+    HTTP-first crawl of every city, with Playwright only for cities that need JS.
+
+    Args:
+        headless: Browser mode for the Playwright fallback
+        max_listings_per_city: Limit listings per city (None = all)
+        workers: Pages fetched in parallel
+        resume: Skip cities completed by a previous interrupted run
+                (False discards the checkpoint and starts over)
+        incremental: Stop each city at a run of known, unchanged listings.
+                     Off by default: this assumes newest-first results, and
+                     build_city_url does not sort by posting date. False
+                     crawls every city to the end (and detects deletes)
+    """
+    start_time = datetime.now()
+    logger.info("=" * 50)
+    logger.info("Starting MagicBricks Scraper (HTTP Version)")
+    logger.info(f"Workers: {workers} | Max pages per city: {MAX_PAGES}")
+    logger.info("=" * 50)
+
+    checkpoint = CrawlCheckpoint()
+    if not resume:
+        checkpoint.clear()
+    done = checkpoint.completed()
+    pending = [city for city in CITIES if city not in done]
+    if done:
+        logger.info(f"Resuming crawl: {len(done)} cities already done, {len(pending)} to go")
+    index = ListingIndex()
+    stop = index.should_stop if incremental else None
+    metrics = MetricsRecorder("http")
+
+    scraper = Scraper(workers, metrics=metrics)
+
+    def on_city(city, listings):
+        # Cities that came back empty are retried on the next resume
+        if listings:
+            complete = city not in index.stopped and city not in scraper.truncated
+            checkpoint.save_city(city, listings, complete=complete)
+
+    _, needs_js = scraper.scrape_cities(pending, max_listings_per_city, on_city=on_city, stop=stop)
+
+    if needs_js:
+        logger.info(f"{len(needs_js)} cities need JS rendering, using Playwright: {', '.join(needs_js)}")
+        from src.playwright_scraper.async_scraper import scrape_cities
+        asyncio.run(scrape_cities(needs_js, headless, max_listings_per_city, on_city=on_city, stop=stop,
+                                  metrics=metrics, truncated=scraper.truncated))
+
+    finish_crawl(checkpoint, start_time, index, metrics)
 
 
 if __name__ == "__main__":
-    scraper = Scraper()
-    scraper.run()
\ No newline at end of file
+    run(headless=True, max_listings_per_city=None)
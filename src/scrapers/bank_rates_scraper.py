@@ -1,37 +1,146 @@
-import requests
+"""
+Home loan rates from BankBazaar.
+
+The page is fetched with a conditional GET (ETag / If-Modified-Since)
+against an on-disk copy, so an unchanged page costs a 304 and no parsing
+work beyond the cached HTML. Rates are read in one pass over the table
+rows of the parsed DOM: the first cell names the bank, the first plausible
+percentage in the rest of the row is its starting rate. Every change of
+rates is appended to a timestamped history.
+
+Usage:
+    python -m src.scrapers.bank_rates_scraper
+    python -m src.scrapers.bank_rates_scraper --html benchmarks/fixtures/bankbazaar_home_loan_rates.html
+"""
+
+import argparse
 import json
+import os
 import re
+from datetime import datetime
 from pathlib import Path
 
+import lxml.html
+import requests
+
+from src.Parameters.bank_comparison import VALID_RATE_RANGE
 
 URL = "https://www.bankbazaar.com/home-loan-interest-rate.html"
 HEADERS = {
     "User-Agent": "Mozilla/5.0"
 }
+CACHE_DIR = "data/cache/bank_rates"
+HISTORY_PATH = "data/outputs/bank_rate_history.jsonl"
 
-# here specific banks are chosen to compare. 
+# here specific banks are chosen to compare.
 BANKS = ["State Bank of India","SBI","HDFC Bank","ICICI Bank","Axis Bank","Bank of Baroda","Punjab National Bank","Canara Bank",
         "Union Bank of India","Bank of India","Central Bank of India","IDBI Bank","Kotak Mahindra Bank","Federal Bank",
         "YES Bank","LIC Housing Finance"]
 
+# Longest names first, so "Bank of India" does not claim "Central Bank of India"
+BANK_RE = re.compile(
+    r"\b(" + "|".join(re.escape(bank) for bank in sorted(BANKS, key=len, reverse=True)) + r")\b", re.IGNORECASE
+)
+RATE_RE = re.compile(r"(\d+(?:\.\d+)?)\s*%")
+_CANONICAL = {bank.lower(): bank for bank in BANKS}
 
-def scrape_bank_rates():
-    response = requests.get(URL, headers=HEADERS, timeout=15)
-    response.raise_for_status()
 
-    text = response.text
+def parse_bank_rates(html):
+    """
+    {bank: starting rate} from the rate tables of the page.
 
+    Each bank takes the first row whose first cell names it; percentages
+    outside VALID_RATE_RANGE (fees, "100% funding") are skipped.
+    """
+    low, high = VALID_RATE_RANGE
     bank_rates = {}
+    for row in lxml.html.fromstring(html).iter("tr"):
+        cells = [cell.text_content() for cell in row if cell.tag in ("td", "th")]
+        if len(cells) < 2:
+            continue
+        match = BANK_RE.search(cells[0])
+        if not match:
+            continue
+        bank = _CANONICAL[match.group(1).lower()]
+        if bank in bank_rates:
+            continue
+        for rate in RATE_RE.findall(" ".join(cells[1:])):
+            if low <= float(rate) <= high:
+                bank_rates[bank] = float(rate)
+                break
+    return bank_rates
+
 
-    for bank in BANKS:
-        # Look for patterns like: "HDFC Bank ... 7.9%"
-        pattern = rf"{bank}.*?(\d+(\.\d+)?)\s*%"
-        match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+def fetch_page(url=URL, cache_dir=CACHE_DIR, timeout=15):
+    """
+    Page HTML, revalidated against the on-disk copy.
 
-        if match:
-            rate = float(match.group(1))
-            bank_rates[bank] = rate
+    Returns:
+        (html, changed) where changed is False when the server answered 304
+    """
+    cache_dir = Path(cache_dir)
+    page_path, meta_path = cache_dir / "page.html", cache_dir / "meta.json"
+    meta = {}
+    if page_path.exists() and meta_path.exists():
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
 
+    headers = dict(HEADERS)
+    if meta.get("url") == url:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    response = requests.get(url, headers=headers, timeout=timeout)
+    if response.status_code == 304 and meta:
+        return page_path.read_text(encoding="utf-8"), False
+    response.raise_for_status()
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    for path, content in (
+        (page_path, response.text),
+        (meta_path, json.dumps({
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "fetched_at": datetime.now().isoformat(timespec="seconds"),
+        }, indent=2)),
+    ):
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(content, encoding="utf-8")
+        os.replace(tmp, path)
+    return response.text, True
+
+
+def read_rate_history(path=HISTORY_PATH):
+    # [{"at": ..., "rates": {...}}] in the order they were recorded
+    try:
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except OSError:
+        return []
+
+
+def record_rate_history(bank_rates, path=HISTORY_PATH):
+    """Append bank_rates with a timestamp unless they equal the last recorded rates."""
+    history = read_rate_history(path)
+    if history and history[-1]["rates"] == bank_rates:
+        return False
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"at": datetime.now().isoformat(timespec="seconds"), "rates": bank_rates}) + "\n")
+    return True
+
+
+def scrape_bank_rates(url=URL, cache_dir=CACHE_DIR, history_path=HISTORY_PATH):
+    html, changed = fetch_page(url, cache_dir)
+    if not changed:
+        print("[✓] Rates page not modified, using cached copy")
+
+    bank_rates = parse_bank_rates(html)
+    if history_path:
+        record_rate_history(bank_rates, history_path)
     return bank_rates
 
 def save_bank_rates(bank_rates, path="src/scrapers/bank_rates.json"):
@@ -44,5 +153,12 @@ def save_bank_rates(bank_rates, path="src/scrapers/bank_rates.json"):
 
 
 if __name__ == "__main__":
-    rates = scrape_bank_rates()
-    save_bank_rates(rates)
+    parser = argparse.ArgumentParser(description="Scrape home loan rates")
+    parser.add_argument("--html", help="Parse a saved page instead of fetching (prints the rates)")
+    args = parser.parse_args()
+
+    if args.html:
+        print(json.dumps(parse_bank_rates(Path(args.html).read_text(encoding="utf-8")), indent=2))
+    else:
+        rates = scrape_bank_rates()
+        save_bank_rates(rates)